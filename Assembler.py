@@ -0,0 +1,263 @@
+"""
+Assembler for the osx assembly language, in process instead of the osx binary.
+
+    python Assembler.py programs/add.asm 10    # one file, load address 10
+    python Assembler.py programs tests/ops      # every .asm in the directories
+    python Assembler.py programs --force        # ignore the build cache
+
+Syntax, one statement per line, everything after ';' is a comment:
+
+    LABEL   .WORD 300 ;       4 byte little endian word (a number or a label)
+            .BYTE 'a' ;       1 byte, a character or a number
+            .SPACE 4 ;        that many space bytes
+    START:  MVI R1 100 ;      labels are optional, with or without ':'
+            ADR R2 LABEL ;
+            LDR R0 [R2] ;
+            BNE START ;
+
+The output is what MemoryManager.prepare_program reads: a 12 byte header
+(byte size, address of the first instruction, load address) followed by the
+data and code, 6 bytes per instruction (opcode, operands, padded with spaces).
+Labels are addresses from the start of the program.
+
+Directory builds keep a cache (.osx_build.json in each directory) of the
+source hash of every file, files whose source and load address haven't
+changed since their .osx was built are skipped.
+"""
+import os
+import re
+import sys
+import json
+import struct
+import hashlib
+import argparse
+
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+from constants import instructions
+
+OPCODES = {name: opcode for opcode, name in instructions.items()}
+INSTRUCTION_SIZE = 6
+CACHE_FILE = '.osx_build.json'
+
+REGISTERS = {f'R{i}': i for i in range(12)}
+REGISTERS.update({'SP': 6, 'FP': 7, 'SL': 8, 'Z': 9, 'SB': 10, 'PC': 11})
+
+# Operands of each instruction: r is a register byte, i a 4 byte immediate or address
+FORMATS = {
+    'ADD': 'rrr', 'SUB': 'rrr', 'MUL': 'rrr', 'DIV': 'rrr',
+    'AND': 'rrr', 'ORR': 'rrr', 'EOR': 'rrr',
+    'MOV': 'rr', 'CMP': 'rr',
+    'STR': 'rr', 'STRB': 'rr', 'LDR': 'rr', 'LDRB': 'rr',
+    'MVI': 'ri', 'ADR': 'ri',
+    'B': 'i', 'BL': 'i', 'BNE': 'i', 'BGT': 'i', 'BLT': 'i', 'BEQ': 'i', 'SWI': 'i',
+    'BX': 'r',
+}
+DIRECTIVES = ('.WORD', '.BYTE', '.SPACE')
+
+
+class AssemblerError(Exception):
+    def __init__(self, message, path=None, line=None):
+        location = ':'.join(str(part) for part in (path, line) if part is not None)
+        super().__init__(f"{location}: {message}" if location else message)
+
+
+def parse(source, path=None):
+    """ [(line number, label, mnemonic, operands)] of the statements in the source. """
+    statements = []
+    for number, line in enumerate(source.splitlines(), 1):
+        tokens = line.split(';', 1)[0].replace(',', ' ').split()
+        if not tokens:
+            continue
+
+        label = None
+        if tokens[0].upper() not in FORMATS and tokens[0].upper() not in DIRECTIVES:
+            label = tokens.pop(0).rstrip(':')
+            if not re.fullmatch(r'[A-Za-z_]\w*', label):
+                raise AssemblerError(f"Invalid label {label}", path, number)
+
+        mnemonic = tokens[0].upper() if tokens else None
+        if mnemonic is not None and mnemonic not in FORMATS and mnemonic not in DIRECTIVES:
+            raise AssemblerError(f"Unknown instruction {tokens[0]}", path, number)
+        statements.append((number, label, mnemonic, tokens[1:]))
+    return statements
+
+
+def statement_size(mnemonic, operands, path, number):
+    if mnemonic is None:
+        return 0
+    if mnemonic == '.WORD':
+        return 4
+    if mnemonic == '.BYTE':
+        return 1
+    if mnemonic == '.SPACE':
+        try:
+            return int(operands[0], 0)
+        except (IndexError, ValueError):
+            raise AssemblerError(".SPACE needs a size", path, number)
+    return INSTRUCTION_SIZE
+
+
+def assemble(source, loader=0, path=None):
+    """ Bytes of the .osx file for the assembly source. """
+    statements = parse(source, path)
+
+    # First pass, the address of every label and of the first instruction
+    labels = {}
+    address = 0
+    code_start = None
+    for number, label, mnemonic, operands in statements:
+        if label is not None:
+            if label in labels:
+                raise AssemblerError(f"Label {label} defined twice", path, number)
+            labels[label] = address
+        if mnemonic in FORMATS and code_start is None:
+            code_start = address
+        address += statement_size(mnemonic, operands, path, number)
+
+    def value(operand, number):
+        if operand in labels:
+            return labels[operand]
+        if len(operand) == 3 and operand[0] == operand[2] == "'":
+            return ord(operand[1])
+        try:
+            return int(operand, 0) & 0xFFFFFFFF
+        except ValueError:
+            raise AssemblerError(f"Unknown label or bad number {operand}", path, number)
+
+    def register(operand, number):
+        name = operand.strip('[]').upper()
+        if name not in REGISTERS:
+            raise AssemblerError(f"Unknown register {operand}", path, number)
+        return REGISTERS[name]
+
+    # Second pass, encode
+    body = bytearray()
+    for number, label, mnemonic, operands in statements:
+        if mnemonic is None:
+            continue
+        if mnemonic == '.WORD':
+            body += struct.pack('<I', value(operands[0], number))
+        elif mnemonic == '.BYTE':
+            body.append(value(operands[0], number) & 0xFF)
+        elif mnemonic == '.SPACE':
+            body += b' ' * statement_size(mnemonic, operands, path, number)
+        else:
+            layout = FORMATS[mnemonic]
+            if len(operands) != len(layout):
+                raise AssemblerError(f"{mnemonic} takes {len(layout)} operands, got {len(operands)}", path, number)
+            instruction = bytearray([OPCODES[mnemonic]])
+            for kind, operand in zip(layout, operands):
+                if kind == 'r':
+                    instruction.append(register(operand, number))
+                else:
+                    instruction += struct.pack('<I', value(operand, number))
+            body += instruction.ljust(INSTRUCTION_SIZE, b' ')
+
+    return struct.pack('III', len(body), code_start or 0, loader) + bytes(body)
+
+
+def assemble_file(path, loader=0, output=None):
+    """ Assemble path to output (path with .osx by default), returns the output path. """
+    output = output or os.path.splitext(path)[0] + '.osx'
+    with open(path) as f:
+        image = assemble(f.read(), loader, path)
+    with open(output, 'wb') as f:
+        f.write(image)
+    return output
+
+
+def file_hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+class BuildCache:
+    """ Source and output hashes of the files built in one directory, stored in .osx_build.json. """
+    def __init__(self, directory):
+        self.path = os.path.join(directory, CACHE_FILE)
+        try:
+            with open(self.path) as f:
+                self.entries = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self.entries = {}
+        self.changed = False
+
+    def is_fresh(self, source, output, source_hash, loader):
+        entry = self.entries.get(os.path.basename(source))
+        return (entry is not None and entry['source'] == source_hash and entry['loader'] == loader
+                and os.path.exists(output) and file_hash(output) == entry['output'])
+
+    def record(self, source, output, source_hash, loader):
+        self.entries[os.path.basename(source)] = {'source': source_hash, 'loader': loader, 'output': file_hash(output)}
+        self.changed = True
+
+    def save(self):
+        if self.changed:
+            with open(self.path, 'w') as f:
+                json.dump(self.entries, f, indent=1, sort_keys=True)
+            self.changed = False
+
+
+def build(paths, loader=0, force=False, loaders=None):
+    """
+    Assemble .asm files and every .asm in directories, skipping the ones the
+    build cache says are up to date unless `force`. `loaders` maps a file path
+    to its load address, the others use `loader`.
+    Returns {'built': [outputs], 'cached': [outputs]}.
+    """
+    sources = []
+    for path in paths:
+        if os.path.isdir(path):
+            sources += sorted(os.path.join(path, name) for name in os.listdir(path) if name.endswith('.asm'))
+        else:
+            sources.append(path)
+
+    caches = {}
+    result = {'built': [], 'cached': []}
+    for source in sources:
+        file_loader = (loaders or {}).get(source, loader)
+        output = os.path.splitext(source)[0] + '.osx'
+        directory = os.path.dirname(source) or '.'
+        cache = caches.setdefault(directory, BuildCache(directory))
+
+        source_hash = file_hash(source)
+        if not force and cache.is_fresh(source, output, source_hash, file_loader):
+            result['cached'].append(output)
+            continue
+
+        assemble_file(source, file_loader, output)
+        cache.record(source, output, source_hash, file_loader)
+        result['built'].append(output)
+
+    for cache in caches.values():
+        cache.save()
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Assemble osx assembly into .osx programs")
+    parser.add_argument('paths', nargs='+', help=".asm files or directories, a number after a file is its load address")
+    parser.add_argument('--force', action='store_true', help="Rebuild files the cache says are up to date")
+    args = parser.parse_args(argv)
+
+    # osx style "file.asm 10" pairs set the load address of the file before
+    paths, loaders = [], {}
+    for path in args.paths:
+        if path.isdigit() and paths:
+            loaders[paths[-1]] = int(path)
+        else:
+            paths.append(path)
+
+    try:
+        result = build(paths, force=args.force, loaders=loaders)
+    except (AssemblerError, OSError) as e:
+        print(f"Error: {e}")
+        return 1
+    for output in result['built']:
+        print(f"Built {output}")
+    print(f"{len(result['built'])} built, {len(result['cached'])} up to date")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,8 +1,10 @@
 import os
-from random import randint
+import random
+from Assembler import build
 
 class ProgramCreator:
-    def __init__(self, qty=3):
+    def __init__(self, qty=3, seed=None):
+        self.random = random.Random(seed)
         
         s_lines = 20
         m_lines = 500
@@ -15,13 +17,13 @@ class ProgramCreator:
                 'display_name': 'S'
             }, 
             'medium': {
-                'lines': 500,
-                'qty': m_lines,
+                'lines': m_lines,
+                'qty': qty,
                 'display_name': 'M'
             },
             'large': {
-                'lines': 2000,
-                'qty': l_lines,
+                'lines': l_lines,
+                'qty': qty,
                 'display_name': 'L'
             }
         }
@@ -63,12 +65,13 @@ class ProgramCreator:
             "IO": (5, 5)
         }
 
-        return instruction_set[0] if randint(1, 10) <= probabilities[program_type][0] else instruction_set[1]
+        return instruction_set[0] if self.random.randint(1, 10) <= probabilities[program_type][0] else instruction_set[1]
             
 
     def compile_programs(self):
-        """ Compiles all generated assembly programs """
+        """ Compiles all generated assembly programs, unchanged ones are skipped """
         pos = 0
+        loaders = {}
         for size_key, size in self.SIZES.items():
             display_name = size['display_name']
             directory = "programs/milestone_3"
@@ -76,12 +79,13 @@ class ProgramCreator:
                 lines = size['lines']
                 cpu_file = f"{directory}/{display_name}-CPU-{i+1}.asm"
                 io_file = f"{directory}/{display_name}-IO-{i+1}.asm"
-                os.system(f"osx {cpu_file} {pos}")
+                loaders[cpu_file] = pos
                 bites = lines * 6
                 pos += bites + 10
-                os.system(f"osx {io_file} {pos}")
+                loaders[io_file] = pos
                 bites = lines * 6
                 pos += bites + 10
+        return build(list(loaders), loaders=loaders)
 
 
 
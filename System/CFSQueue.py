@@ -0,0 +1,124 @@
+import heapq
+from itertools import count
+
+# Load weight of a nice 0 process, vruntime advances at wall clock speed for this weight
+NICE_0_WEIGHT = 1024
+
+
+class CFSQueue:
+    """
+    Run queue for the Completely Fair Scheduler (CFS).
+    Processes are kept in a min-heap keyed on their virtual runtime, the process
+    that has received the least weighted CPU time is always picked next.
+    Removed processes are deleted lazily, their heap entry is marked stale and
+    skipped when it reaches the top of the heap.
+    """
+    def __init__(self, target_latency=48, min_granularity=6):
+        self.heap = []
+        self.entries = {}  # pid -> heap entry, used for lazy deletion
+        self.counter = count()  # Tie breaker, equal vruntimes run in FIFO order
+        self.min_vruntime = 0
+        self.total_weight = 0
+
+        # Every runnable process should get the CPU once per target latency,
+        # but never for less than the minimum granularity
+        self.target_latency = target_latency
+        self.min_granularity = min_granularity
+
+    def __len__(self):
+        return len(self.entries)
+
+    @property
+    def processes(self):
+        """ Live processes in the order they will be picked. """
+        return [entry[-1] for entry in sorted(self.entries.values())]
+
+    def add_process(self, pcb):
+        if pcb.pid in self.entries:
+            self.remove_process(pcb)
+
+        entry = [pcb.vruntime, next(self.counter), pcb]
+        self.entries[pcb.pid] = entry
+        self.total_weight += pcb.weight
+        heapq.heappush(self.heap, entry)
+
+    def remove_process(self, pcb):
+        """ Remove a process without popping it, the heap entry is marked stale. """
+        entry = self.entries.pop(pcb.pid)
+        entry[-1] = None
+        self.total_weight -= pcb.weight
+
+    def get_process(self):
+        """ Pop the process with the smallest vruntime, skipping stale entries. """
+        while self.heap:
+            vruntime, _, pcb = heapq.heappop(self.heap)
+            if pcb is None:
+                continue
+            del self.entries[pcb.pid]
+            self.total_weight -= pcb.weight
+            self.update_min_vruntime(vruntime)
+            return pcb
+        raise IndexError("get_process from empty CFS queue")
+
+    def peek(self):
+        """ Return the process with the smallest vruntime without removing it. """
+        while self.heap and self.heap[0][-1] is None:
+            heapq.heappop(self.heap)
+        return self.heap[0][-1] if self.heap else None
+
+    def is_empty(self):
+        return len(self.entries) == 0
+
+    def get_quantum(self, pcb):
+        """
+        Time slice for a process that was just picked.
+        The scheduling period is the target latency, stretched when there are
+        too many runnable processes to give each of them the minimum granularity.
+        Each process gets a share of the period proportional to its weight.
+        """
+        nr_running = len(self.entries) + 1
+        period = self.target_latency
+        if nr_running * self.min_granularity > self.target_latency:
+            period = nr_running * self.min_granularity
+
+        total_weight = self.total_weight + pcb.weight
+        time_slice = period * pcb.weight // total_weight
+        return max(time_slice, self.min_granularity)
+
+    def account(self, pcb, delta):
+        """ Charge a process for `delta` ticks of CPU time, scaled by its weight. """
+        pcb.vruntime += delta * NICE_0_WEIGHT / pcb.weight
+        self.update_min_vruntime(pcb.vruntime)
+
+    def update_min_vruntime(self, vruntime):
+        """ min_vruntime only moves forward, it follows the leftmost process. """
+        leftmost = self.peek()
+        if leftmost is not None:
+            vruntime = min(vruntime, leftmost.vruntime)
+        self.min_vruntime = max(self.min_vruntime, vruntime)
+
+    def place_new(self, pcb):
+        """ New processes start at min_vruntime so they can't monopolize the CPU. """
+        pcb.vruntime = max(pcb.vruntime, self.min_vruntime)
+
+    def place_sleeper(self, pcb):
+        """
+        Processes returning from IO get credit for the time they slept, up to half
+        of the target latency, so interactive processes are picked ahead of CPU
+        bound ones without being able to bank unlimited credit.
+        """
+        credit = self.target_latency / 2
+        pcb.vruntime = max(pcb.vruntime, self.min_vruntime - credit)
+
+    def set_latency(self, target_latency, min_granularity):
+        self.target_latency = target_latency
+        self.min_granularity = min_granularity
+
+    def reset(self):
+        self.heap = []
+        self.entries = {}
+        self.counter = count()
+        self.min_vruntime = 0
+        self.total_weight = 0
+        self.target_latency = 48
+        self.min_granularity = 6
@@ -0,0 +1,42 @@
+import heapq
+from itertools import count
+
+
+class DeadlineQueue:
+    """
+    Run queue for Earliest Deadline First (EDF) scheduling.
+    Processes are kept in a min-heap keyed on their absolute deadline.
+    Processes without a deadline sort after every real-time process and
+    run in FIFO order among themselves.
+    """
+    def __init__(self):
+        self.heap = []
+        self.counter = count()  # Tie breaker, equal deadlines run in FIFO order
+
+    def __len__(self):
+        return len(self.heap)
+
+    @property
+    def processes(self):
+        """ Processes in the order they will be picked. """
+        return [entry[-1] for entry in sorted(self.heap)]
+
+    @staticmethod
+    def key(pcb):
+        return pcb.absolute_deadline if pcb.absolute_deadline is not None else float('inf')
+
+    def add_process(self, pcb):
+        heapq.heappush(self.heap, (self.key(pcb), next(self.counter), pcb))
+
+    def get_process(self):
+        return heapq.heappop(self.heap)[-1]
+
+    def peek(self):
+        return self.heap[0][-1] if self.heap else None
+
+    def is_empty(self):
+        return len(self.heap) == 0
+
+    def reset(self):
+        self.heap = []
+        self.counter = count()
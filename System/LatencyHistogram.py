@@ -0,0 +1,151 @@
+import math
+import os
+
+
+class LatencyHistogram:
+    """
+    Log-bucketed histogram of non-negative integer latencies (HDR style).
+    Values below `2 ** sub_bucket_bits` are counted exactly, larger values
+    share buckets that double in width every power of two, so the relative
+    error of a reported percentile stays below 2 / 2 ** sub_bucket_bits
+    while memory grows with the log of the largest value, not the number
+    of samples.
+    """
+    def __init__(self, sub_bucket_bits=5):
+        self.sub_bucket_bits = sub_bucket_bits
+        self.sub_bucket_count = 1 << sub_bucket_bits
+        self.half_count = self.sub_bucket_count // 2
+        self.counts = []
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def __len__(self):
+        return self.count
+
+    def bucket_index(self, value):
+        if value < self.sub_bucket_count:
+            return value
+        shift = value.bit_length() - self.sub_bucket_bits
+        return self.sub_bucket_count + (shift - 1) * self.half_count + (value >> shift) - self.half_count
+
+    def bucket_range(self, index):
+        """ Lowest and highest value counted in a bucket. """
+        if index < self.sub_bucket_count:
+            return index, index
+        shift = (index - self.sub_bucket_count) // self.half_count + 1
+        sub_bucket = (index - self.sub_bucket_count) % self.half_count + self.half_count
+        return sub_bucket << shift, ((sub_bucket + 1) << shift) - 1
+
+    def record(self, value):
+        value = int(value)
+        if value < 0:
+            raise ValueError(f"Latencies can't be negative, got {value}")
+
+        index = self.bucket_index(value)
+        if index >= len(self.counts):
+            self.counts.extend([0] * (index + 1 - len(self.counts)))
+        self.counts[index] += 1
+
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def mean(self):
+        return self.total / self.count if self.count else 0
+
+    def percentile(self, percentile):
+        """ Highest value of the bucket holding the requested percentile, capped at the max. """
+        if not self.count:
+            return 0
+        rank = max(1, math.ceil(percentile / 100 * self.count))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return min(self.bucket_range(index)[1], self.max)
+        return self.max
+
+    def summary(self, percentiles=(50, 90, 99)):
+        summary = {'avg': round(self.mean(), 2)}
+        for percentile in percentiles:
+            summary[f'p{percentile}'] = self.percentile(percentile)
+        summary['max'] = self.max or 0
+        return summary
+
+    def reset(self):
+        self.counts = []
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+
+class LatencyStats:
+    """
+    Streaming waiting, response and turnaround time accumulators.
+    Each terminated PCB is recorded once, overall and broken down by its final
+    MLFQ queue level and by program type, so metrics don't need the PCBs kept.
+    """
+    METRICS = {
+        'wait_time': 'waiting_time',
+        'response_time': 'response_time',
+        'turnaround': 'turnaround_time'
+    }
+
+    def __init__(self):
+        self.reset()
+
+    def __len__(self):
+        return self.n_jobs
+
+    @staticmethod
+    def program_type(pcb):
+        """ Type of a generated program (S-CPU-1.osx -> CPU), otherwise the program name. """
+        if not pcb.file:
+            return 'unknown'
+        name = os.path.splitext(os.path.basename(pcb.file))[0]
+        parts = name.split('-')
+        return parts[1] if len(parts) > 1 else name
+
+    @classmethod
+    def new_group(cls):
+        return {metric: LatencyHistogram() for metric in cls.METRICS}
+
+    def record(self, pcb):
+        self.n_jobs += 1
+        self.busy_time += pcb.execution_time
+
+        groups = [self.overall,
+                  self.by_queue_level.setdefault(pcb.queue_level, self.new_group()),
+                  self.by_program_type.setdefault(self.program_type(pcb), self.new_group())]
+        for metric, attribute in self.METRICS.items():
+            value = getattr(pcb, attribute)
+            for group in groups:
+                group[metric].record(value)
+
+    @staticmethod
+    def summarize(group):
+        """ Flat dict such as {'n_jobs': 3, 'avg_wait_time': 1.5, 'p99_wait_time': 4, ...} """
+        summary = {'n_jobs': len(group['wait_time'])}
+        for metric, histogram in group.items():
+            for stat, value in histogram.summary().items():
+                summary[f'{stat}_{metric}'] = value
+        return summary
+
+    def get_metrics(self):
+        metrics = self.summarize(self.overall)
+        metrics['by_queue_level'] = {level: self.summarize(group)
+                                     for level, group in sorted(self.by_queue_level.items())}
+        metrics['by_program_type'] = {program_type: self.summarize(group)
+                                      for program_type, group in sorted(self.by_program_type.items())}
+        return metrics
+
+    def reset(self):
+        self.n_jobs = 0
+        self.busy_time = 0
+        self.overall = self.new_group()
+        self.by_queue_level = {}
+        self.by_program_type = {}
@@ -1,7 +1,12 @@
 from hardware.Memory import Memory
-from struct import unpack
+from struct import unpack_from
+from .paging import PageTable, REFERENCE, DIRTY, NO_FRAME
+from .ProgramCache import PROGRAM_CACHE
 from constants import PCBState
-from .paging import PageTableEntry
+
+# Global eviction takes a page from the first process holding frames in the
+# earliest of these states, the running process keeps its pages
+EVICTION_ORDER = (PCBState.NEW, PCBState.WAITING, PCBState.SUSPENDED, PCBState.TERMINATED, PCBState.READY)
 
 class MemoryManager:
     """
@@ -12,7 +17,6 @@ class MemoryManager:
     def __init__(self, system, size):
         self.memory = Memory(size)
         self.system = system
-        self.memory_map = []
 
         # Initial page size 4 lines of code, can be changed by 
         # set_page_size() method
@@ -29,39 +33,54 @@ class MemoryManager:
         # This is used to keep track of which frames are available for allocation
         self.free_frames = list(range(self.num_frames))
 
+        # Frames every admitted process is guaranteed, a job is only admitted
+        # while the minimum resident sets of all live processes fit in memory
+        # This can be changed by set_min_resident_pages() method
+        self.min_resident_pages = 2
+
+        # PID -> frames reserved for each admitted process that hasn't exited
+        self.reservations = {}
+
+        # PID -> PCB of the processes with resident pages, the candidates for global eviction
+        self.holders = {}
+
         # Dictionary to store loaded programs
         # The key is the process ID (PID) and the value is the program data
         # This allows for easy access to the program data when needed
         # Simulates our hard disk
         self.programs = {}
 
+        # Parsed .osx files, shared between launches of the same program
+        self.program_cache = PROGRAM_CACHE
+
         # Track number of page faults
         self.page_faults = 0
 
-    def prepare_program(self, filepath):
-        """Validate program file and memory availability before loading."""
+        # Clock ticks a page fault stalls the CPU for, reading the page from disk
+        # 0 by default, faults are free and only counted
+        self.fault_cost = 0
+
+        # When set to a list, every translation appends (pid, virtual address),
+        # used to compute page fault curves offline (see experiments/fault_curves.py)
+        self.reference_trace = None
+
+    def prepare_program(self, filepath, image=None):
+        """
+        Validate program file and memory availability before loading.
+        With `image` (the bytes of an .osx file) the program is never read
+        from disk, `filepath` only names it.
+        """
 
         if not filepath:
             return self.system_code(103, "Please specify the file path.")
+
+        if image is not None:
+            byte_size, pc, loader = unpack_from('III', image)
+            return self._program_info(filepath, byte_size, pc, loader, image)
                 
         try:
-            with open(filepath, 'rb') as f:
-                # Unpack header, which consists of 3 integers (12 bytes)
-                byte_size, pc, loader = self._read_header(f)
-                
-                if not self._is_valid_loader(loader, byte_size, filepath):
-                    return None
-                
-                return {
-                    'filepath': filepath,
-                    'byte_size': byte_size,
-                    'loader': loader,
-                    'pc': pc,
-                    'code_start': pc,
-                    'code_end': loader + byte_size - 1,
-                    'data_start': loader,
-                    'data_end': pc - 1
-                }
+            program = self.program_cache.get(filepath)
+            return self._program_info(filepath, program.byte_size, program.pc, program.loader, program.image)
 
         except FileNotFoundError:
             self.system_code(109, f"File not found: {filepath}")
@@ -72,11 +91,22 @@ class MemoryManager:
             print(e)
             return None
         
-    def _read_header(self, f):
-        header = f.read(12)
-        byte_size, pc, loader = unpack('III', header) 
-        return byte_size, pc, loader
-    
+    def _program_info(self, filepath, byte_size, pc, loader, image=None):
+        if not self._is_valid_loader(loader, byte_size, filepath):
+            return None
+
+        return {
+            'filepath': filepath,
+            'byte_size': byte_size,
+            'loader': loader,
+            'pc': pc,
+            'code_start': pc,
+            'code_end': loader + byte_size - 1,
+            'data_start': loader,
+            'data_end': pc - 1,
+            'image': image
+        }
+
     def _is_valid_loader(self, loader, byte_size, filepath):
         """ Validate loader address and program size. """
         if byte_size <= 0:
@@ -89,23 +119,35 @@ class MemoryManager:
                 
         return True
     
-    def allocate_memory(self, pcb):
-        """ Allocate memory if available and update memory map. """
-        start = pcb.loader
-        end = start + pcb.byte_size
-        if self.check_memory_available(pcb):
-            self.memory_map.append({'start': start, 'end': end, 'pcb': pcb})
+    def reserved_frames(self, pcb):
+        """ Frames admission sets aside for `pcb`, its minimum resident set. """
+        num_pages = (pcb.byte_size + self.page_size - 1) // self.page_size
+        return min(num_pages, self.min_resident_pages, self.num_frames)
+
+    def can_admit(self, pcb):
+        """ Whether the minimum resident set of `pcb` fits next to those of the admitted processes. """
+        return sum(self.reservations.values()) + self.reserved_frames(pcb) <= self.num_frames
+
+    def admit(self, pcb):
+        """
+        Reserve the minimum resident set of `pcb` if it fits. Where the program
+        was compiled to load doesn't matter, its pages go to any free frames.
+        """
+        if pcb.pid in self.reservations:
             return True
-        return False
-    
+        if not self.can_admit(pcb):
+            self.system.print(f"[ADMIT] PID {pcb.pid} waits, {self.num_frames - sum(self.reservations.values())} unreserved frames")
+            return False
+        self.reservations[pcb.pid] = self.reserved_frames(pcb)
+        return True
 
     def load_to_memory(self, pcb):
         """
         Loads a program into main memory from its associated file.
 
-        This method reads the binary contents of a program file, skipping the initial
-        12 bytes of the header, and stores the program's content into memory mapped by
-        the process ID (PID). It also initializes the process's page table, calculates
+        This method takes the binary contents of a program (from the program cache,
+        or the image of a generated program), skipping the initial 12 bytes of the
+        header, and stores the program's content into memory mapped by the process ID (PID). It also initializes the process's page table, calculates
         the number of pages needed, and sets memory management properties like the maximum 
         number of resident pages allowed.
 
@@ -121,23 +163,27 @@ class MemoryManager:
             None: Any file-related exceptions are caught and handled internally.
         """
         try:
-            with open(pcb.file, 'rb') as f:
-                # Skip header
-                f.seek(12) 
+            image = pcb.image
+            if image is None:
+                image = self.program_cache.get(pcb.file).image
 
-                # Store program in memory
-                self.programs[pcb.pid] = f.read(pcb.byte_size) 
+            # A view of the image without the header, pages are sliced from it
+            # without copying until a dirty page is written back
+            self.programs[pcb.pid] = memoryview(image)[12:12 + pcb.byte_size]
         
         except Exception as e:
-            self.system_code(100, f"Error loading {pcb['file']}: {e}")
+            self.system_code(100, f"Error loading {pcb.file}: {e}")
             return None
         
-        # Reset page table
-        pcb.page_table = {} 
-        
+        # Free the frames of the program it replaces (exec)
+        self.free_frames_of(pcb)
+
         # Calculate number of pages
         pcb.num_pages = (pcb.byte_size + self.page_size -1) // self.page_size 
 
+        # Reset page table, one row per page
+        pcb.page_table = PageTable(pcb.num_pages)
+
         # Set max resident pages
         pcb.max_resident_pages = self.default_page_limit 
         
@@ -170,11 +216,11 @@ class MemoryManager:
             - Evicts system-wide pages if there are no free frames.
             - Updates the page table and memory once the page is loaded.
         """
-        if page_number >= pcb.num_pages:
+        if not 0 <= page_number < pcb.num_pages:
             raise MemoryError("Page number out of bounds.")
         
         # Check if page is already loaded
-        if page_number in pcb.page_table and pcb.page_table[page_number].valid:
+        if pcb.page_table.is_valid(page_number):
             return
         
         # Check how many pages are currently loaded
@@ -201,93 +247,141 @@ class MemoryManager:
 
 
         # update page table
-        pcb.page_table[page_number] = PageTableEntry(frame=frame, valid=True, reference=True, dirty=False)
+        pcb.page_table.map(page_number, frame)
         pcb.resident_pages.add(page_number)
+        self.holders[pcb.pid] = pcb
         self.system.print(f"Program '{pcb.file}' loaded page {page_number} -> frame {frame}.")
 
-    def translate(self, pcb, virtual_address):
-        """ Translate a virtual address to a physical address. """
+    def translate(self, pcb, virtual_address, write=False):
+        """ Translate a virtual address to a physical address, `write` marks the page dirty. """
+        if self.reference_trace is not None:
+            self.reference_trace.append((pcb.pid, virtual_address))
+
         # Get the page number the virtual address maps to
         page_number = virtual_address // self.page_size
 
         # Get the offset within the page
         offset = virtual_address % self.page_size
 
-        # Check if the page is loaded
-        if page_number not in pcb.page_table or pcb.page_table[page_number].valid == False:
+        # Check if the page is loaded, pages without a frame are invalid
+        table = pcb.page_table
+        try:
+            frame = table.frames[page_number]
+        except IndexError:
+            frame = NO_FRAME
+        if frame == NO_FRAME or page_number < 0:
             self.page_faults += 1
-            # if page not loaded, load to memory
+            if self.fault_cost:
+                self.system.clock += self.fault_cost
+            # if page not loaded, load to memory, out of bounds pages raise MemoryError
             self.load_page(pcb, page_number)
+            frame = table.frames[page_number]
 
-        frame = pcb.page_table[page_number].frame
+        if write:
+            table.flags[page_number] |= DIRTY
         physical_address = (frame * self.page_size) + offset
         return physical_address
     
     def evict_page(self, target_pcb=None):
         """ Evict a page from memory. """
         if target_pcb: # Max number of pages for this pcb has been reached
-            for vp, entry in target_pcb.page_table.items():
-                if entry.valid:
-                    self.system.print(f"[EVICT] PID {target_pcb.pid} - Page {vp} evicted (limit reached).")
-
-                    # Invalidate page
-                    entry.valid = False
-                    target_pcb.resident_pages.remove(vp)
-
-                    # free the frame
-                    self.free_frames.append(entry.frame)
-
-                    # clear frame info so it's not used again without reload
-                    entry.frame = None
-
-                    return
+            if target_pcb.resident_pages:
+                vp = min(target_pcb.resident_pages)
+                self.system.print(f"[EVICT] PID {target_pcb.pid} - Page {vp} evicted (limit reached).")
+                self.release_page(target_pcb, vp)
+                return
         else:
-            # Default behavior - evict any valid page from any process
-            for pcb in self.system.process_table().values():
-                for vp, entry in pcb.page_table.items():
-                    if entry.valid:
-                        # Evict the page
+            # Default behavior - evict a page of the process holding frames
+            # that is furthest from running, see EVICTION_ORDER
+            for state in EVICTION_ORDER:
+                for pcb in self.holders.values():
+                    if pcb.state != state:
+                        continue
+                    if pcb.resident_pages:
+                        vp = min(pcb.resident_pages)
                         self.system.print(f"Evicting page {vp} from process {pcb.pid}.")
+                        pcb.page_table.flags[vp] &= ~REFERENCE
+                        self.release_page(pcb, vp)
+                        return
 
-                        # Invalidate the page
-                        entry.valid = False
-                        entry.reference = False
-                        entry.dirty = False
+    def release_page(self, pcb, page_number):
+        """ Write back and invalidate a resident page, freeing its frame. """
+        self.write_back(pcb, page_number)
+        pcb.resident_pages.discard(page_number)
+        if not pcb.resident_pages:
+            self.holders.pop(pcb.pid, None)
 
-                        # Free the frame
-                        self.free_frames.append(entry.frame)
-                        return
+        # free the frame, clear frame info so it's not used again without reload
+        self.free_frames.append(pcb.page_table.unmap(page_number))
+
+    def write_back(self, pcb, page_number):
+        """ Copy a dirty page back to the program store before its frame is reused. """
+        table = pcb.page_table
+        if not table.flags[page_number] & DIRTY:
+            return
+        program = self.programs[pcb.pid]
+        if not isinstance(program, bytearray):
+            program = self.programs[pcb.pid] = bytearray(program)
+
+        page_start = page_number * self.page_size
+        length = min(self.page_size, len(program) - page_start)
+        mem_start = table.frames[page_number] * self.page_size
+        program[page_start:page_start + length] = bytes(self.memory[mem_start:mem_start + length])
+        table.flags[page_number] &= ~DIRTY
+
+    def free_frames_of(self, pcb):
+        """ Return the frames of every resident page of `pcb` to the free list, clearing them. """
+        for page_number in pcb.resident_pages:
+            frame = pcb.page_table.unmap(page_number)
+            mem_start = frame * self.page_size
+            self.memory[mem_start:mem_start + self.page_size] = bytes(self.page_size)
+            self.free_frames.append(frame)
+        pcb.resident_pages.clear()
+        self.holders.pop(pcb.pid, None)
+
+    def fork(self, parent, child):
+        """ Give `child` its own copy of the memory of `parent`, reloaded page by page on demand. """
+        for page_number in parent.resident_pages:
+            self.write_back(parent, page_number)
+
+        # An unmodified image is shared, write_back copies it before the first change
+        program = self.programs[parent.pid]
+        self.programs[child.pid] = bytearray(program) if isinstance(program, bytearray) else program
+
+        child.page_table = PageTable(parent.num_pages)
+        child.resident_pages = set()
+        child.num_pages = parent.num_pages
+        child.max_resident_pages = parent.max_resident_pages
+        self.reservations[child.pid] = self.reserved_frames(child)
+
+    def swap_out(self, pcb):
+        """ Write back the dirty pages of `pcb`, free its frames and release its reservation. """
+        for page_number in pcb.resident_pages:
+            self.write_back(pcb, page_number)
+        return self.free_memory(pcb)
 
     def free_memory(self, pcb):
-        """ Free memory and update memory map. """
-        start = pcb.loader
-        end = start + pcb.byte_size
-        self.memory_map = [alloc for alloc in self.memory_map if alloc['pcb'].pid != pcb.pid]
-        self.memory[start:end] = [0] * (end - start) # Clear memory
+        """ Free the frames of an exited process and release its reservation. """
+        self.free_frames_of(pcb)
+        self.reservations.pop(pcb.pid, None)
+        return True
+
+    def release(self, pcb):
+        """
+        Drop the program bytes and page table of an exited process whose
+        frames were freed. A process run from the shell keeps its frames,
+        and so its page table, for the coredump.
+        """
+        if pcb.pid in self.holders:
+            return False
+        self.programs.pop(pcb.pid, None)
+        pcb.page_table = PageTable()
+        pcb.image = None
         return True
-        # return False
-    
 
     def system_code(self, code, *args):
         self.system.system_code(code, *args)
 
-    def check_memory_available(self, pcb):
-        start = pcb.loader
-        end = start + pcb.byte_size
-
-        for alloc in self.memory_map:
-            alloc_start = alloc['start']
-            alloc_end = alloc['end']
-
-            # if (end <= alloc['start'] or start >= alloc['end']):
-            if (start < alloc_end) and (alloc_start < end):
-                if alloc['pcb'].state == PCBState.TERMINATED:
-                    self.free_memory(alloc['pcb'])
-                    return True
-                else:
-                    return False
-        return True
-    
     def set_page_limit(self, limit):
         if limit <= 0:
             self.system_code(101, "Invalid page limit.")
@@ -297,6 +391,15 @@ class MemoryManager:
 
     def get_page_limit(self):
         return self.default_page_limit
+
+    def set_min_resident_pages(self, pages):
+        """ Frames reserved per process at admission, fewer admits more processes at once. """
+        if pages <= 0:
+            self.system_code(101, "Invalid minimum resident set.")
+            return False
+        self.min_resident_pages = pages
+        self.system.print(f"Set minimum resident set to {pages} pages.")
+        return True
     
     def set_page_size(self, size):
         """ Change the page size for memory management. """
@@ -317,5 +420,14 @@ class MemoryManager:
         """ Get the current page size. """
         return self.page_size
 
+    def reset(self):
+        """ Clear memory, frames and loaded programs, keeping the page size and limits. """
+        self.memory[0:self.memory.size] = bytes(self.memory.size)
+        self.free_frames = list(range(self.num_frames))
+        self.reservations = {}
+        self.holders = {}
+        self.programs = {}
+        self.page_faults = 0
+
     def system_code(self, code, *args):
         self.system.system_code(code, *args)
@@ -0,0 +1,85 @@
+class MemoryPressure:
+    """
+    Memory pressure monitor for the long-term scheduler.
+
+    Tracks the global page fault rate (faults per instruction, smoothed over
+    windows of `window` instructions) and a working set estimate for every
+    admitted process: the pages it had resident at the end of its last slice
+    plus the faults it took in that slice, at most its page count, decaying
+    by one page per slice when a slice touches fewer pages. Memory is
+    overloaded when the fault rate is above `threshold` and the working sets
+    of the admitted processes don't fit in the frames of memory; the
+    scheduler then holds back admissions and suspends processes. A suspended
+    process comes back once its working set fits next to the others.
+    """
+    def __init__(self, system, threshold=0.2, window=50, smoothing=0.5):
+        self.system = system
+        self.enabled = True
+        self.threshold = threshold
+        self.window = window
+        self.smoothing = smoothing
+        self.reset()
+
+    @property
+    def memory_manager(self):
+        return self.system.memory_manager
+
+    def reset(self):
+        self.fault_rate = 0.0
+        self.window_faults = 0
+        self.window_instructions = 0
+        self.working_sets = {}  # PID -> estimated working set in pages
+        self.suspensions = 0
+        self.resumptions = 0
+
+    def observe(self, pcb, instructions, faults):
+        """ `pcb` executed `instructions` and took `faults` page faults in its last slice. """
+        self.window_faults += faults
+        self.window_instructions += instructions
+        if self.window_instructions >= self.window:
+            sample = self.window_faults / self.window_instructions
+            self.fault_rate = self.smoothing * self.fault_rate + (1 - self.smoothing) * sample
+            self.window_faults = 0
+            self.window_instructions = 0
+
+        # A short slice sees only part of the working set, the estimate
+        # shrinks by at most a page per slice
+        sample = min(pcb.num_pages, len(pcb.resident_pages) + faults)
+        self.working_sets[pcb.pid] = max(sample, self.working_sets.get(pcb.pid, 0) - 1)
+
+    def working_set(self, pcb):
+        """ Estimated working set of `pcb`, its reserved frames until it has run. """
+        estimate = self.working_sets.get(pcb.pid)
+        if estimate is None:
+            estimate = self.memory_manager.reserved_frames(pcb)
+        return max(estimate, self.memory_manager.reserved_frames(pcb))
+
+    def demand(self):
+        """ Sum of the working sets of the admitted processes. """
+        reservations = self.memory_manager.reservations
+        return sum(max(self.working_sets.get(pid, frames), frames) for pid, frames in reservations.items())
+
+    def overloaded(self):
+        return (self.enabled and self.fault_rate > self.threshold
+                and self.demand() > self.memory_manager.num_frames)
+
+    def should_suspend(self, pcb):
+        """ Whether to swap out `pcb`, never the last admitted process. """
+        return (self.overloaded() and pcb.pid in self.memory_manager.reservations
+                and len(self.memory_manager.reservations) > 1)
+
+    def can_resume(self, pcb):
+        """ Whether a suspended `pcb` fits back in memory, always when nothing else is admitted. """
+        if not self.memory_manager.reservations:
+            return True
+        if not self.memory_manager.can_admit(pcb):
+            return False
+        return self.demand() + self.working_set(pcb) <= self.memory_manager.num_frames
+
+    def forget(self, pcb):
+        self.working_sets.pop(pcb.pid, None)
+
+    def get_metrics(self):
+        return {'fault_rate': round(self.fault_rate, 3),
+                'suspensions': self.suspensions,
+                'resumptions': self.resumptions}
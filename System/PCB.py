@@ -1,14 +1,37 @@
-from constants import PCBState
+from constants import PCBState, MIN_NICE, MAX_NICE, NICE_TO_WEIGHT
+
+try:
+    from .paging import PageTable
+except ImportError:
+    from paging import PageTable
 
 class PCB:
     """
     Process Control Block (PCB) class to manage process information.
     Each PCB contains information about the process's state, registers,
     memory management, metrics, and child processes.
+    Attributes are fixed slots, a PCB has no __dict__.
     """
+    __slots__ = ('process_table', 'pid', '_file', 'pc', 'registers', '_state',
+                 'page_table', 'resident_pages', 'max_resident_pages', 'num_pages',
+                 'loader', 'byte_size', 'data_start', 'data_end', 'code_start', 'code_end', 'image',
+                 'arrival_time', 'start_time', 'end_time', 'waiting_time', 'execution_time',
+                 'response_time', 'turnaround_time', 'wait_until',
+                 'children', 'parent_pid', 'exit_statuses',
+                 'queue_level', 'run_count', 'preempt_count', 'vruntime', 'weight',
+                 'nice', 'static_priority', 'priority', 'enqueued_at', 'aged_at', 'boosts', 'longest_wait',
+                 'deadline', 'period', 'wcet', 'absolute_deadline', 'CPU_code')
+
     def __init__(self, pid, pc, registers=None, state=PCBState.NEW):
+        self.reset(pid, pc, registers, state)
+
+    def reset(self, pid, pc, registers=None, state=PCBState.NEW):
+        """ Set every field as a new PCB has it, PCBPool reuses PCBs this way. """
+        # Set by ProcessTable.add, told about every state and file change
+        self.process_table = None
+
         self.pid = pid
-        self.file = None
+        self._file = None
 
         # Registers
         self.pc = pc
@@ -18,12 +41,13 @@ class PCB:
             self.registers = [0] * 12
 
         # States
-        self.state = state
+        self._state = state
 
         # memory management
-        self.page_table = {}
+        self.page_table = PageTable()
         self.resident_pages = set()
         self.max_resident_pages = None
+        self.num_pages = 0
 
         # Code Sections
         self.loader = None
@@ -32,6 +56,7 @@ class PCB:
         self.data_end = None
         self.code_start = None
         self.code_end = None
+        self.image = None  # .osx bytes of the program, from the program cache or generated in memory
 
         # Metrics
         self.arrival_time = None
@@ -41,16 +66,59 @@ class PCB:
         self.execution_time = 0
         self.response_time = None
         self.turnaround_time = None
+        self.wait_until = None
 
         # Children
         self.children = []
+        self.parent_pid = None
+        self.exit_statuses = {}  # PID -> R0 of every child reaped by wait
 
         self.queue_level = 1
         self.run_count = 0
         self.preempt_count = 0
 
+        # CFS
+        self.vruntime = 0
+        self.weight = 1024
+
+        # Priority scheduling, priority is an index into the priority array
+        # where 0 is the highest priority. Aging lowers it while the process waits.
+        self.nice = 0
+        self.static_priority = self.nice - MIN_NICE
+        self.priority = self.static_priority
+        self.enqueued_at = None
+        self.aged_at = None
+        self.boosts = 0
+        self.longest_wait = 0
+
+        # EDF, deadline and period are relative to the arrival time
+        self.deadline = None
+        self.period = None
+        self.wcet = None
+        self.absolute_deadline = None
+
         self.CPU_code = None
 
+    @property
+    def state(self):
+        return self._state
+
+    @state.setter
+    def state(self, state):
+        if state is not self._state and self.process_table is not None:
+            self.process_table.state_changed(self, self._state, state)
+        self._state = state
+
+    @property
+    def file(self):
+        return self._file
+
+    @file.setter
+    def file(self, filepath):
+        if filepath != self._file and self.process_table is not None:
+            self.process_table.file_changed(self, self._file, filepath)
+        self._file = filepath
+
     def __str__(self):
         return f"PCB(pid={self.pid}, file={self.file}, state={self.state.name})"
         
@@ -105,22 +173,61 @@ class PCB:
     def set_arrival_time(self, time):
         self.arrival_time = time
 
+    def set_nice(self, nice):
+        """
+        Set the nice value, clamped to [-20, 19]. This sets the static
+        priority and the CFS weight of the process.
+        """
+        self.nice = max(MIN_NICE, min(MAX_NICE, nice))
+        self.static_priority = self.nice - MIN_NICE
+        self.priority = self.static_priority
+        self.weight = NICE_TO_WEIGHT[self.static_priority]
+
+    def set_deadline(self, deadline=None, period=None, wcet=None):
+        """
+        Make this a real-time process. A period without a deadline sets an
+        implicit deadline equal to the period. The worst case execution time
+        defaults to the number of instructions in the code section.
+        """
+        if deadline is None and period is None:
+            return
+
+        self.deadline = deadline if deadline is not None else period
+        self.period = period
+        self.wcet = wcet if wcet is not None else self.code_length()
+        self.absolute_deadline = self.arrival_time + self.deadline
+
+    def code_length(self):
+        """ Number of instructions in the code section. """
+        return (self.byte_size - self.code_start) // 6
+
+    def utilization(self):
+        """ Fraction of the CPU this process needs to meet its deadline. """
+        window = self.deadline if self.period is None else min(self.deadline, self.period)
+        return self.wcet / window
+
     def get_pc(self):
         return self.registers[11]
    
-    def make_child(self, pid, pc):
+    def make_child(self, pid, pc, pool=None):
         """
         Create a child PCB with the same state and registers as the parent.
         The child PCB will have a new PID and program counter (PC).
+        With a PCBPool the child reuses a free PCB.
         """
-        child = PCB(pid, pc, self.registers.copy(), self.state)
+        if pool is not None:
+            child = pool.acquire(pid, pc, self.registers.copy(), self.state)
+        else:
+            child = PCB(pid, pc, self.registers.copy(), self.state)
         child.loader = self.loader
         child.byte_size = self.byte_size
         child.data_start = self.data_start
         child.data_end = self.data_end
         child.code_start = self.code_start
         child.code_end = self.code_end
+        child.image = self.image
         child.file = self.file + " (child)"
+        child.parent_pid = self.pid
 
         self.add_child(child)
 
@@ -0,0 +1,113 @@
+from collections import deque
+from constants import NUM_PRIORITIES
+
+
+class PriorityArray:
+    """
+    Run queue for priority scheduling, modeled on the Linux O(1) scheduler.
+    There is one FIFO deque per priority level and a bitmap with a bit set for
+    every non-empty level, the next process is found from the lowest set bit
+    so picking does not depend on the number of processes.
+
+    Waiting processes age: every `aging_interval` ticks spent in the queue
+    moves a process up one priority level, so low priority processes can't
+    starve. A process drops back to its static priority once it runs.
+    """
+    def __init__(self, clock, quantum=10, aging_interval=20):
+        self.clock = clock
+        self.queues = [deque() for _ in range(NUM_PRIORITIES)]
+        self.bitmap = 0
+        self.count = 0
+        self.quantum = quantum  # Time slice at nice 0
+        self.aging_interval = aging_interval
+
+        # Starvation statistics
+        self.longest_wait = 0
+        self.boosts = 0
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def processes(self):
+        """ Processes in the order they will be picked. """
+        return [pcb for queue in self.queues for pcb in queue]
+
+    def add_process(self, pcb):
+        pcb.enqueued_at = self.clock.time
+        pcb.aged_at = self.clock.time
+        self._push(pcb)
+
+    def _push(self, pcb):
+        self.queues[pcb.priority].append(pcb)
+        self.bitmap |= 1 << pcb.priority
+        self.count += 1
+
+    def _pop(self, priority):
+        queue = self.queues[priority]
+        pcb = queue.popleft()
+        if not queue:
+            self.bitmap &= ~(1 << priority)
+        self.count -= 1
+        return pcb
+
+    def highest_priority(self):
+        """ Highest priority level with a waiting process, None if the array is empty. """
+        if not self.bitmap:
+            return None
+        return (self.bitmap & -self.bitmap).bit_length() - 1
+
+    def get_process(self):
+        """ Pop the first process of the highest priority non-empty level. """
+        if not self.bitmap:
+            raise IndexError("get_process from empty priority array")
+
+        self.age()
+        pcb = self._pop(self.highest_priority())
+
+        wait = self.clock.time - pcb.enqueued_at
+        pcb.longest_wait = max(pcb.longest_wait, wait)
+        self.longest_wait = max(self.longest_wait, wait)
+        pcb.priority = pcb.static_priority
+        return pcb
+
+    def age(self):
+        """
+        Boost every process that has waited `aging_interval` ticks since it was
+        queued or last boosted. Each deque is ordered by the time its processes
+        were last aged, so only the front of each level has to be checked.
+        """
+        if self.aging_interval <= 0:
+            return
+
+        now = self.clock.time
+        bitmap = self.bitmap & ~1  # Processes at the top level can't be boosted
+        while bitmap:
+            priority = (bitmap & -bitmap).bit_length() - 1
+            bitmap &= bitmap - 1
+
+            queue = self.queues[priority]
+            while queue and now - queue[0].aged_at >= self.aging_interval:
+                pcb = self._pop(priority)
+                levels = (now - pcb.aged_at) // self.aging_interval
+                pcb.priority = max(0, pcb.priority - levels)
+                pcb.aged_at = now
+                pcb.boosts += 1
+                self.boosts += 1
+                self._push(pcb)
+
+    def get_quantum(self, pcb):
+        """ Higher static priority gets a longer time slice, up to twice the nice 0 quantum. """
+        return max(1, self.quantum * (NUM_PRIORITIES - pcb.static_priority) // 20)
+
+    def set_aging_interval(self, aging_interval):
+        self.aging_interval = aging_interval
+
+    def reset(self):
+        self.queues = [deque() for _ in range(NUM_PRIORITIES)]
+        self.bitmap = 0
+        self.count = 0
+        self.quantum = 10
+        self.aging_interval = 20
+        self.longest_wait = 0
+        self.boosts = 0
@@ -0,0 +1,68 @@
+from array import array
+
+# Stored for times and deadlines that were never set
+UNSET = -1
+
+
+class ProcessArchive:
+    """
+    Column store of terminated processes, one fixed width row per process
+    in the order they exited: 8 byte integers for ids and counters, 8 byte
+    floats for times (arrivals can be fractional). Program paths are
+    stored once and referenced by a file id. A row costs
+    len(COLUMNS) * 8 bytes, against a few kilobytes for a PCB with its
+    page table, so long runs keep every process's metrics without keeping
+    the processes.
+    """
+    COLUMNS = ('pid', 'file_id', 'arrival_time', 'start_time', 'end_time', 'execution_time',
+               'waiting_time', 'response_time', 'turnaround_time', 'run_count', 'preempt_count',
+               'queue_level', 'exit_status', 'absolute_deadline')
+    TIMES = ('arrival_time', 'start_time', 'end_time', 'waiting_time', 'response_time',
+             'turnaround_time', 'absolute_deadline')
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        for column in self.COLUMNS:
+            setattr(self, column, array('d' if column in self.TIMES else 'q'))
+        self.files = []
+        self.file_ids = {}
+
+    def __len__(self):
+        return len(self.pid)
+
+    def __iter__(self):
+        return (self.row(index) for index in range(len(self)))
+
+    def append(self, pcb):
+        file_id = self.file_ids.get(pcb.file)
+        if file_id is None:
+            file_id = self.file_ids[pcb.file] = len(self.files)
+            self.files.append(pcb.file)
+
+        values = (pcb.pid, file_id, pcb.arrival_time, pcb.start_time, pcb.end_time, pcb.execution_time,
+                  pcb.waiting_time, pcb.response_time, pcb.turnaround_time, pcb.run_count, pcb.preempt_count,
+                  pcb.queue_level, pcb.registers[0], pcb.absolute_deadline)
+        for column, value in zip(self.COLUMNS, values):
+            getattr(self, column).append(UNSET if value is None else value)
+
+    def row(self, index):
+        """ {column: value} of one process, with 'file' instead of 'file_id' and None for unset values. """
+        row = {column: getattr(self, column)[index] for column in self.COLUMNS}
+        row['file'] = self.files[row.pop('file_id')]
+        for column in ('start_time', 'end_time', 'response_time', 'turnaround_time', 'absolute_deadline'):
+            if row[column] == UNSET:
+                row[column] = None
+        return row
+
+    def file(self, index):
+        return self.files[self.file_id[index]]
+
+    def lateness(self):
+        """ End time - deadline of every process that had a deadline. """
+        return [end - deadline for end, deadline in zip(self.end_time, self.absolute_deadline) if deadline != UNSET]
+
+    def nbytes(self):
+        """ Memory used by the rows, without the file names. """
+        return sum(getattr(self, column).itemsize * len(self) for column in self.COLUMNS)
@@ -0,0 +1,85 @@
+from constants import PCBState
+
+try:
+    from .PCB import PCB
+except ImportError:
+    from PCB import PCB
+
+
+class PidAllocator:
+    """
+    Recycling PID allocator, a bitmap with one bit per PID (set while the PID
+    is in use) that always hands out the lowest free PID, so PIDs stay as
+    small and dense as the number of live processes. `hint` is the first
+    byte of the bitmap that can have a free bit, allocation scans from there.
+    """
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.bitmap = bytearray(b'\x01')  # PID 0 is never handed out
+        self.hint = 0
+        self.in_use = 0
+
+    def __contains__(self, pid):
+        index = pid >> 3
+        return 0 < pid and index < len(self.bitmap) and bool(self.bitmap[index] & (1 << (pid & 7)))
+
+    def allocate(self):
+        bitmap = self.bitmap
+        index = self.hint
+        while index < len(bitmap) and bitmap[index] == 0xFF:
+            index += 1
+        if index == len(bitmap):
+            bitmap.append(0)
+
+        # Lowest clear bit of the byte
+        byte = bitmap[index]
+        bit = (~byte & (byte + 1)).bit_length() - 1
+        bitmap[index] = byte | (1 << bit)
+        self.hint = index
+        self.in_use += 1
+        return (index << 3) | bit
+
+    def free(self, pid):
+        if pid not in self:
+            return False
+        index = pid >> 3
+        self.bitmap[index] &= ~(1 << (pid & 7))
+        self.hint = min(self.hint, index)
+        self.in_use -= 1
+        return True
+
+
+class PCBPool:
+    """
+    Free list of PCBs of processes that have left the system, reused by
+    System.create_pcb and fork instead of allocating new ones. Only PCBs
+    nothing refers to anymore may be released, System.retire does that when
+    terminated processes aren't retained. Holds at most `max_size` PCBs.
+    """
+    def __init__(self, max_size=1024):
+        self.max_size = max_size
+        self.free = []
+        self.created = 0
+        self.reused = 0
+
+    def __len__(self):
+        return len(self.free)
+
+    def acquire(self, pid, pc, registers=None, state=PCBState.NEW):
+        """ A PCB as fresh as PCB(pid, pc, registers, state), recycled when one is free. """
+        if self.free:
+            pcb = self.free.pop()
+            pcb.reset(pid, pc, registers, state)
+            self.reused += 1
+            return pcb
+        self.created += 1
+        return PCB(pid, pc, registers, state)
+
+    def release(self, pcb):
+        if len(self.free) < self.max_size:
+            self.free.append(pcb)
+
+    def get_metrics(self):
+        return {'pcbs_created': self.created, 'pcbs_reused': self.reused}
@@ -0,0 +1,83 @@
+from constants import PCBState
+
+
+class ProcessTable:
+    """
+    Kernel process table, PID -> PCB, with an index of the processes in
+    every state and of the processes running each program file. PCBs report
+    their own state and file changes (see PCB.state), so every lookup is
+    O(1) however many processes the table holds. The indexes are dicts
+    used as ordered sets: a state's processes are in the order they entered it.
+    """
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.processes = {}
+        self.states = {state: {} for state in PCBState}
+        self.files = {}
+
+    def __len__(self):
+        return len(self.processes)
+
+    def __contains__(self, pid):
+        return pid in self.processes
+
+    def __iter__(self):
+        return iter(self.processes.values())
+
+    def __getitem__(self, pid):
+        return self.processes[pid]
+
+    def get(self, pid, default=None):
+        return self.processes.get(pid, default)
+
+    def items(self):
+        return self.processes.items()
+
+    def values(self):
+        return self.processes.values()
+
+    def add(self, pcb):
+        self.processes[pcb.pid] = pcb
+        self.states[pcb.state][pcb.pid] = pcb
+        self.files.setdefault(pcb.file, {})[pcb.pid] = pcb
+        pcb.process_table = self
+
+    def remove(self, pcb):
+        if self.processes.pop(pcb.pid, None) is None:
+            return
+        self.states[pcb.state].pop(pcb.pid, None)
+        self._unindex_file(pcb, pcb.file)
+        pcb.process_table = None
+
+    def in_state(self, state):
+        """ Processes in `state`, in the order they entered it. """
+        return self.states[state].values()
+
+    def count(self, state):
+        return len(self.states[state])
+
+    def has_state(self, pid, state):
+        return pid in self.states[state]
+
+    def by_file(self, filepath):
+        """ Processes running the program at `filepath`, oldest first. """
+        return self.files.get(filepath, {}).values()
+
+    def state_changed(self, pcb, old, new):
+        """ Called by PCB when its state changes. """
+        self.states[old].pop(pcb.pid, None)
+        self.states[new][pcb.pid] = pcb
+
+    def file_changed(self, pcb, old, new):
+        """ Called by PCB when it starts running another program (exec). """
+        self._unindex_file(pcb, old)
+        self.files.setdefault(new, {})[pcb.pid] = pcb
+
+    def _unindex_file(self, pcb, filepath):
+        pids = self.files.get(filepath)
+        if pids is not None:
+            pids.pop(pcb.pid, None)
+            if not pids:
+                del self.files[filepath]
@@ -0,0 +1,59 @@
+import os
+from struct import unpack_from
+
+
+class ProgramImage:
+    """ One .osx file: its parsed header and a read only view of its bytes. """
+    def __init__(self, filepath, data, stamp):
+        self.filepath = filepath
+        self.stamp = stamp  # (mtime_ns, size) of the file when it was read
+        self.byte_size, self.pc, self.loader = unpack_from('III', data)
+        self.image = memoryview(data)
+        # Slicing the body (and pages of it) shares the bytes instead of copying them
+        self.body = self.image[12:12 + self.byte_size]
+
+
+class ProgramCache:
+    """
+    .osx images keyed by path. A file is read once and reused for every
+    later launch while its mtime and size are unchanged, so only an
+    os.stat() touches the filesystem. Holds at most `max_entries` files,
+    the least recently used one is dropped first.
+    """
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, filepath):
+        """ ProgramImage of filepath, raises FileNotFoundError like open(). """
+        stat = os.stat(filepath)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+
+        entry = self.entries.pop(filepath, None)
+        if entry is not None and entry.stamp == stamp:
+            self.hits += 1
+        else:
+            self.misses += 1
+            # Images are at most the memory size, one read is cheaper than
+            # mapping the file, and views of a replaced image stay valid
+            with open(filepath, 'rb') as f:
+                entry = ProgramImage(filepath, f.read(), stamp)
+
+        # Reinserted last, the dict order is the LRU order
+        self.entries[filepath] = entry
+        if len(self.entries) > self.max_entries:
+            del self.entries[next(iter(self.entries))]
+        return entry
+
+    def invalidate(self, filepath=None):
+        """ Forget one file, or every file. """
+        if filepath is None:
+            self.entries.clear()
+        else:
+            self.entries.pop(filepath, None)
+
+
+# Shared by every MemoryManager, experiments create many Systems that run the same programs
+PROGRAM_CACHE = ProgramCache()
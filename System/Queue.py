@@ -1,6 +1,9 @@
+from collections import deque
+
+
 class Queue:
     def __init__(self, quantum=4):
-        self.processes = []
+        self.processes = deque()
         self.quantum = quantum
 
     def __len__(self):
@@ -10,7 +13,7 @@ class Queue:
         self.processes.append(pcb)
     
     def get_process(self):
-        return self.processes.pop(0)
+        return self.processes.popleft()
     
     def is_empty(self):
         return len(self.processes) == 0
@@ -23,5 +26,5 @@ class Queue:
         self.quantum = quantum
 
     def reset(self):
-        self.processes = []
+        self.processes = deque()
         self.quantum = 1000000
\ No newline at end of file
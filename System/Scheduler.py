@@ -1,35 +1,55 @@
 import os
 import random
 import datetime
-from enum import Enum
 from constants import PCBState
-import matplotlib.pyplot as plt
 
-class SchedulingStrategy(Enum):
-    FCFS = 'FCFS'
-    RR = 'RR'
-    MLFQ = 'MLFQ'
+try:
+    from .strategies import get_strategy
+    from .LatencyHistogram import LatencyStats
+    from .Timeline import IDLE
+    from .MemoryPressure import MemoryPressure
+except ImportError:
+    from strategies import get_strategy
+    from LatencyHistogram import LatencyStats
+    from Timeline import IDLE
+    from MemoryPressure import MemoryPressure
 
 class Scheduler:
     """
     Scheduler class to manage the scheduling of processes in the system.
-    It implements various scheduling strategies such as FCFS, RR, and MLFQ.
+    The policy is delegated to a scheduling strategy (see strategies.py), which
+    owns the run queue. The scheduler moves processes between the job queue,
+    the strategy and the IO queue, and calls the strategy hooks along the way.
     """
     def __init__(self, system):
         self.system = system
-        self.scheduling_strategy = SchedulingStrategy.RR
-        self.mlfq_index = 0  # Add an index to track the current queue in MLfQ
-        self.check_promote_at = 5 # Times to run pcb before promoting/demoting
-        self.gantt_chart = []
+        self.strategy = get_strategy('RR')(system)
         self.real_start_time = None
-
-    def schedule_jobs(self):
-        """ Schedule jobs in the system based on the selected scheduling strategy."""
+        self.real_runtime = None
+        self.rejected_jobs = []
+        self.latency = LatencyStats()  # Updated as each process terminates
+        self.plot = False  # Save a Gantt chart after every run, off for headless batch runs
+        self.metrics = None  # Metrics of the last run, used to plot it later
+        # Long-term scheduling, admissions are held back and processes suspended while memory thrashes
+        self.pressure = MemoryPressure(system)
+        # Open-system runs, jobs are pulled from the source as they arrive (see experiments/arrivals.py)
+        self.source = None
+        # Jobs arriving before this time are left out of the metrics, which start at it
+        self.warmup = 0
+
+    def schedule_jobs(self, plot=None):
+        """
+        Schedule jobs in the system based on the selected scheduling strategy.
+        The Gantt chart is only rendered if `plot` (or `self.plot` when it is
+        None) is set, otherwise call plot_gantt_chart after the run.
+        """
         start_time = self.system.clock.time
         self.real_start_time = datetime.datetime.now()
         self._sort_ready_queue()
 
         while self.jobs_in_any_queue(): # If theres programs one of the queues
+            if self.source is not None and self.source.finished(self.system.clock.time):
+                break
             self.print_time()
             self.check_new_jobs()
             self.check_io_complete()
@@ -37,39 +57,52 @@ class Scheduler:
 
             # Run the next job in the ready queue, FCFS
             if self.jobs_in_ready_queue():
-                pcb, quantum = self.get_next_job()
-                run_start_time = self.system.clock.time
-                self.run_process(pcb, quantum)
-                run_end_time = self.system.clock.time
-                self.add_to_gantt_chart(pcb, run_start_time, run_end_time)                
-                self.handle_process_state(pcb)
+                self.dispatch()
                 if self.system.verbose:
                     self.system.display_state_table()
             else:
-                # If no job is ready increment clock
-                self.gantt_chart.append((self.system.clock.time, 'IDLE', None))
-                self.system.clock += 1
+                # If no job is ready the CPU idles until the next arrival or IO completion
+                idle_until = self.next_event_time()
+                if idle_until is None:
+                    idle_until = self.system.clock.time + 1
+                self.system.timeline.add_idle(self.system.clock.time, idle_until)
+                self.system.clock += idle_until - self.system.clock.time
                 self.system.print("No jobs ready to run")
 
-        metrics = self.get_metrics(start_time)
+        metrics = self.get_metrics(min(max(start_time, self.warmup), self.system.clock.time))
+        self.real_runtime = datetime.datetime.now() - self.real_start_time
         # self.system.print(f"\n{metrics['n_jobs']} jobs completed in {metrics['runtime']} time units (start: {metrics['start_time']}, end: {metrics['end_time']})\nThroughput: {metrics['turnaround']}\nAverage waiting time: {metrics['average_waiting_time']}")
 
-        # self.print_gantt_chart()
-        self.plot_gantt_chart(metrics)
+        self.metrics = metrics
+        if self.plot if plot is None else plot:
+            self.plot_gantt_chart(metrics)
         return metrics
 
     def check_new_jobs(self):
         """ Move jobs from job queue to ready queue, if current time is past programs arrival time."""
+        if self.source is not None:
+            self.source.release(self.system, self.system.clock.time)
+        self.resume_suspended()
         i = 0
         while i < len(self.system.job_queue): # Iterate through job queue
             pcb = self.system.job_queue[i]
             if self.system.clock.time < pcb.arrival_time: # Once we find a job that has not arrived yet, break out of loop
                 break
 
-            # Ensure memory is available without overlapping with other processes
-            if self.system.handle_check_memory_available(pcb):
+            # Hold back new jobs while memory thrashes or suspended processes wait to come back
+            if self.system.suspended_queue or self.pressure.overloaded():
+                break
+
+            # The strategy can refuse a job, e.g. EDF when a deadline can't be met
+            if not self.strategy.admit(pcb):
+                self.rejected_jobs.append(self.system.job_queue.pop(i))
+                continue
+
+            # Admit the job once memory has frames for its minimum resident set
+            if self.system.handle_admit(pcb):
                 if self.system.handle_load_to_memory(pcb):
-                    self.system.Q1.add_process(self.system.job_queue.pop(i))
+                    pcb = self.system.job_queue.pop(i)
+                    self.strategy.on_arrival(pcb)
                     # self.system.ready_queue.append(self.system.job_queue.pop(i)) # move job from job queue to ready queue
                 else:
                     self.system.print(f"Error loading {pcb} to memory")
@@ -77,25 +110,100 @@ class Scheduler:
             else:
                 i += 1
 
-    def get_process(self):
-        if self.scheduling_strategy == SchedulingStrategy.FCFS:
-            return self.system.ready_queue.pop(0)
-        
+    def dispatch(self):
+        """ Run the next process in the run queue for one slice and move it to its next queue. """
+        pcb, quantum = self.strategy.pick_next()
+        faults, executed = self.system.memory_manager.page_faults, pcb.execution_time
+        self.run_process(pcb, quantum)
+        self.pressure.observe(pcb, pcb.execution_time - executed,
+                              self.system.memory_manager.page_faults - faults)
+        if pcb.state == PCBState.READY and self.pressure.should_suspend(pcb):
+            self.suspend(pcb)
+        else:
+            self.handle_process_state(pcb)
+        return pcb
+
+    def suspend(self, pcb):
+        """ Swap `pcb` out of memory until the pressure drops, see MemoryPressure. """
+        self.system.memory_manager.swap_out(pcb)
+        pcb.state = PCBState.SUSPENDED
+        self.system.suspended_queue.append(pcb)
+        self.strategy.on_block(pcb)
+        self.pressure.suspensions += 1
+        self.system.print(f"[SUSPEND] {pcb} swapped out, fault rate {self.pressure.fault_rate:.2f}")
+
+    def resume_suspended(self):
+        """ Bring suspended processes back, oldest first, while they fit. """
+        while self.system.suspended_queue:
+            pcb = self.system.suspended_queue[0]
+            if not self.pressure.can_resume(pcb) or not self.system.memory_manager.admit(pcb):
+                break
+            self.system.suspended_queue.pop(0)
+            pcb.ready(self.system.clock.time)
+            self.strategy.on_wakeup(pcb)
+            self.pressure.resumptions += 1
+            self.system.print(f"[RESUME] {pcb} swapped in")
+
     def run_process(self, pcb, quantum):
+        """
+        Run `pcb` for up to `quantum` ticks. The timer is armed for the end of the
+        quantum, or for the next arrival or IO completion if the strategy is
+        preemptive. On those early interrupts the new jobs are moved to the run
+        queue and the strategy decides whether `pcb` keeps the CPU.
+        """
         pcb.ready(self.system.clock.time)
         pcb.run_count += 1
         self.system.print(f"\nScheduling {pcb}")
-        self.system.run_pcb(pcb, quantum)
+        slice_end = self.system.clock.time + quantum
+
+        while True:
+            self.arm_timer(slice_end)
+            execution_time = pcb.execution_time
+            self.system.run_pcb(pcb, quantum)
+            self.strategy.on_tick(pcb, pcb.execution_time - execution_time)
+
+            # The process exited, blocked or gave up the CPU
+            if pcb.state != PCBState.RUNNING:
+                break
+
+            # Quantum expired, return the process to the ready queue
+            if self.system.clock.time >= slice_end:
+                self.preempt(pcb)
+                break
+
+            # Interrupted by an arrival or IO completion
+            self.check_new_jobs()
+            self.check_io_complete()
+            if self.strategy.should_preempt(pcb):
+                self.system.print(f"Preempting {pcb}")
+                self.preempt(pcb)
+                break
+
+        self.system.timer.disarm()
+
+    def arm_timer(self, slice_end):
+        """ Arm the timer for the end of the slice, or the next event a preemptive strategy reacts to. """
+        deadline = slice_end
+        if self.strategy.preemptive:
+            next_event = self.next_event_time()
+            if next_event is not None:
+                deadline = min(deadline, next_event)
+        self.system.timer.arm(deadline)
+
+    def next_event_time(self):
+        """ Clock time of the next job arrival or IO completion, None if there is none. """
+        now = self.system.clock.time
+        events = [pcb.arrival_time for pcb in self.system.job_queue if pcb.arrival_time > now]
+        events += [pcb.wait_until for pcb in self.system.io_queue if pcb.wait_until > now]
+        if self.source is not None and self.source.next_time() is not None:
+            events.append(self.source.next_time())
+        return min(events) if events else None
+
+    def preempt(self, pcb):
+        """ Take the CPU away from a running process. """
+        pcb.preempt_count += 1
+        pcb.ready(self.system.clock.time)
 
-    def schedule_job(self):
-        """ Schedule the next job in the ready queue."""
-        pcb = self.system.ready_queue.pop(0)
-        pcb.ready(self.system.clock.time) # mark it as ready
-        self.system.print(f"\nScheduling {pcb}")
-        self.system.run_pcb(pcb)
-        return pcb
-        
-        
     def _sort_ready_queue(self):
         """ Sort the ready queue by arrival time."""
         self.system.ready_queue.sort(key=lambda x: x.arrival_time)
@@ -104,23 +212,33 @@ class Scheduler:
         """ Handle the state of the process after running."""
         if pcb:
             if pcb.state == PCBState.TERMINATED:
-                self.system.terminated_queue.append(pcb)
+                self.system.handle_free_memory(pcb)
+                self.pressure.forget(pcb)
+                if pcb.arrival_time >= self.warmup:
+                    self.latency.record(pcb)
+                self.strategy.on_exit(pcb)
+                self.system.archive_process(pcb)
+                self.system.child_exited(pcb)
 
             elif pcb.state == PCBState.WAITING:
-                if pcb.CPU_code == 21:
+                if pcb.pid in self.system.wait_queue:
+                    # Waiting for its children, System.child_exited wakes it
+                    self.strategy.on_block(pcb)
+                elif pcb.CPU_code == 21:
                     pcb.wait_until = self.system.clock.time
                     self.system.io_queue.append(pcb)
                     self.system.io_queue.pop()
                     pcb.ready(self.system.clock.time)
-                    self.put_process_back(pcb)
+                    self.strategy.enqueue(pcb)
                 else:
                     wait_until = self.system.clock.time + random.randint(1, 50)
                     pcb.wait_until = wait_until
                     self.system.print(f"{pcb} waiting until {wait_until}")
                     self.system.io_queue.append(pcb)
+                    self.strategy.on_block(pcb)
 
             elif (pcb.state == PCBState.READY or pcb.state == PCBState.RUNNING):
-                self.put_process_back(pcb)
+                self.strategy.enqueue(pcb)
 
             else:
                 self.system.print(f"Error: Invalid state {pcb.state} for {pcb}")
@@ -131,58 +249,87 @@ class Scheduler:
 
     def jobs_in_ready_queue(self):
         """ Check if there are jobs in the ready queue."""
-        return (len(self.system.Q1) + 
-                len(self.system.Q2) + 
-                len(self.system.Q3)) > 0
+        return len(self.strategy) > 0
     
     def jobs_in_any_queue(self):
-        """ Check if there are jobs in the system."""
+        """ Check if there are jobs in the system, or still to arrive from the source."""
+        if self.source is not None and self.source.next_time() is not None:
+            return True
         return (self.jobs_in_ready_queue() or
                 (len(self.system.job_queue) + 
                 len(self.system.ready_queue) + 
-                len(self.system.io_queue)) > 0)
+                len(self.system.io_queue) +
+                len(self.system.suspended_queue) +
+                len(self.system.wait_queue)) > 0)
 
     def check_io_complete(self):
         for i, pcb in enumerate(self.system.io_queue):
             if self.system.clock.time >= pcb.wait_until:
                 self.system.io_queue.pop(i)
-                self.put_process_back(pcb)
+                self.strategy.on_wakeup(pcb)
                 pcb.ready(self.system.clock.time)
                 self.system.print(f"IO complete for {pcb}")
 
     def get_metrics(self, start_time):
+        """
+        Averages, p50/p90/p99/max of waiting, response and turnaround time,
+        overall and per queue level and program type (see LatencyStats).
+        """
         end_time = self.system.clock.time
-        n_jobs = len(self.system.terminated_queue)
-        total_waiting_time = sum([pcb.waiting_time for pcb in self.system.terminated_queue])
-        total_response_time = sum([pcb.response_time for pcb in self.system.terminated_queue])
-        total_turnaround_time = sum([pcb.turnaround_time for pcb in self.system.terminated_queue])
-        average_waiting_time = round(total_waiting_time / n_jobs, 2)
-        average_response_time = round(total_response_time / n_jobs, 2)
-        average_turnaround_time = round(total_turnaround_time / n_jobs, 2)
-
-        return {'n_jobs': n_jobs, 
-                'runtime': end_time - start_time, 
-                'avg_turnaround': average_turnaround_time,
-                'throughput': n_jobs / (end_time - start_time), 
-                'avg_wait_time': average_waiting_time,
-                'avg_response_time': average_response_time,
+        runtime = end_time - start_time
+
+        metrics = {'runtime': runtime,
+                'throughput': self.latency.n_jobs / runtime if runtime else 0,
+                'cpu_utilization': round(self.latency.busy_time / runtime, 2) if runtime else 0,
                 'start_time': start_time,
                 'end_time': end_time}
-    
+        metrics.update(self.latency.get_metrics())
+        metrics.update(self.get_deadline_metrics())
+        metrics.update(self.strategy.get_metrics())
+        metrics.update(self.pressure.get_metrics())
+        return metrics
 
-    def add_to_gantt_chart(self, pcb, start_time, end_time):
-        self.gantt_chart.append((start_time, end_time, pcb.pid, pcb.queue_level))
+    def get_deadline_metrics(self):
+        """ Deadline misses and lateness (end time - deadline) of real-time jobs. """
+        lateness = sorted(self.system.archive.lateness())
+        if not lateness:
+            return {'rt_jobs': 0, 'deadline_misses': 0, 'rejected_jobs': len(self.rejected_jobs)}
 
-    def print_gantt_chart(self):
-        gantt_string = ''
-        for i, (time, pid, queue) in enumerate(self.gantt_chart):
-            gantt_string += f"{pid}"
-            if i < len(self.gantt_chart) - 1:
-                gantt_string += ', '
-        print(gantt_string)
+        return {'rt_jobs': len(lateness),
+                'deadline_misses': sum([1 for late in lateness if late > 0]),
+                'rejected_jobs': len(self.rejected_jobs),
+                'min_lateness': lateness[0],
+                'avg_lateness': round(sum(lateness) / len(lateness), 2),
+                'median_lateness': lateness[len(lateness) // 2],
+                'max_lateness': lateness[-1]}
 
+    def print_gantt_chart(self):
+        """ Print the order processes ran in, one entry per run. """
+        runs = sorted((start, pid) for pid, intervals in self.system.timeline.runs().items()
+                      for start, _, _ in intervals)
+        print(', '.join(['IDLE' if pid == IDLE else str(pid) for _, pid in runs]))
+
+    def chart_labels(self):
+        """ Program size and type for the chart title, from generated names such as S-CPU-1.osx. """
+        archive = self.system.archive
+        if len(archive) and archive.file(0):
+            name = os.path.splitext(os.path.basename(archive.file(0)))[0]
+            parts = name.split('-')
+            if len(parts) > 1:
+                return parts[0], parts[1]
+        return 'manual', 'CPU'
+
+    def plot_gantt_chart(self, metrics=None, show=False):
+        """ Render the Gantt chart of the last run to charts/, one bar collection per process. """
+        metrics = metrics or self.metrics
+        if not len(self.system.timeline) or metrics is None:
+            print("No Gantt chart data available.")
+            return None
+
+        # Imported here so headless runs never pay for matplotlib
+        import matplotlib.pyplot as plt
+        from matplotlib.patches import Patch
 
-    def plot_gantt_chart(self, metrics, show=False):
         color_map = {
             'IDLE': '#A0A0A0',
             1: '#4682B4',
@@ -191,166 +338,80 @@ class Scheduler:
         }
 
         fig, ax = plt.subplots(figsize=(12, 5))
-        process_intervals = {}
-        process_queues = {}
-
-        for start_time, end_time, pid, queue_level in self.gantt_chart:
-            if pid not in process_intervals:
-                process_intervals[pid] = []
-
-            process_intervals[pid].append((start_time, end_time, queue_level))
-
+        process_intervals = self.system.timeline.runs()
 
-        sorted_processes = ['IDLE'] + sorted([p for p in process_intervals.keys() if p != 'IDLE'])
+        sorted_processes = [IDLE] + self.system.timeline.pids()
         process_positions = {pid: i for i, pid in enumerate(sorted_processes)}
 
-        filepath = self.system.terminated_queue[0].file
-        parts = filepath.split('/')
-        if len(parts) > 1:
-            filename = parts[0]
-            program_size, program_type, *_ = parts[-1].split('-')
-        else:
-            program_size = 'manual'
-            program_type = 'CPU'
-
+        program_size, program_type = self.chart_labels()
 
-        ax.set_title(f'Gantt Chart - {self.scheduling_strategy.value} - {program_size} {program_type} - Q1: {self.system.Q1.quantum}, Q2: {self.system.Q2.quantum}') 
+        quantums = self.strategy.get_quantums()
+        quantum_labels = ', '.join([f'Q{level}: {quantum}' for level, quantum in enumerate(quantums, 1)])
+        ax.set_title(f'Gantt Chart - {self.strategy.name} - {program_size} {program_type} - {quantum_labels}') 
         ax.set_xlabel('Time')
         ax.set_ylabel('Processes')
         ax.set_yticks(range(len(process_positions)))
-        # ax.set_yticklabels(process_positions.keys())
-        ax.set_yticklabels(sorted_processes)
-
-        
+        ax.set_yticklabels(['IDLE' if pid == IDLE else pid for pid in sorted_processes])
 
+        levels = set()
         for pid, intervals in process_intervals.items():
-            for start, end, queue in intervals:
-                color = color_map.get(queue, color_map['IDLE'])
-                ax.barh(process_positions[pid], end - start, left=start, height=0.4, color=color, label=f'Q{queue}')
-
-        # Remove duplicate labels and add grid lines
-        handles, labels = ax.get_legend_handles_labels()
-        by_label = dict(zip(labels, handles))  # Remove duplicates
-        ax.legend(by_label.values(), by_label.keys())
+            ranges = [(start, end - start) for start, end, _ in intervals]
+            colors = [color_map.get(queue, color_map['IDLE']) for _, _, queue in intervals]
+            ax.broken_barh(ranges, (process_positions[pid] - 0.2, 0.4), facecolors=colors)
+            if pid != IDLE:
+                levels.update([queue for _, _, queue in intervals])
+
+        # One legend entry per queue level
+        ax.legend(handles=[Patch(color=color_map['IDLE'], label='IDLE')] +
+                          [Patch(color=color_map.get(queue, color_map['IDLE']), label=f'Q{queue}')
+                           for queue in sorted(levels)])
+        ax.set_ylim(-0.5, len(sorted_processes) - 0.5)
+        ax.autoscale(axis='x')
         plt.grid(axis='x', linestyle='--', alpha=0.6)
 
         # Add metrics to the figure
-        real_end_time = datetime.datetime.now()
-        real_runtime = real_end_time - self.real_start_time
-        if real_runtime.seconds < 1:
+        if self.real_runtime.seconds < 1:
             real_runtime = "< 1s"
         else:
-            real_runtime = f"{real_runtime.seconds}s"
+            real_runtime = f"{self.real_runtime.seconds}s"
         fig_text = f'Avg wait: {round(metrics["avg_wait_time"], 1)}\n' \
+           f'p99 wait: {metrics["p99_wait_time"]}\n' \
            f'Avg resp: {round(metrics["avg_response_time"], 1)}\n' \
            f'Avg turn: {round(metrics["avg_turnaround"], 1)}\n' \
+           f'p99 turn: {metrics["p99_turnaround"]}\n' \
+           f'CPU util: {metrics["cpu_utilization"]}\n' \
            f'Real time: {real_runtime}'
+        if metrics['rt_jobs']:
+            fig_text += f'\nMisses: {metrics["deadline_misses"]}/{metrics["rt_jobs"]}\n' \
+                f'Max late: {metrics["max_lateness"]}'
         fig.text(0.95, 0.8, fig_text, ha='center', va='center')
 
         directory = f'charts/{program_size}/{program_type}'
         os.makedirs(directory, exist_ok=True)
-        plt.savefig(f'{directory}/{self.scheduling_strategy.value}_{program_size}_{program_type}_{self.system.Q1.quantum}_{self.system.Q2.quantum}.png')
-        plt.close('all')
+        quantum_suffix = ''.join([f'_{quantum}' for quantum in quantums])
+        filepath = f'{directory}/{self.strategy.name}_{program_size}_{program_type}{quantum_suffix}.png'
+        plt.savefig(filepath)
         if show:
             plt.show()
-
-
-    def get_next_job(self):
-        """ Get the next job in the ready queue."""
-        if (self.scheduling_strategy == SchedulingStrategy.FCFS or 
-            self.scheduling_strategy == SchedulingStrategy.RR):
-            return self.system.Q1.get_process(), self.system.Q1.get_quantum()
-        
-        elif self.scheduling_strategy == SchedulingStrategy.MLFQ:
-            queues = [self.system.Q1, self.system.Q2, self.system.Q3]
-            for _ in range(len(queues)): # Loop through all queues, getting one process from each
-                queue = queues[self.mlfq_index]
-                self.mlfq_index = (self.mlfq_index + 1) % len(queues)
-                if len(queue) > 0:
-                    return queue.get_process(), queue.get_quantum()
-        else:
-            raise ValueError(f"Invalid scheduling strategy {self.scheduling_strategy}")
+        plt.close('all')
+        return filepath
 
     def set_strategy(self, strategy):
-        if len(self.system.Q1) > 0 or len(self.system.Q2) > 0 or len(self.system.Q3) > 0:
+        """ Switch to a registered scheduling strategy, it starts with an empty run queue. """
+        if self.jobs_in_ready_queue():
             raise ValueError("Cannot change scheduling strategy while jobs are in the system")
-        
-        strategy = strategy.upper()
-        
-        
-        if strategy in SchedulingStrategy._value2member_map_:
-            if strategy == SchedulingStrategy.FCFS.value:
-                self.system.Q1.set_quantum(1000000)
-                self.scheduling_strategy = SchedulingStrategy.FCFS
-            elif strategy == SchedulingStrategy.RR.value:
-                self.system.Q1.set_quantum(10)
-                self.scheduling_strategy = SchedulingStrategy.RR
-            elif strategy == SchedulingStrategy.MLFQ.value:
-                self.system.Q1.set_quantum(8)
-                self.system.Q2.set_quantum(16)
-                self.scheduling_strategy = SchedulingStrategy.MLFQ
-            
-            self.system.print(f"Setting scheduling strategy to {strategy}")
-            return True
-        
-        
-        raise ValueError(f"Invalid scheduling strategy {strategy}")
-    
-    def put_process_back(self, pcb):
-        if self.scheduling_strategy == SchedulingStrategy.MLFQ:
-            self.check_for_promotion(pcb)
-
-        if pcb.queue_level == 1:
-            self.system.Q1.add_process(pcb)
-        elif pcb.queue_level == 2:
-            self.system.Q2.add_process(pcb)
-        elif pcb.queue_level == 3:
-            self.system.Q3.add_process(pcb)
-        else:
-            raise ValueError(f"Invalid queue level {pcb.queue_level}")
-        
-    def check_for_promotion(self, pcb):
-        if pcb.run_count == self.check_promote_at:
-            preemption_ratio = pcb.preempt_count / pcb.run_count
-
-            if preemption_ratio > 0.2: # If preempt more than 80% of the time, promote Q1 -> Q2 -> Q3
-                self.promote(pcb) 
-            elif preemption_ratio < 0.2:
-                self.demote(pcb)
-            # else:
-            #     print("Something went wrong in put_process_back, preemption ratio: ", preemption_ratio)
-
-            pcb.preempt_count = 0
-            pcb.run_count = 0
-        
-    def promote(self, pcb):
-        if pcb.queue_level == 1:
-            pcb.queue_level = 2
-            self.system.print(f"Promoting {pcb} to Q2")
-        elif pcb.queue_level == 2:
-            pcb.queue_level = 3
-            self.system.print(f"Promoting {pcb} to Q3")
-        elif pcb.queue_level == 3:
-            pcb.queue_level = 3
-        else:
-            raise ValueError(f"Invalid queue level {pcb.queue_level}")
-        
-    def demote(self, pcb):
-        if pcb.queue_level == 1:
-            pcb.queue_level = 1
-        elif pcb.queue_level == 2:
-            pcb.queue_level = 1
-            self.system.print(f"Demoting {pcb} to Q1")
-        elif pcb.queue_level == 3:
-            pcb.queue_level = 3
-        else:
-            raise ValueError(f"Invalid queue level {pcb.queue_level}")
-        
+
+        self.strategy = get_strategy(strategy)(self.system)
+        self.system.print(f"Setting scheduling strategy to {self.strategy.name}")
+        return True
+
     def reset(self):
-        self.scheduling_strategy = SchedulingStrategy.FCFS
-        self.mlfq_index = 0  # Add an index to track the current queue in MLfQ
-        self.check_promote_at = 5 # Times to run pcb before promoting/demoting
-        self.gantt_chart = []
+        self.strategy = get_strategy('FCFS')(self.system)
         self.real_start_time = None
-    
-
+        self.real_runtime = None
+        self.rejected_jobs = []
+        self.latency.reset()
+        self.metrics = None
+        self.pressure.reset()
+        self.source = None
+        self.warmup = 0
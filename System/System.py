@@ -6,20 +6,30 @@ import random
 try:
     from hardware.CPU import CPU
     from hardware.Clock import Clock
+    from hardware.Timer import Timer
     from .PCB import PCB
     from .Scheduler import Scheduler
     from .MemoryManager import MemoryManager
-    from .Queue import Queue
+    from .strategies import EarliestDeadlineFirst
+    from .Timeline import Timeline
+    from .ProcessTable import ProcessTable
+    from .ProcessArchive import ProcessArchive
+    from .ProcessPool import PCBPool, PidAllocator
 except ImportError:
     sys.path.append(
         os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
     )
     from hardware.CPU import CPU
     from hardware.Clock import Clock
+    from hardware.Timer import Timer
     from PCB import PCB
     from Scheduler import Scheduler
     from MemoryManager import MemoryManager
-    from Queue import Queue
+    from strategies import EarliestDeadlineFirst
+    from Timeline import Timeline
+    from ProcessTable import ProcessTable
+    from ProcessArchive import ProcessArchive
+    from ProcessPool import PCBPool, PidAllocator
 
 from constants import USER_MODE, KERNEL_MODE, SYSTEM_CODES, PCBState, CHILD_EXEC_PROGRAM
 
@@ -27,6 +37,7 @@ from constants import USER_MODE, KERNEL_MODE, SYSTEM_CODES, PCBState, CHILD_EXEC
 class System:
     def __init__(self):
         self.clock = Clock()
+        self.timer = Timer(self.clock)
         self.scheduler = Scheduler(self)
         self.memory_manager = MemoryManager(self, '1K')
         self.memory = self.memory_manager.memory
@@ -36,18 +47,25 @@ class System:
         self.errors = []
         self.system_codes = SYSTEM_CODES
         self.pid = 0
-        self.execution_history = []  # List to store process execution history
+        self.timeline = Timeline()  # CPU slices of every process, see Timeline
+        self.processes = ProcessTable()  # Every process by PID, state and program file
+        self.archive = ProcessArchive()  # Metrics of every terminated process, see ProcessArchive
+        # Keep terminated PCBs in terminated_queue and the process table, off for long runs
+        self.retain_terminated = True
+        # PCBs of retired processes, reused for new ones when terminated PCBs aren't retained
+        self.pcb_pool = PCBPool()
+        # Reuse the PIDs of retired processes, lowest first, instead of counting up forever
+        self.recycle_pids = False
+        self.pids = PidAllocator()
 
         # Process management queues
         self.ready_queue = []
         self.job_queue = []
         self.io_queue = []
+        self.suspended_queue = []
+        self.wait_queue = {}  # Parent PID -> parent blocked in wait() until its children exit
         self.terminated_queue = []
 
-        self.Q1 = Queue()
-        self.Q2 = Queue()
-        self.Q3 = Queue()
-
         self.shared_memory = {}
         self.mutex = 0
 
@@ -58,6 +76,7 @@ class System:
             "run": self.run_program,
             "registers": lambda: print(self.CPU),
             "execute": self.execute,
+            "schedulable": self.check_schedulable,
             "clock": lambda: print(self.clock),
             "job_queue": lambda: print(self.job_queue),
             "ready_queue": lambda: print(self.ready_queue),
@@ -65,10 +84,15 @@ class System:
             "terminated_queue": lambda: print(self.terminated_queue),
             'setSched': self.scheduler.set_strategy,
             'setRR': self.setRR,
-            'quantums': lambda: print(f"Q1: {self.Q1.get_quantum()}, Q2: {self.Q2.get_quantum()}"),
-            'gantt_graph': lambda: self.scheduler.plot_gantt_chart(True),
+            'setCFS': self.setCFS,
+            'setAging': self.setAging,
+            'quantums': self.print_quantums,
+            'latency': self.print_latency,
+            'gantt_graph': lambda: self.scheduler.plot_gantt_chart(show=True),
+            'setPlot': self.setPlot,
             'reset': self.reset,
             'gantt': self.display_gantt_chart,
+            'timeline': self.export_timeline,
             'shm_open': self.smh_open,
             'shared_memory': self.print_shared_memory,
             'shm_unlink': self.shm_unlink,
@@ -77,6 +101,7 @@ class System:
             'setpagenumber': self.set_page_number,
             'getpagesize': lambda: print(self.memory_manager.get_page_size()),
             'setpagesize': self.set_page_size,
+            'setminresident': self.set_min_resident,
         }
 
     def switch_mode(self):
@@ -114,18 +139,12 @@ class System:
             self.system_code(103)
 
     def execute(self, *args):
-        if len(args) < 2 or len(args) % 2 != 0:
-            self.system_code(103)
-            print(
-                "Please specify the programs to execute and their arrival times in pairs.")
+        programs = self.parse_program_args(args)
+        if programs is None:
             return None
 
-        for i in range(0, len(args), 2):
-            filepath = args[i]
-            arrival_time = int(args[i+1])
-            filepath = os.path.join('programs', filepath)
-
-            self.prepare_program(filepath, arrival_time)
+        for filepath, arrival_time, options in programs:
+            self.prepare_program(filepath, arrival_time, **options)
 
         self.print("Programs added to job queue.")
         if self.verbose:
@@ -134,20 +153,95 @@ class System:
         self.scheduler.schedule_jobs()
             
 
-    def prepare_program(self, filepath, arrival_time):
-        program_info = self.memory_manager.prepare_program(filepath)
+    def parse_program_args(self, args):
+        """
+        Parse program / arrival time pairs, each pair can be followed by
+        optional settings: nice=<int> and the real-time settings
+        deadline=<int> period=<int> wcet=<int>
+
+        Example:
+            p1.osx 0 deadline=40 p2.osx 5 nice=-5
+        """
+        programs = []
+        i = 0
+        while i < len(args):
+            if i + 1 >= len(args) or '=' in str(args[i + 1]):
+                self.system_code(103)
+                print(
+                    "Please specify the programs to execute and their arrival times in pairs.")
+                return None
+
+            filepath = os.path.join('programs', args[i])
+            arrival_time = int(args[i + 1])
+            options = {}
+            i += 2
+
+            while i < len(args) and '=' in str(args[i]):
+                key, value = str(args[i]).split('=', 1)
+                if key not in ('nice', 'deadline', 'period', 'wcet'):
+                    self.system_code(103)
+                    print(f"Unknown option {key}, expected nice, deadline, period or wcet.")
+                    return None
+                options[key] = int(value)
+                i += 1
+
+            programs.append((filepath, arrival_time, options))
+
+        if not programs:
+            self.system_code(103)
+            print(
+                "Please specify the programs to execute and their arrival times in pairs.")
+            return None
+
+        return programs
+
+    def prepare_program(self, filepath, arrival_time, nice=0, deadline=None, period=None, wcet=None, image=None):
+        """ Queue a program, from disk or from the .osx bytes in `image`. Returns its PCB. """
+        program_info = self.memory_manager.prepare_program(filepath, image)
 
         if program_info:
             pcb = self.create_pcb(program_info, arrival_time)
+            pcb.set_nice(nice)
+            pcb.set_deadline(deadline, period, wcet)
             self.job_queue.append(pcb)
+            return pcb
         else:
             return None
 
-    def create_pcb(self, program_info, arrival_time):
-        pid = self.pid + 1
+    def check_schedulable(self, *args):
+        """
+        Run the EDF admission test on a job mix without executing it.
+        Takes the same arguments as execute.
+        """
+        programs = self.parse_program_args(args)
+        if programs is None:
+            return None
+
+        pcbs = []
+        for filepath, arrival_time, options in programs:
+            program_info = self.memory_manager.prepare_program(filepath)
+            if program_info:
+                pcb = PCB(0, program_info['pc'])
+                pcb.update(program_info)
+                pcb.arrival_time = arrival_time
+                pcb.set_deadline(options.get('deadline'), options.get('period'), options.get('wcet'))
+                pcbs.append(pcb)
+
+        utilization, schedulable = EarliestDeadlineFirst.admission_test(pcbs)
+        verdict = "schedulable" if schedulable else "NOT schedulable"
+        print(f"Real-time utilization: {utilization:.2f} - {verdict} under EDF")
+        return schedulable
+
+    def new_pid(self):
+        if self.recycle_pids:
+            return self.pids.allocate()
         self.pid += 1
+        return self.pid
+
+    def create_pcb(self, program_info, arrival_time):
+        pid = self.new_pid()
 
-        pcb = PCB(pid, program_info['pc'])
+        pcb = self.pcb_pool.acquire(pid, program_info['pc'])
         pcb.file = program_info['filepath']
         pcb.loader = program_info['loader']
         pcb.byte_size = program_info['byte_size']
@@ -155,7 +249,9 @@ class System:
         pcb.data_end = program_info['data_end']
         pcb.code_start = program_info['code_start']
         pcb.code_end = program_info['code_end']
+        pcb.image = program_info.get('image')
         pcb.arrival_time = arrival_time
+        self.processes.add(pcb)
 
         return pcb
 
@@ -166,15 +262,9 @@ class System:
         # Record execution start
         start_time = self.clock.time
 
-        self.CPU.run_program(pcb, quantum, self.verbose)
+        self.CPU.run_program(pcb, self.memory_manager, self.verbose)
 
-        # Record execution history
-        self.execution_history.append({
-            'pid': pcb.pid,
-            'start_time': start_time,
-            'end_time': self.clock.time,
-            'quantum': quantum
-        })
+        self.timeline.append(start_time, self.clock.time, pcb.pid, pcb.queue_level, quantum)
 
     def handle_load(self, *args):
         for filepath in args:
@@ -189,9 +279,10 @@ class System:
             if self.verbose:
                 self.display_state_table()
 
-    def handle_check_memory_available(self, pcb):
+    def handle_admit(self, pcb):
+        """ Admit a job if the free frames hold its minimum resident set. """
         try:
-            if self.memory_manager.check_memory_available(pcb):
+            if self.memory_manager.admit(pcb):
                 return True
         except Exception as e:
             print(e)
@@ -228,23 +319,25 @@ class System:
 
         for arg in args:
 
-            program = 'programs\\' + arg
+            # Same path handle_load gave the program
+            program = os.path.join('programs', arg)
 
-            pcb = None
-            for job in self.job_queue + self.ready_queue:
-                if job.file == program:
-                    pcb = job
-                    break
-            self.job_queue.remove(pcb)
+            pcb = next((job for job in self.processes.by_file(program)
+                        if job.state in (PCBState.NEW, PCBState.READY)), None)
+            if pcb is None:
+                self.system_code(109, f"Program not loaded: {arg}")
+                continue
+            if pcb in self.job_queue:
+                self.job_queue.remove(pcb)
             self.print(f"Running program: {pcb}")
 
             pcb.start_time = self.clock.time
-            self.CPU.run_program(pcb, 1_000_000, self.memory_manager, self.verbose)
+            self.timer.disarm()
+            self.CPU.run_program(pcb, self.memory_manager, self.verbose)
 
             if pcb.state == PCBState.TERMINATED:
-                # self.memory_manager.free_memory(pcb)
-                self.terminated_queue.append(pcb)
                 pcb.end_time = self.clock.time
+                self.archive_process(pcb)
 
             if self.verbose:
                 self.display_state_table()
@@ -301,13 +394,13 @@ class System:
         self.log_error(code, message, program)
 
     def fork(self, parent_pcb):
-        new_pid = self.pid + 1
-        self.pid += 1
+        new_pid = self.new_pid()
 
         # Copy parent PCB
-        child_pcb = parent_pcb.make_child(new_pid, parent_pcb.pc)
+        child_pcb = parent_pcb.make_child(new_pid, parent_pcb.pc, self.pcb_pool)
 
         child_pcb.arrival_time = self.clock.time
+        self.processes.add(child_pcb)
         # child_pcb.ready(self.clock.time)
 
         parent_pcb.registers[0] = new_pid
@@ -315,17 +408,22 @@ class System:
 
         parent_pcb.state = PCBState.READY
         child_pcb.state = PCBState.READY
+        self.memory_manager.fork(parent_pcb, child_pcb)
 
         self.print(f"Forked child process: {child_pcb}")
 
-        self.ready_queue.append(child_pcb)
+        self.scheduler.strategy.on_arrival(child_pcb)
         # self.ready_queue.append(parent_pcb) This will be done by the scheduler
 
         # self.run_pcb(child_pcb)
 
     def exec(self, pcb):
+        """
+        SWI 11, replace the program of `pcb` with CHILD_EXEC_PROGRAM. The
+        process keeps its PID and the CPU, and starts the new program with
+        cleared registers when the CPU resumes it.
+        """
         filepath = CHILD_EXEC_PROGRAM
-        # arrival_time = self.clock.time
 
         program_info = self.memory_manager.prepare_program(filepath)
 
@@ -337,22 +435,90 @@ class System:
             pcb.data_end = program_info['data_end']
             pcb.code_start = program_info['code_start']
             pcb.code_end = program_info['code_end']
+            pcb.image = program_info['image']
             pcb.pc = program_info['pc']
-            # pcb.arrival_time = arrival_time
+            pcb.registers = [0] * len(pcb.registers)
 
             self.memory_manager.load_to_memory(pcb)
-            self.run_pcb(pcb)
+            return True
         else:
             return None
 
     def wait(self, pcb):
-        if any([child_pcb.state != PCBState.TERMINATED for child_pcb in pcb.get_children()]):
+        """
+        SWI 12, wait for the children of `pcb` to exit. While any is still
+        alive the parent blocks in the wait queue and is woken once, by the
+        exit of its last child. Returns True if the parent blocked.
+        """
+        if any(child.state != PCBState.TERMINATED for child in pcb.get_children()):
             self.print(
                 f"Parent process {pcb} is waiting for children to terminate")
-            pcb.ready(self.clock.time)
-            return
+            pcb.waiting()
+            self.wait_queue[pcb.pid] = pcb
+            return True
+        self.reap(pcb)
         msg = f"Parent process {pcb} has waited for all children to terminate"
         self.print(msg)
+        return False
+
+    def reap(self, pcb):
+        """ Collect the exit status (R0) of the exited children of `pcb` and remove them from the process table. """
+        for child in pcb.get_children():
+            pcb.exit_statuses[child.pid] = child.registers[0]
+            if self.retain_terminated:
+                self.processes.remove(child)
+            else:
+                self.retire(child)
+        pcb.children = []
+
+    def child_exited(self, child):
+        """ Wake the parent of `child` if it is waiting and `child` was its last running child. """
+        parent = self.wait_queue.get(child.parent_pid)
+        if parent is None or any(sibling.state != PCBState.TERMINATED for sibling in parent.get_children()):
+            return
+        del self.wait_queue[parent.pid]
+        self.reap(parent)
+        parent.ready(self.clock.time)
+        self.scheduler.strategy.on_wakeup(parent)
+        self.print(f"Parent process {parent} has waited for all children to terminate")
+
+    def archive_process(self, pcb):
+        """
+        Record a terminated process in the archive and release its memory. The
+        PCB stays in terminated_queue and the process table while
+        retain_terminated is set. Otherwise it leaves the process table at
+        once, unless its parent is alive and can still wait() for it; exited
+        children nobody waited for leave with their parent, children still
+        running are orphaned.
+        """
+        self.archive.append(pcb)
+        self.memory_manager.release(pcb)
+
+        # An orphan's parent PID could be handed to an unrelated process
+        for child in pcb.get_children():
+            if child.state != PCBState.TERMINATED:
+                child.parent_pid = None
+
+        if self.retain_terminated:
+            self.terminated_queue.append(pcb)
+            return
+        for child in pcb.get_children():
+            if child.state == PCBState.TERMINATED:
+                self.retire(child)
+        if pcb.parent_pid not in self.processes:
+            self.retire(pcb)
+
+    def retire(self, pcb):
+        """
+        Remove a terminated, archived process nobody can wait for anymore from
+        the process table, and give its PCB (and PID with recycle_pids) back
+        for new processes.
+        """
+        if self.processes.get(pcb.pid) is not pcb:
+            return
+        self.processes.remove(pcb)
+        self.pids.free(pcb.pid)
+        self.pcb_pool.release(pcb)
 
     def display_state_table(self):
         """
@@ -383,10 +549,10 @@ class System:
         add_queue_entries("Job Queue", self.job_queue)
         add_queue_entries("Ready Queue", self.ready_queue)
         add_queue_entries("I/O Queue", self.io_queue)
+        add_queue_entries("Suspended", self.suspended_queue)
         add_queue_entries("Terminated", self.terminated_queue)
-        add_queue_entries("Q1", self.Q1.processes)
-        add_queue_entries("Q2", self.Q2.processes)
-        add_queue_entries("Q3", self.Q3.processes)
+        for queue_name, queue in self.scheduler.strategy.ready_queues():
+            add_queue_entries(queue_name, queue)
 
         # Sort by PID for consistent display
         table_data.sort(key=lambda x: x[0])
@@ -396,10 +562,52 @@ class System:
         print()
 
     def setRR(self, *args):
-        quantum1 = int(args[0])
-        quantum2 = int(args[1])
-        self.Q1.set_quantum(quantum1)
-        self.Q2.set_quantum(quantum2)
+        quantums = [int(arg) for arg in args]
+        self.scheduler.strategy.set_quantums(*quantums)
+
+    def print_quantums(self):
+        quantums = self.scheduler.strategy.get_quantums()
+        print(', '.join([f"Q{level}: {quantum}" for level, quantum in enumerate(quantums, 1)]))
+
+    def print_latency(self):
+        """ Latency percentiles of the terminated processes, overall and per queue level and program type. """
+        metrics = self.scheduler.latency.get_metrics()
+        rows = [('all', metrics)]
+        rows += [(f"Q{level}", group) for level, group in metrics['by_queue_level'].items()]
+        rows += [(program_type, group) for program_type, group in metrics['by_program_type'].items()]
+
+        headers = ["Group", "Jobs"]
+        columns = []
+        for metric in ('wait_time', 'response_time', 'turnaround'):
+            for stat in ('avg', 'p50', 'p90', 'p99', 'max'):
+                headers.append(f"{stat} {metric.replace('_time', '')}")
+                columns.append(f"{stat}_{metric}")
+
+        table_data = [[name, group['n_jobs']] + [group[column] for column in columns] for name, group in rows]
+        print(tabulate(table_data, headers=headers, tablefmt="grid"))
+
+    def setPlot(self, *args):
+        """ Turn saving a Gantt chart after every execute on or off. """
+        if not args or args[0] not in ('on', 'off'):
+            self.system_code(103)
+            print("Usage: setPlot on|off")
+            return None
+        self.scheduler.plot = args[0] == 'on'
+
+    def setCFS(self, *args):
+        if self.scheduler.strategy.name != 'CFS':
+            print("setCFS only applies to CFS scheduling, run 'setSched CFS' first.")
+            return None
+        target_latency = int(args[0])
+        min_granularity = int(args[1])
+        self.scheduler.strategy.set_latency(target_latency, min_granularity)
+
+    def setAging(self, *args):
+        if self.scheduler.strategy.name != 'PRIORITY':
+            print("setAging only applies to PRIORITY scheduling, run 'setSched PRIORITY' first.")
+            return None
+        aging_interval = int(args[0])
+        self.scheduler.strategy.set_aging_interval(aging_interval)
 
     def smh_open(self, *args):
         if len(args) != 1:
@@ -430,30 +638,29 @@ class System:
 
     def reset(self):
         self.clock.reset()
+        self.timer.reset()
         self.scheduler.reset()
         self.memory_manager.reset()
         self.CPU.reset()
-        self.Q1.reset()
-        self.Q2.reset()
-        self.Q3.reset()
         self.job_queue = []
         self.ready_queue = []
         self.io_queue = []
+        self.suspended_queue = []
+        self.wait_queue = {}  # Parent PID -> parent blocked in wait() until its children exit
         self.terminated_queue = []
         self.pid = 0
+        self.pids.reset()
         self.errors = []
-        self.execution_history = []  # List to store process execution history
+        self.timeline.reset()
+        self.processes.reset()
+        self.archive.reset()
         self.verbose = False
         self.print("System reset.")
 
     def process_table(self):
-        all_pcb_lists = [self.job_queue, self.ready_queue, self.io_queue, self.terminated_queue]
-        table = {}
-        for queue in all_pcb_lists:
-            for pcb in queue:
-                table[pcb.pid] = pcb
-        return table
-    
+        """ The kernel process table, see ProcessTable. """
+        return self.processes
+
     def set_page_number(self, *args):
         """
         Sets the page number limit for the memory manager.
@@ -515,6 +722,23 @@ class System:
             print("Invalid page size. Please enter a valid integer.")
             return None
     
+    def set_min_resident(self, *args):
+        """
+        Sets the minimum resident set, the frames reserved for each process
+        when it is admitted. Jobs wait in the job queue while the reserved
+        frames of the live processes leave no room for theirs.
+        Example:
+            set_min_resident(2)
+        """
+        if len(args) != 1:
+            print("Please specify the number of pages. 'setminresident <number>'")
+            return None
+        try:
+            self.memory_manager.set_min_resident_pages(int(args[0]))
+        except ValueError:
+            print("Invalid page number. Please enter a valid integer.")
+            return None
+
     def display_memory_frames(self):
         print("\n=== Physical Memory Map ===")
         print("Frame | PID | Page # | Dirty | Ref")
@@ -569,19 +793,12 @@ class System:
         """
         Display a horizontal Gantt chart showing process execution over time
         """
-        if not self.execution_history:
+        if not len(self.timeline):
             print("No execution history available.")
             return
 
         # Find the maximum time to determine chart width
-        max_time = max(entry['end_time'] for entry in self.execution_history)
-
-        # Sort processes by start time
-        sorted_history = sorted(self.execution_history,
-                                key=lambda x: x['start_time'])
-
-        # Get unique PIDs to determine chart height
-        pids = sorted(set(entry['pid'] for entry in self.execution_history))
+        max_time = self.timeline.end_time
 
         # Create the header with time markers
         print("\nGantt Chart:")
@@ -590,36 +807,24 @@ class System:
             print(f"{t:2}", end="")
         print("\n----|" + "-" * (2 * (max_time + 1)))
 
-        # Create timeline for each process
-        for pid in pids:
-            print(f"P{pid:2} |", end="")
-
-            # Fill the timeline
-            current_time = 0
-            while current_time <= max_time:
-                # Find if process was running at this time
-                running = False
-                quantum = None
-
-                for entry in sorted_history:
-                    if (entry['pid'] == pid and
-                            entry['start_time'] <= current_time < entry['end_time']):
-                        running = True
-                        quantum = entry['quantum']
-                        break
-
-                if running:
-                    print(f"{quantum}", end="")
-                else:
-                    print(" .", end="")
-                current_time += 1
-            print()  # New line after each process
+        # Create timeline for each process, filled from its own slices
+        for pid in self.timeline.pids():
+            row = [" ."] * (max_time + 1)
+            for start, end, _, _, quantum, _ in self.timeline.slices_for(pid):
+                row[start:end] = [f"{quantum:2}"] * (end - start)
+            print(f"P{pid:2} |" + "".join(row))
 
         # Print legend
         print("\nLegend:")
         print("  . = Idle")
         print("  # = Number shown is quantum value used")
 
+    def export_timeline(self, *args):
+        """ Write the CPU timeline to a CSV file, timeline.csv by default. """
+        filepath = args[0] if args else 'timeline.csv'
+        self.timeline.to_csv(filepath)
+        print(f"Timeline written to {filepath}")
+
 
 if __name__ == '__main__':
     system = System()
@@ -0,0 +1,128 @@
+from array import array
+from bisect import bisect_right
+import csv
+
+# pid stored for intervals where the CPU had nothing to run
+IDLE = -1
+
+
+class Timeline:
+    """
+    Column store of CPU slices, one row per interval [start, end) a process
+    (or IDLE) held a core. Rows are appended in start time order, so "what ran
+    at time t" is a binary search on the start column, and a per-pid index of
+    row numbers answers "all slices for pid p" without a scan.
+    Queue level and quantum are 0 when they don't apply.
+    """
+    COLUMNS = ('start', 'end', 'pid', 'queue_level', 'quantum', 'core')
+
+    def __init__(self):
+        self.reset()
+
+    def __len__(self):
+        return len(self.start)
+
+    def __iter__(self):
+        return zip(self.start, self.end, self.pid, self.queue_level, self.quantum, self.core)
+
+    def row(self, index):
+        return (self.start[index], self.end[index], self.pid[index],
+                self.queue_level[index], self.quantum[index], self.core[index])
+
+    def append(self, start, end, pid, queue_level=0, quantum=0, core=0):
+        if end <= start:
+            return
+        if self.start and start < self.start[-1]:
+            raise ValueError(f"Timeline slices must be appended in time order, got {start} after {self.start[-1]}")
+
+        self.pid_index.setdefault(pid, array('q')).append(len(self.start))
+        self.start.append(start)
+        self.end.append(end)
+        self.pid.append(pid)
+        self.queue_level.append(queue_level or 0)
+        self.quantum.append(quantum or 0)
+        self.core.append(core)
+        self.longest = max(self.longest, end - start)
+
+    def add_idle(self, start, end, core=0):
+        self.append(start, end, IDLE, core=core)
+
+    @property
+    def end_time(self):
+        return max(self.end) if self.end else 0
+
+    def pids(self):
+        """ Processes that ran, without IDLE. """
+        return sorted(pid for pid in self.pid_index if pid != IDLE)
+
+    def at(self, time):
+        """ Rows of the slices running at `time`, one per busy core. """
+        # Only slices starting in (time - longest, time] can cover `time`
+        last = bisect_right(self.start, time)
+        first = bisect_right(self.start, time - self.longest)
+        return [self.row(i) for i in range(first, last) if self.end[i] > time]
+
+    def slices_for(self, pid):
+        return [self.row(i) for i in self.pid_index.get(pid, [])]
+
+    def between(self, start, end):
+        """ Rows of the slices overlapping [start, end). """
+        last = bisect_right(self.start, end - 1)
+        first = bisect_right(self.start, start - self.longest)
+        return [self.row(i) for i in range(first, last) if self.end[i] > start]
+
+    def runs(self):
+        """
+        {pid: [(start, end, queue_level), ...]} with adjacent slices of the same
+        process and queue level merged into one run.
+        """
+        runs = {}
+        for pid, rows in self.pid_index.items():
+            merged = runs[pid] = []
+            for i in rows:
+                start, end, queue_level = self.start[i], self.end[i], self.queue_level[i]
+                if merged and merged[-1][1] == start and merged[-1][2] == queue_level:
+                    merged[-1] = (merged[-1][0], end, queue_level)
+                else:
+                    merged.append((start, end, queue_level))
+        return runs
+
+    def summary(self):
+        """ Totals of the timeline, small enough to store with a run's results. """
+        busy_time = idle_time = 0
+        for start, end, pid in zip(self.start, self.end, self.pid):
+            if pid == IDLE:
+                idle_time += end - start
+            else:
+                busy_time += end - start
+        return {'slices': len(self),
+                'runs': sum(len(runs) for pid, runs in self.runs().items() if pid != IDLE),
+                'busy_time': busy_time,
+                'idle_time': idle_time,
+                'end_time': self.end_time}
+
+    def to_csv(self, filepath):
+        with open(filepath, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(self.COLUMNS)
+            writer.writerows(self)
+
+    def to_numpy(self):
+        """ Structured array with one field per column, numpy is only needed here. """
+        import numpy as np
+
+        dtype = [(column, np.int64) for column in self.COLUMNS]
+        table = np.empty(len(self), dtype=dtype)
+        for column in self.COLUMNS:
+            table[column] = getattr(self, column)
+        return table
+
+    def reset(self):
+        self.start = array('q')
+        self.end = array('q')
+        self.pid = array('q')
+        self.queue_level = array('b')
+        self.quantum = array('q')
+        self.core = array('b')
+        self.pid_index = {}  # pid -> row numbers
+        self.longest = 0  # Longest slice, bounds the search window of interval queries
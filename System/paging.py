@@ -1,12 +1,94 @@
+from array import array
+
+# Bits of PageTable.flags
+VALID = 1
+REFERENCE = 2
+DIRTY = 4
+LOADED = 8  # The page has been loaded at least once, it has an entry
+
+# PageTable.frames of a page without a frame
+NO_FRAME = -1
+
+
 class PageTableEntry:
     """
     A class representing a page table entry in a virtual memory system.
     Each entry contains information about a page, including its frame number,
     validity, reference bit, dirty bit, and last access time.
+    PageTable.items() returns them as copies of its rows.
     """
+    __slots__ = ('frame', 'valid', 'reference', 'dirty', 'last_access_time')
+
     def __init__(self, frame=None, valid=False, reference=False, dirty=False):
         self.frame = frame
         self.valid = valid
         self.reference = reference
         self.dirty = dirty
-        self.last_access_time = None
\ No newline at end of file
+        self.last_access_time = None
+
+
+class PageTable:
+    """
+    Page table of one process, indexed by virtual page number: a 4 byte frame
+    number array and a byte of flags (VALID, REFERENCE, DIRTY, LOADED) per
+    page, sized from the page count at load time. Translating reads two array
+    items instead of a dict entry and its attributes, and a page costs 5
+    bytes instead of a PageTableEntry.
+
+    The dict-like methods (items, values, len, in) see the pages that have
+    been loaded, as PageTableEntry copies, for ps and the memory displays.
+    """
+    __slots__ = ('frames', 'flags')
+
+    def __init__(self, num_pages=0):
+        self.frames = array('i', [NO_FRAME]) * num_pages
+        self.flags = bytearray(num_pages)
+
+    @property
+    def num_pages(self):
+        return len(self.flags)
+
+    def map(self, page_number, frame):
+        """ Page `page_number` is now in `frame`, valid, referenced and clean. """
+        self.frames[page_number] = frame
+        self.flags[page_number] = VALID | REFERENCE | LOADED
+
+    def unmap(self, page_number):
+        """ Invalidate a page, returns the frame it was in. """
+        frame = self.frames[page_number]
+        self.frames[page_number] = NO_FRAME
+        self.flags[page_number] &= ~VALID
+        return frame
+
+    def is_valid(self, page_number):
+        return 0 <= page_number < len(self.flags) and self.flags[page_number] & VALID
+
+    def entry(self, page_number):
+        """ PageTableEntry copy of a page's row, changing it doesn't change the table. """
+        flags = self.flags[page_number]
+        frame = self.frames[page_number]
+        return PageTableEntry(frame=None if frame == NO_FRAME else frame, valid=bool(flags & VALID),
+                              reference=bool(flags & REFERENCE), dirty=bool(flags & DIRTY))
+
+    def __len__(self):
+        return sum(1 for flags in self.flags if flags & LOADED)
+
+    def __contains__(self, page_number):
+        return 0 <= page_number < len(self.flags) and bool(self.flags[page_number] & LOADED)
+
+    def __getitem__(self, page_number):
+        if page_number not in self:
+            raise KeyError(page_number)
+        return self.entry(page_number)
+
+    def keys(self):
+        return [page for page in range(len(self.flags)) if self.flags[page] & LOADED]
+
+    def items(self):
+        return [(page, self.entry(page)) for page in self.keys()]
+
+    def values(self):
+        return [self.entry(page) for page in self.keys()]
+
+    def nbytes(self):
+        return self.frames.itemsize * len(self.frames) + len(self.flags)
@@ -0,0 +1,425 @@
+import heapq
+from itertools import count
+
+try:
+    from .Queue import Queue
+    from .CFSQueue import CFSQueue
+    from .DeadlineQueue import DeadlineQueue
+    from .PriorityArray import PriorityArray
+except ImportError:
+    from Queue import Queue
+    from CFSQueue import CFSQueue
+    from DeadlineQueue import DeadlineQueue
+    from PriorityArray import PriorityArray
+
+
+# Registry of scheduling strategies by name, setSched takes any name in here
+STRATEGIES = {}
+
+
+def register_strategy(cls):
+    """ Class decorator that makes a strategy available under its name. """
+    STRATEGIES[cls.name] = cls
+    return cls
+
+
+def get_strategy(name):
+    """ Look up a registered strategy class by name (case insensitive). """
+    try:
+        return STRATEGIES[name.upper()]
+    except KeyError:
+        raise ValueError(f"Invalid scheduling strategy {name}, expected one of {', '.join(STRATEGIES)}")
+
+
+class Strategy:
+    """
+    Interface for scheduling strategies.
+    A strategy owns the run queue of ready processes and decides which process
+    runs next and for how long. The scheduler calls the hooks below as
+    processes arrive, run, block on IO, wake up and exit.
+    """
+    name = None
+    # Preemptive strategies get a timer interrupt on every arrival and IO completion
+    preemptive = False
+
+    def __init__(self, system):
+        self.system = system
+
+    def __len__(self):
+        """ Number of processes in the run queue. """
+        raise NotImplementedError("Each strategy must implement __len__")
+
+    @property
+    def processes(self):
+        """ Processes in the run queue, in the order they will be picked. """
+        raise NotImplementedError("Each strategy must implement processes")
+
+    def enqueue(self, pcb):
+        """ Put a ready process in the run queue. """
+        raise NotImplementedError("Each strategy must implement enqueue")
+
+    def pick_next(self):
+        """ Remove the next process from the run queue, returns (pcb, quantum). """
+        raise NotImplementedError("Each strategy must implement pick_next")
+
+    def admit(self, pcb):
+        """ Called before a new job is loaded, return False to reject it. """
+        return True
+
+    def on_arrival(self, pcb):
+        """ A new job was admitted, or a process was forked. """
+        self.enqueue(pcb)
+
+    def on_tick(self, pcb, ticks):
+        """ `pcb` just ran for `ticks` clock ticks. """
+        pass
+
+    def on_block(self, pcb):
+        """ `pcb` moved to the IO queue. """
+        pass
+
+    def on_wakeup(self, pcb):
+        """ `pcb` finished its IO and is ready again. """
+        self.enqueue(pcb)
+
+    def on_exit(self, pcb):
+        """ `pcb` terminated. """
+        pass
+
+    def should_preempt(self, pcb):
+        """ Called on an early timer interrupt, return True to take the CPU from `pcb`. """
+        return False
+
+    def ready_queues(self):
+        """ (name, processes) for every run queue, used by the state table. """
+        return [(self.name, self.processes)]
+
+    def get_quantums(self):
+        return []
+
+    def set_quantums(self, *quantums):
+        raise ValueError(f"{self.name} scheduling does not use quantums")
+
+    def get_metrics(self):
+        """ Strategy specific metrics, merged into Scheduler.get_metrics. """
+        return {}
+
+
+@register_strategy
+class RoundRobin(Strategy):
+    """ Single FIFO queue, every process runs for one quantum at a time. """
+    name = 'RR'
+    default_quantum = 10
+
+    def __init__(self, system):
+        super().__init__(system)
+        self.queue = Queue(self.default_quantum)
+
+    def __len__(self):
+        return len(self.queue)
+
+    @property
+    def processes(self):
+        return list(self.queue.processes)
+
+    def enqueue(self, pcb):
+        self.queue.add_process(pcb)
+
+    def pick_next(self):
+        return self.queue.get_process(), self.queue.get_quantum()
+
+    def get_quantums(self):
+        return [self.queue.get_quantum()]
+
+    def set_quantums(self, quantum, *_):
+        self.queue.set_quantum(quantum)
+
+
+@register_strategy
+class FirstComeFirstServed(RoundRobin):
+    """ Round robin with a quantum so large processes run until they block or exit. """
+    name = 'FCFS'
+    default_quantum = 1000000
+
+
+@register_strategy
+class MultiLevelFeedbackQueue(Strategy):
+    """
+    Three round robin queues with growing quantums, picked in rotation.
+    Every `check_promote_at` runs a process that was preempted more than 20%
+    of the time moves to the next queue (Q1 -> Q2 -> Q3), a process that was
+    preempted less moves back (Q2 -> Q1).
+    """
+    name = 'MLFQ'
+
+    def __init__(self, system):
+        super().__init__(system)
+        self.queues = [Queue(8), Queue(16), Queue()]
+        self.mlfq_index = 0  # Track the current queue
+        self.check_promote_at = 5  # Times to run pcb before promoting/demoting
+
+    def __len__(self):
+        return sum([len(queue) for queue in self.queues])
+
+    @property
+    def processes(self):
+        return [pcb for queue in self.queues for pcb in queue.processes]
+
+    def ready_queues(self):
+        return [(f"Q{level}", list(queue.processes)) for level, queue in enumerate(self.queues, 1)]
+
+    def enqueue(self, pcb):
+        self.check_for_promotion(pcb)
+
+        if pcb.queue_level in (1, 2, 3):
+            self.queues[pcb.queue_level - 1].add_process(pcb)
+        else:
+            raise ValueError(f"Invalid queue level {pcb.queue_level}")
+
+    def pick_next(self):
+        for _ in range(len(self.queues)): # Loop through all queues, getting one process from each
+            queue = self.queues[self.mlfq_index]
+            self.mlfq_index = (self.mlfq_index + 1) % len(self.queues)
+            if len(queue) > 0:
+                return queue.get_process(), queue.get_quantum()
+
+    def get_quantums(self):
+        return [self.queues[0].get_quantum(), self.queues[1].get_quantum()]
+
+    def set_quantums(self, quantum1, quantum2=None, *_):
+        self.queues[0].set_quantum(quantum1)
+        if quantum2 is not None:
+            self.queues[1].set_quantum(quantum2)
+
+    def check_for_promotion(self, pcb):
+        if pcb.run_count == self.check_promote_at:
+            preemption_ratio = pcb.preempt_count / pcb.run_count
+
+            if preemption_ratio > 0.2: # If preempt more than 80% of the time, promote Q1 -> Q2 -> Q3
+                self.promote(pcb)
+            elif preemption_ratio < 0.2:
+                self.demote(pcb)
+
+            pcb.preempt_count = 0
+            pcb.run_count = 0
+
+    def promote(self, pcb):
+        if pcb.queue_level == 1:
+            pcb.queue_level = 2
+            self.system.print(f"Promoting {pcb} to Q2")
+        elif pcb.queue_level == 2:
+            pcb.queue_level = 3
+            self.system.print(f"Promoting {pcb} to Q3")
+        elif pcb.queue_level == 3:
+            pcb.queue_level = 3
+        else:
+            raise ValueError(f"Invalid queue level {pcb.queue_level}")
+
+    def demote(self, pcb):
+        if pcb.queue_level == 1:
+            pcb.queue_level = 1
+        elif pcb.queue_level == 2:
+            pcb.queue_level = 1
+            self.system.print(f"Demoting {pcb} to Q1")
+        elif pcb.queue_level == 3:
+            pcb.queue_level = 3
+        else:
+            raise ValueError(f"Invalid queue level {pcb.queue_level}")
+
+
+@register_strategy
+class CompletelyFair(Strategy):
+    """
+    CFS, the process with the least weighted virtual runtime runs next.
+    See CFSQueue for the run queue and time slice calculation.
+    """
+    name = 'CFS'
+    preemptive = True
+
+    def __init__(self, system):
+        super().__init__(system)
+        self.queue = CFSQueue()
+
+    def __len__(self):
+        return len(self.queue)
+
+    @property
+    def processes(self):
+        return self.queue.processes
+
+    def enqueue(self, pcb):
+        self.queue.add_process(pcb)
+
+    def pick_next(self):
+        pcb = self.queue.get_process()
+        return pcb, self.queue.get_quantum(pcb)
+
+    def on_arrival(self, pcb):
+        self.queue.place_new(pcb)
+        self.enqueue(pcb)
+
+    def on_wakeup(self, pcb):
+        self.queue.place_sleeper(pcb)
+        self.enqueue(pcb)
+
+    def on_tick(self, pcb, ticks):
+        self.queue.account(pcb, ticks)
+
+    def should_preempt(self, pcb):
+        """ Wakeup preemption, only when the current process is ahead by more than the minimum granularity. """
+        leftmost = self.queue.peek()
+        return leftmost is not None and pcb.vruntime - leftmost.vruntime > self.queue.min_granularity
+
+    def set_latency(self, target_latency, min_granularity):
+        self.queue.set_latency(target_latency, min_granularity)
+
+
+@register_strategy
+class EarliestDeadlineFirst(Strategy):
+    """
+    EDF, the process with the earliest absolute deadline runs next.
+    Real-time jobs are admitted only while the total utilization stays at or
+    below 1, and a running process is preempted on the exact tick a job with
+    an earlier deadline arrives or returns from IO.
+    """
+    name = 'EDF'
+    preemptive = True
+
+    def __init__(self, system):
+        super().__init__(system)
+        self.queue = DeadlineQueue()
+        self.rt_utilization = 0  # Sum of the utilization of admitted real-time jobs
+        self.admitted = set()  # PIDs of the real-time jobs counted in rt_utilization
+
+    def __len__(self):
+        return len(self.queue)
+
+    @property
+    def processes(self):
+        return self.queue.processes
+
+    def enqueue(self, pcb):
+        self.queue.add_process(pcb)
+
+    def pick_next(self):
+        # No time slicing, the process runs until it blocks, exits or is preempted
+        return self.queue.get_process(), 1000000
+
+    def should_preempt(self, pcb):
+        earliest = self.queue.peek()
+        return earliest is not None and self.queue.key(earliest) < self.queue.key(pcb)
+
+    def admit(self, pcb):
+        """
+        Admit a real-time job if it fits in the remaining CPU capacity. A job
+        waiting for memory is asked again on every pass, it is counted once.
+        """
+        if pcb.deadline is None or pcb.pid in self.admitted:
+            return True
+
+        utilization = self.rt_utilization + pcb.utilization()
+        if utilization > 1:
+            self.system.system_code(111, f"Rejected {pcb}, utilization would be {utilization:.2f}", pcb.file)
+            return False
+
+        self.rt_utilization = utilization
+        self.admitted.add(pcb.pid)
+        return True
+
+    def on_exit(self, pcb):
+        if pcb.pid in self.admitted:
+            self.admitted.discard(pcb.pid)
+            self.rt_utilization -= pcb.utilization()
+
+    @staticmethod
+    def admission_test(pcbs):
+        """
+        Utilization based EDF admission test. A job mix is schedulable
+        if the real-time jobs need no more than 100% of the CPU.
+        Returns the total utilization and whether the mix is schedulable.
+        """
+        utilization = sum([pcb.utilization() for pcb in pcbs if pcb.deadline is not None])
+        return utilization, utilization <= 1
+
+
+@register_strategy
+class Priority(Strategy):
+    """
+    Static priority from the nice value plus aging, see PriorityArray.
+    """
+    name = 'PRIORITY'
+    preemptive = True
+
+    def __init__(self, system):
+        super().__init__(system)
+        self.queue = PriorityArray(system.clock)
+
+    def __len__(self):
+        return len(self.queue)
+
+    @property
+    def processes(self):
+        return self.queue.processes
+
+    def enqueue(self, pcb):
+        self.queue.add_process(pcb)
+
+    def pick_next(self):
+        pcb = self.queue.get_process()
+        return pcb, self.queue.get_quantum(pcb)
+
+    def get_quantums(self):
+        return [self.queue.quantum]
+
+    def set_quantums(self, quantum, *_):
+        self.queue.quantum = quantum
+
+    def set_aging_interval(self, aging_interval):
+        self.queue.set_aging_interval(aging_interval)
+
+    def should_preempt(self, pcb):
+        """ Preempt when a process with a strictly higher priority is waiting, aged up to now. """
+        self.queue.age()
+        highest = self.queue.highest_priority()
+        return highest is not None and highest < pcb.static_priority
+
+    def get_metrics(self):
+        """ Longest time a process sat in the priority array and how often aging boosted one. """
+        return {'longest_wait': self.queue.longest_wait,
+                'priority_boosts': self.queue.boosts}
+
+
+@register_strategy
+class ShortestRemainingTimeFirst(Strategy):
+    """
+    SRTF, the process with the least estimated work left runs next, and an
+    arrival with less work left preempts the running process. The estimate is
+    the number of instructions in the code section minus the time already run.
+    """
+    name = 'SRTF'
+    preemptive = True
+
+    def __init__(self, system):
+        super().__init__(system)
+        self.heap = []
+        self.counter = count()  # Tie breaker, equal estimates run in FIFO order
+
+    def __len__(self):
+        return len(self.heap)
+
+    @property
+    def processes(self):
+        return [entry[-1] for entry in sorted(self.heap)]
+
+    @staticmethod
+    def remaining_time(pcb):
+        return max(0, pcb.code_length() - pcb.execution_time)
+
+    def enqueue(self, pcb):
+        heapq.heappush(self.heap, (self.remaining_time(pcb), next(self.counter), pcb))
+
+    def pick_next(self):
+        return heapq.heappop(self.heap)[-1], 1000000
+
+    def should_preempt(self, pcb):
+        return bool(self.heap) and self.heap[0][0] < self.remaining_time(pcb)
@@ -0,0 +1,315 @@
+"""
+Benchmarks for the simulator hot paths.
+
+    python -m benchmarks.run_benchmarks [--output benchmarks.json] [--baseline baseline.json]
+                                        [--threshold 0.2] [--save-baseline] [--quick]
+
+Reports simulated instructions per second for CPU and memory bound programs,
+translations per second with and without page faults, scheduler decisions
+per second at 10, 1k and 100k processes, and System() construction and
+import time. Results are written to JSON. With a baseline the run fails
+(exit code 1) when a benchmark is worse than the baseline by more than the
+threshold.
+"""
+import os
+import sys
+import json
+import time
+import struct
+import random
+import argparse
+import tempfile
+import subprocess
+import contextlib
+import io
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT)
+from System.System import System
+from System.paging import PageTable
+from constants import instructions
+
+OPCODES = {name: opcode for opcode, name in instructions.items()}
+
+
+# Encoders for the few instructions the benchmark programs use, same layout as osx
+def mvi(register, value):
+    return bytes([OPCODES['MVI'], register]) + struct.pack('<I', value)
+
+
+def alu(name, first, second, third):
+    return bytes([OPCODES[name], first, second, third]) + b'  '
+
+
+def cmp(first, second):
+    return bytes([OPCODES['CMP'], first, second]) + b'   '
+
+
+def memory_op(name, register, address_register):
+    return bytes([OPCODES[name], register, address_register]) + b'   '
+
+
+def blt(offset):
+    return bytes([OPCODES['BLT']]) + struct.pack('<I', offset) + b' '
+
+
+def swi(number):
+    return bytes([OPCODES['SWI']]) + struct.pack('<I', number) + b' '
+
+
+def image(code, data=b'', loader=0):
+    """ .osx image, header (byte_size, pc, loader) followed by data and code. """
+    body = data + code
+    return struct.pack('III', len(body), len(data), loader) + body
+
+
+def cpu_bound_program(iterations):
+    """ Counts to `iterations`, 3 instructions per iteration. """
+    loop = 18
+    return image(mvi(1, 0) + mvi(2, 1) + mvi(3, iterations) +
+                 alu('ADD', 1, 1, 2) + cmp(1, 3) + blt(loop) +
+                 swi(1))
+
+
+def memory_bound_program(iterations, data_pages=10, page_bytes=24):
+    """ Increments one word per iteration, moving to the next page of a data section each time, 9 instructions per iteration. """
+    data_size = data_pages * page_bytes
+    setup = (mvi(1, 0) + mvi(2, page_bytes) + mvi(3, data_size) +
+             mvi(4, 0) + mvi(5, 1) + mvi(6, iterations))
+    # Branch targets are addresses in the image, the code follows the data
+    loop = data_size + len(setup)
+    skip = loop + 7 * 6
+    body = (memory_op('LDR', 0, 1) + alu('ADD', 0, 0, 5) + memory_op('STR', 0, 1) +
+            alu('ADD', 1, 1, 2) + cmp(1, 3) + blt(skip) + mvi(1, 0) +
+            alu('ADD', 4, 4, 5) + cmp(4, 6) + blt(loop) +
+            swi(1))
+    return image(setup + body, data=b' ' * data_size)
+
+
+def write_program(directory, name, program):
+    filepath = os.path.join(directory, name)
+    with open(filepath, 'wb') as f:
+        f.write(program)
+    return filepath
+
+
+def timed(function, repeat=3):
+    """ Best wall time of `repeat` calls and the result of the last one. """
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run_single(filepath):
+    """ Run one program to completion, returns the number of instructions executed. """
+    system = System()
+    system.scheduler.set_strategy('FCFS')
+    system.prepare_program(filepath, 0)
+    system.scheduler.schedule_jobs(plot=False)
+    return system.terminated_queue[0].execution_time
+
+
+def bench_cpu(directory, iterations):
+    filepath = write_program(directory, 'cpu_bound.osx', cpu_bound_program(iterations))
+    seconds, executed = timed(lambda: run_single(filepath))
+    return executed / seconds
+
+
+def bench_memory(directory, iterations):
+    filepath = write_program(directory, 'memory_bound.osx', memory_bound_program(iterations))
+    seconds, executed = timed(lambda: run_single(filepath))
+    return executed / seconds
+
+
+def loaded_pcb(system, filepath):
+    program_info = system.memory_manager.prepare_program(filepath)
+    pcb = system.create_pcb(program_info, 0)
+    system.memory_manager.load_to_memory(pcb)
+    return pcb
+
+
+def bench_translate(directory, count, faults):
+    """ Translations per second, every translation faults when `faults` is set. """
+    filepath = write_program(directory, 'memory_bound.osx', memory_bound_program(1))
+    system = System()
+    pcb = loaded_pcb(system, filepath)
+    page_size = system.memory_manager.page_size
+    if faults:
+        # Walk more pages than the process may keep resident
+        addresses = [(i % (pcb.max_resident_pages + 1)) * page_size for i in range(count)]
+    else:
+        addresses = [i % page_size for i in range(count)]
+    translate = system.memory_manager.translate
+
+    def run():
+        for address in addresses:
+            translate(pcb, address)
+
+    system.memory_manager.page_faults = 0
+    seconds, _ = timed(run)
+    if faults and system.memory_manager.page_faults < count:
+        raise RuntimeError("Fault benchmark didn't fault on every translation")
+    return count / seconds
+
+
+class DecisionLimit(Exception):
+    pass
+
+
+def bench_scheduler(directory, processes, max_decisions=1000):
+    """
+    Scheduler decisions (picks) per second with `processes` short jobs in the
+    round robin run queue, over at most `max_decisions` picks so large
+    process counts finish in bounded time. Creating the jobs isn't timed.
+    """
+    filepath = write_program(directory, 'short.osx', cpu_bound_program(5))
+    with open(filepath, 'rb') as f:
+        program = f.read()[12:]
+
+    def setup():
+        system = System()
+        system.scheduler.set_strategy('RR')
+        strategy = system.scheduler.strategy
+        strategy.set_quantums(4)
+        memory_manager = system.memory_manager
+        program_info = memory_manager.prepare_program(filepath)
+
+        # Jobs go straight to the run queue, admission is not what is measured here
+        for _ in range(processes):
+            pcb = system.create_pcb(program_info, 0)
+            memory_manager.programs[pcb.pid] = program
+            pcb.num_pages = (pcb.byte_size + memory_manager.page_size - 1) // memory_manager.page_size
+            pcb.page_table = PageTable(pcb.num_pages)
+            pcb.max_resident_pages = memory_manager.default_page_limit
+            strategy.on_arrival(pcb)
+
+        decisions = [0]
+        pick_next = strategy.pick_next
+
+        def counting_pick_next():
+            if decisions[0] == max_decisions:
+                raise DecisionLimit()
+            decisions[0] += 1
+            return pick_next()
+
+        strategy.pick_next = counting_pick_next
+        return system, decisions
+
+    best = 0
+    for _ in range(1 if processes > 1000 else 3):
+        system, decisions = setup()
+        start = time.perf_counter()
+        try:
+            system.scheduler.schedule_jobs(plot=False)
+        except DecisionLimit:
+            pass
+        best = max(best, decisions[0] / (time.perf_counter() - start))
+    return best
+
+
+def bench_construction(count=200):
+    seconds, _ = timed(lambda: [System() for _ in range(count)])
+    return seconds / count * 1000
+
+
+def bench_import():
+    """ Milliseconds to import the System package in a fresh interpreter. """
+    code = "import time; start = time.perf_counter(); import System.System; print(time.perf_counter() - start)"
+    best = float('inf')
+    for _ in range(3):
+        output = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+        best = min(best, float(output.stdout.strip().splitlines()[-1]))
+    return best * 1000
+
+
+# name -> (unit, higher is better)
+BENCHMARKS = {
+    'cpu_bound_ips': ('instructions/s', True),
+    'memory_bound_ips': ('instructions/s', True),
+    'translate_hit_per_s': ('translations/s', True),
+    'translate_fault_per_s': ('translations/s', True),
+    'scheduler_10_per_s': ('decisions/s', True),
+    'scheduler_1k_per_s': ('decisions/s', True),
+    'scheduler_100k_per_s': ('decisions/s', True),
+    'system_construction_ms': ('ms', False),
+    'import_ms': ('ms', False),
+}
+
+
+def run_benchmarks(quick=False):
+    scale = 10 if quick else 1
+    results = {}
+    with tempfile.TemporaryDirectory() as directory, contextlib.redirect_stdout(io.StringIO()):
+        random.seed(0)
+        results['cpu_bound_ips'] = bench_cpu(directory, 20000 // scale)
+        results['memory_bound_ips'] = bench_memory(directory, 5000 // scale)
+        results['translate_hit_per_s'] = bench_translate(directory, 200000 // scale, faults=False)
+        results['translate_fault_per_s'] = bench_translate(directory, 50000 // scale, faults=True)
+        results['scheduler_10_per_s'] = bench_scheduler(directory, 10)
+        results['scheduler_1k_per_s'] = bench_scheduler(directory, 1000)
+        if not quick:
+            results['scheduler_100k_per_s'] = bench_scheduler(directory, 100000)
+        results['system_construction_ms'] = bench_construction()
+    results['import_ms'] = bench_import()
+    return results
+
+
+def compare(results, baseline, threshold):
+    """ Names of the benchmarks that are worse than the baseline by more than `threshold`. """
+    regressions = []
+    for name, value in results.items():
+        if name not in baseline:
+            continue
+        reference = baseline[name]['value'] if isinstance(baseline[name], dict) else baseline[name]
+        _, higher_is_better = BENCHMARKS[name]
+        change = (value - reference) / reference if reference else 0
+        if (-change if higher_is_better else change) > threshold:
+            regressions.append((name, reference, value, change))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the simulator hot paths")
+    parser.add_argument('--output', default='benchmarks.json')
+    parser.add_argument('--baseline', default=os.path.join(os.path.dirname(__file__), 'baseline.json'))
+    parser.add_argument('--threshold', type=float, default=0.2, help="Allowed relative regression, 0.2 = 20%%")
+    parser.add_argument('--save-baseline', action='store_true', help="Write the results as the new baseline")
+    parser.add_argument('--quick', action='store_true', help="Smaller inputs and no 100k process run")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.quick)
+    report = {name: {'value': round(value, 3), 'unit': BENCHMARKS[name][0]} for name, value in results.items()}
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    for name, entry in report.items():
+        print(f"{name:25} {entry['value']:>15,.1f} {entry['unit']}")
+    print(f"\nResults written to {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline to compare against, run with --save-baseline to create one")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold)
+    for name, reference, value, change in regressions:
+        print(f"REGRESSION {name}: {value:,.1f} vs baseline {reference:,.1f} ({change:+.0%})")
+    if regressions:
+        return 1
+    print(f"No regressions over {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
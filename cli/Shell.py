@@ -1,10 +1,14 @@
-import subprocess
+import os
+import sys
 
 try:
     from .Modes import Modes
 except ImportError:
     from Modes import Modes
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from Assembler import main as assemble
+
 class ShellMode(Modes):
     """
     A class representing a shell mode for interacting with the system.
@@ -19,7 +23,7 @@ class ShellMode(Modes):
         handle_command(cmd, args):
             Handles a specific command by delegating it to the system object.
         execute_terimal_command(args):
-            Executes a terminal command using the subprocess module and prints the output.
+            Compiles .asm files with the in-process assembler and prints the output.
     """
     def __init__(self, System):
         self.System = System
@@ -35,7 +39,7 @@ class ShellMode(Modes):
         - Handles specific commands:
             - 'bash': Switches to bash mode and exits the shell.
             - 'exit': Exits the shell.
-            - 'osx': Executes terminal commands using the `execute_terimal_command` method.
+            - 'osx': Compiles .asm files using the `execute_terimal_command` method.
             - Other commands are handled by the `handle_command` method.
         Returns:
             str: 'bash' if the user switches to bash mode.
@@ -85,18 +89,14 @@ class ShellMode(Modes):
         """
         Compiles asm code
         Args:
-            args (str): file name to compile
+            args (list): .asm files or directories, a file can be followed by its load address
         Behavior:
-            - Calls compiler with the provided file name
+            - Calls the assembler (Assembler.py) in process, unchanged files are skipped
         """
         try:
-            args.insert(0, 'osx')
-            result = subprocess.run(args, text=True, capture_output=True)
-            print(result.stdout)
-            
-        except subprocess.CalledProcessError as e:
-            print(f"Error: {e}")
-            print(e.stderr)
+            assemble(args)
+        except SystemExit:
+            pass  # Bad arguments, the usage was printed
         except Exception as e:
             print(f"Error: {e}")
 
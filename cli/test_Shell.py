@@ -23,12 +23,11 @@ class TestShellMode(unittest.TestCase):
         self.shell.run()
         self.mock_system.call.assert_called_with('cmd1', 'arg1')
 
-    @patch('builtins.input', side_effect=['osx -l', 'exit'])
-    @patch('subprocess.run')
-    def test_execute_terminal_command(self, mock_subprocess, mock_input):
-        mock_subprocess.return_value = MagicMock(stdout="Command executed successfully")
+    @patch('builtins.input', side_effect=['osx add.asm 10', 'exit'])
+    @patch('Shell.assemble')
+    def test_execute_terminal_command(self, mock_assemble, mock_input):
         self.shell.run()
-        mock_subprocess.assert_called_with(['osx', '-l'], text=True, capture_output=True)
+        mock_assemble.assert_called_with(['add.asm', '10'])
 
     @patch('builtins.input', side_effect=['cmd1 -v', 'exit'])
     def test_run_verbose_mode(self, mock_input):
@@ -3,4 +3,5 @@ from .kernal_modes import KERNEL_MODE
 from .system_codes import SYSTEM_CODES
 from .instructions import instructions
 from .child_exec_program import CHILD_EXEC_PROGRAM
-from .pcb_states import PCBState
\ No newline at end of file
+from .pcb_states import PCBState
+from .priorities import MIN_NICE, MAX_NICE, NUM_PRIORITIES, NICE_TO_WEIGHT
@@ -8,4 +8,5 @@ class PCBState(Enum):
     READY = 2
     RUNNING = 3
     WAITING = 4
-    TERMINATED = 5
\ No newline at end of file
+    TERMINATED = 5
+    SUSPENDED = 6  # Swapped out by the long-term scheduler under memory pressure
\ No newline at end of file
@@ -0,0 +1,17 @@
+# Nice values, lower is higher priority
+MIN_NICE = -20
+MAX_NICE = 19
+NUM_PRIORITIES = MAX_NICE - MIN_NICE + 1
+
+# CFS load weight for each nice value (index 0 is nice -20), taken from the Linux
+# kernel, every nice level is worth about 10% CPU time
+NICE_TO_WEIGHT = [
+    88761, 71755, 56483, 46273, 36291,
+    29154, 23254, 18705, 14949, 11916,
+     9548,  7620,  6100,  4904,  3906,
+     3121,  2501,  1991,  1586,  1277,
+     1024,   820,   655,   526,   423,
+      335,   272,   215,   172,   137,
+      110,    87,    70,    56,    45,
+       36,    29,    23,    18,    15,
+]
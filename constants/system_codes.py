@@ -13,4 +13,5 @@ SYSTEM_CODES = {
     108: "Invalid register",
     109: "File not found",
     110: "Out of bounds memory access",
+    111: "Deadline admission test failed",
 }
\ No newline at end of file
@@ -0,0 +1,3 @@
+from .sweep import expand_grid, run_config, run_sweep, task_seed
+from .results import ResultStore, run_key
+from .tuner import QuantumTuner
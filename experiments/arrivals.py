@@ -0,0 +1,194 @@
+"""
+Open-system workloads: jobs keep arriving while the system runs, instead of
+every program being queued before scheduling starts and the run draining to
+empty. The scheduler pulls arrivals from an OpenWorkload as simulated time
+reaches them, so only the jobs that have arrived exist at any time:
+
+    workload = OpenWorkload(WorkloadGenerator(length=(20, 120), seed=1),
+                            poisson(0.02), duration=100000, warmup=10000, seed=2)
+    metrics = workload.run(system)
+
+Interarrival times are distributions as in generator.py, usually one of the
+arrival processes below. An arrival process returning None ends the
+arrivals. Jobs that arrive before `warmup` run but are left out of the
+metrics, which cover warmup to the end of the run. Arrival times are rounded
+up to whole clock ticks.
+
+    python -m experiments.arrivals --rate 0.01 --duration 100000 --warmup 10000 --strategy MLFQ
+    python -m experiments.arrivals --trace arrivals.txt --strategy RR
+"""
+import os
+import sys
+import io
+import math
+import random
+import argparse
+import contextlib
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from System.System import System
+from experiments.generator import WorkloadGenerator, sample
+
+
+def poisson(rate):
+    """ Poisson arrivals, `rate` jobs per time unit on average (exponential interarrival times). """
+    def interarrival(rng):
+        return rng.expovariate(rate)
+    return interarrival
+
+
+class Bursty:
+    """
+    On/off arrivals: bursts of about `burst_jobs` jobs (geometric) arriving at
+    `burst_rate`, separated by quiet periods of about `quiet_time` time units
+    (exponential). Jobs queue up during bursts, while the long run rate is
+    well below `burst_rate`, about 1 / (1 / burst_rate + quiet_time / burst_jobs)
+    jobs per time unit.
+    """
+    def __init__(self, burst_rate, burst_jobs=20, quiet_time=500):
+        self.burst_rate = burst_rate
+        self.burst_jobs = burst_jobs
+        self.quiet_time = quiet_time
+        self.left_in_burst = 0
+
+    def __call__(self, rng):
+        gap = rng.expovariate(self.burst_rate)
+        if self.left_in_burst == 0:
+            # A new burst starts after a quiet period
+            self.left_in_burst = 1 + int(rng.expovariate(1 / self.burst_jobs))
+            gap += rng.expovariate(1 / self.quiet_time)
+        self.left_in_burst -= 1
+        return gap
+
+
+class Trace:
+    """
+    Arrival times replayed from a file, one time per line in increasing
+    order, '#' starts a comment. Ends the arrivals after the last line.
+    """
+    def __init__(self, path):
+        with open(path) as f:
+            self.times = [float(line.split('#', 1)[0]) for line in f if line.split('#', 1)[0].strip()]
+        self.index = 0
+        self.previous = 0
+
+    def __call__(self, rng):
+        if self.index == len(self.times):
+            return None
+        time = self.times[self.index]
+        self.index += 1
+        gap, self.previous = time - self.previous, time
+        return gap
+
+
+class OpenWorkload:
+    """
+    Arrival source for Scheduler.source: programs from a WorkloadGenerator,
+    arriving `interarrival` time units apart (drawn from a random.Random
+    seeded with `seed`). Arrivals stop after `jobs` jobs; with `duration` the
+    run stops at that time, whatever is still in the system. Without either
+    the arrival process has to end the arrivals (see Trace).
+
+    Every job is named <generator name>.osx, so the archive stores the name
+    once however many jobs arrive. Jobs the system rejects are counted in
+    `rejected`, not `arrived`, and don't count towards `jobs`.
+    """
+    def __init__(self, generator, interarrival, jobs=None, duration=None, warmup=0, start=0, seed=0):
+        self.generator = generator
+        self.interarrival = interarrival
+        self.jobs = jobs
+        self.duration = duration
+        self.warmup = warmup
+        self.rng = random.Random(seed)
+        self.name = f"{generator.name}.osx"
+        self.arrived = 0
+        self.rejected = 0
+        self.time = start
+        self.pending = None
+        self.advance()
+
+    def advance(self):
+        """ Draw the time of the next arrival, None once arrivals are over. """
+        gap = sample(self.rng, self.interarrival)
+        if gap is None or (self.jobs is not None and self.arrived >= self.jobs):
+            self.pending = None
+            return
+        self.time += gap
+        self.pending = math.ceil(self.time)
+        if self.duration is not None and self.pending >= self.duration:
+            self.pending = None
+
+    def next_time(self):
+        """ Clock time of the next arrival, None if there is none. """
+        return self.pending
+
+    def release(self, system, now):
+        """ Queue every job that has arrived by `now` on `system`. """
+        while self.pending is not None and self.pending <= now:
+            _, image = next(self.generator.programs(1, system.memory_manager.memory.size))
+            if system.prepare_program(self.name, self.pending, image=image):
+                self.arrived += 1
+            else:
+                self.rejected += 1
+            self.advance()
+
+    def finished(self, now):
+        """ Whether the run is over at `now`, only when it has a duration. """
+        return self.duration is not None and now >= self.duration
+
+    def run(self, system, plot=False):
+        """
+        Run `system` on this workload and return the scheduler's metrics.
+        Terminated processes are archived and recycled rather than retained.
+        """
+        system.retain_terminated = False
+        scheduler = system.scheduler
+        scheduler.source = self
+        scheduler.warmup = self.warmup
+        try:
+            return scheduler.schedule_jobs(plot=plot)
+        finally:
+            scheduler.source = None
+            scheduler.warmup = 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run an open-system workload and print steady-state metrics")
+    arrivals = parser.add_mutually_exclusive_group()
+    arrivals.add_argument('--rate', type=float, default=0.01, help="Poisson arrivals per time unit")
+    arrivals.add_argument('--bursty', type=float, nargs=3, metavar=('RATE', 'JOBS', 'QUIET'),
+                          help="Bursts of about JOBS jobs at RATE, QUIET time units apart")
+    arrivals.add_argument('--trace', help="File of arrival times, one per line")
+    parser.add_argument('--jobs', type=int, help="Stop arrivals after this many jobs")
+    parser.add_argument('--duration', type=int, help="Stop the run at this time")
+    parser.add_argument('--warmup', type=int, default=0, help="Leave jobs arriving before this time out of the metrics")
+    parser.add_argument('--strategy', default='RR')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.trace:
+        interarrival = Trace(args.trace)
+    elif args.bursty:
+        interarrival = Bursty(args.bursty[0], args.bursty[1], args.bursty[2])
+    else:
+        interarrival = poisson(args.rate)
+    if args.jobs is None and args.duration is None and not args.trace:
+        parser.error("--jobs or --duration is needed unless arrivals come from a trace")
+
+    random.seed(args.seed)
+    system = System()
+    system.scheduler.set_strategy(args.strategy)
+    workload = OpenWorkload(WorkloadGenerator(length=(20, 120), seed=args.seed), interarrival, jobs=args.jobs,
+                            duration=args.duration, warmup=args.warmup, seed=args.seed)
+    with contextlib.redirect_stdout(io.StringIO()):
+        metrics = workload.run(system)
+
+    print(f"{workload.arrived} jobs arrived, {workload.rejected} rejected, {len(system.processes)} still in the system")
+    for name in ('n_jobs', 'throughput', 'cpu_utilization', 'avg_wait_time', 'p99_wait_time',
+                 'avg_turnaround', 'p99_turnaround'):
+        if name in metrics:
+            print(f"{name:22} {metrics[name]}")
+
+
+if __name__ == '__main__':
+    main()
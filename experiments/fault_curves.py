@@ -0,0 +1,169 @@
+"""
+Page fault curves from a single simulation.
+
+The simulation is run once with MemoryManager.reference_trace switched on,
+which records every (pid, virtual address) the CPU translates. Addresses
+don't depend on the page size, so the same trace gives the page reference
+string of every process for any page size.
+
+LRU is a stack algorithm: a reference hits with k resident pages exactly when
+its stack distance (distinct pages touched since the last reference to the
+same page, plus one) is at most k. One pass of Mattson's algorithm gives the
+distance of every reference, counted with a Fenwick tree in O(n log n), and
+with that the fault count for every page limit at once. OPT is computed per
+limit with the next-use times of the trace, O(n log k) each.
+
+Page limits are per process, as in MemoryManager, so a process's faults only
+depend on its own references. The curves assume the process never loses a
+page to global eviction when memory runs out of frames.
+"""
+import os
+import sys
+import heapq
+import random
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from System.System import System
+
+# Bytes per instruction, page sizes are given in instructions like setpagesize
+INSTRUCTION_SIZE = 6
+
+
+class FenwickTree:
+    """ Prefix sums over a fixed size array of counts with O(log n) updates. """
+    def __init__(self, size):
+        self.tree = [0] * (size + 1)
+
+    def add(self, index, delta):
+        index += 1
+        while index < len(self.tree):
+            self.tree[index] += delta
+            index += index & -index
+
+    def prefix_sum(self, index):
+        """ Sum of the counts at positions < index. """
+        total = 0
+        while index > 0:
+            total += self.tree[index]
+            index -= index & -index
+        return total
+
+
+def record_references(programs, strategy='FCFS', seed=0):
+    """
+    Run programs once and return {pid: [virtual address, ...]} in reference order.
+    `programs` is a list of paths or (path, arrival_time) pairs.
+    """
+    random.seed(seed)
+    system = System()
+    system.scheduler.set_strategy(strategy)
+    system.memory_manager.reference_trace = []
+
+    for program in programs:
+        path, arrival_time = (program, 0) if isinstance(program, str) else program
+        system.prepare_program(path, arrival_time)
+    system.scheduler.schedule_jobs(plot=False)
+
+    references = {}
+    for pid, address in system.memory_manager.reference_trace:
+        references.setdefault(pid, []).append(address)
+    return references
+
+
+def page_string(addresses, page_size):
+    """ Page numbers of the addresses, with repeats of the same page collapsed. """
+    page_bytes = page_size * INSTRUCTION_SIZE
+    pages = []
+    for address in addresses:
+        page = address // page_bytes
+        # A repeat of the last page always hits, for any limit >= 1
+        if not pages or pages[-1] != page:
+            pages.append(page)
+    return pages
+
+
+def stack_distances(pages):
+    """
+    LRU stack distance of every reference, None for the first reference to a page.
+    Each page has a marker at the time of its last reference, the distance is
+    the number of markers after that time plus one.
+    """
+    tree = FenwickTree(len(pages))
+    last_reference = {}
+    distances = []
+    for time, page in enumerate(pages):
+        last = last_reference.get(page)
+        if last is None:
+            distances.append(None)
+        else:
+            distances.append(tree.prefix_sum(time) - tree.prefix_sum(last + 1) + 1)
+            tree.add(last, -1)
+        tree.add(time, 1)
+        last_reference[page] = time
+    return distances
+
+
+def lru_fault_curve(pages, max_limit):
+    """ [faults with 1 resident page, ..., faults with max_limit resident pages] under LRU. """
+    cold_misses = 0
+    histogram = [0] * (max_limit + 2)  # Distances above max_limit share the last bucket
+    for distance in stack_distances(pages):
+        if distance is None:
+            cold_misses += 1
+        else:
+            histogram[min(distance, max_limit + 1)] += 1
+
+    curve = []
+    misses = cold_misses + sum(histogram[2:])
+    for limit in range(1, max_limit + 1):
+        curve.append(misses)
+        misses -= histogram[limit + 1]
+    return curve
+
+
+def opt_faults(pages, limit):
+    """ Faults under Belady's OPT, evicting the resident page used furthest in the future. """
+    next_use = [len(pages)] * len(pages)
+    seen = {}
+    for time in range(len(pages) - 1, -1, -1):
+        next_use[time] = seen.get(pages[time], len(pages))
+        seen[pages[time]] = time
+
+    resident = {}  # page -> time of its next use
+    heap = []  # (-next use, page), stale entries are skipped
+    faults = 0
+    for time, page in enumerate(pages):
+        if page not in resident:
+            faults += 1
+            if len(resident) >= limit:
+                while True:
+                    use, victim = heapq.heappop(heap)
+                    if resident.get(victim) == -use:
+                        del resident[victim]
+                        break
+        resident[page] = next_use[time]
+        heapq.heappush(heap, (-next_use[time], page))
+    return faults
+
+
+def opt_fault_curve(pages, max_limit):
+    return [opt_faults(pages, limit) for limit in range(1, max_limit + 1)]
+
+
+def fault_surface(references, page_sizes, page_limits):
+    """
+    {(page size, page limit): {'lru': faults, 'opt': faults}} summed over all
+    processes, from one recorded trace.
+    """
+    max_limit = max(page_limits)
+    surface = {}
+    for page_size in page_sizes:
+        lru = [0] * max_limit
+        opt = [0] * max_limit
+        for addresses in references.values():
+            pages = page_string(addresses, page_size)
+            lru = [total + faults for total, faults in zip(lru, lru_fault_curve(pages, max_limit))]
+            opt = [total + faults for total, faults in zip(opt, opt_fault_curve(pages, max_limit))]
+        for limit in page_limits:
+            surface[(page_size, limit)] = {'lru': lru[limit - 1], 'opt': opt[limit - 1]}
+    return surface
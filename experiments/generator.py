@@ -0,0 +1,199 @@
+"""
+Seeded synthetic workloads, built as .osx images in memory.
+
+Programs are packed directly (12 byte header, 6 byte instructions), without
+.asm files or the osx assembler, so a workload of 10,000 processes is built
+and queued in seconds:
+
+    generator = WorkloadGenerator(length=(20, 120), io_ratio=0.2, loops=(0, 3),
+                                  footprint=(0, 40), memory_ratio=0.1, seed=1)
+    generator.submit(system, 10000, interarrival=(0, 5))
+    system.scheduler.schedule_jobs()
+
+Every parameter is a distribution: a number is used as is, a (low, high)
+tuple is sampled uniformly (integers if both ends are integers), a list is
+sampled with random.choice, and a callable is called with the generator's
+random.Random. Programs are:
+
+    data      footprint words
+    MVI R0 0 ; MVI R1 1
+    blocks    `length` body instructions, `loops` slices of them are loops
+              repeated `loop_iterations` times, the rest straight line code
+    SWI 1
+
+A body instruction is IO (SWI `io_call`) with probability io_ratio, a load or
+store of a random data word (MVI + LDR/STR) with probability memory_ratio,
+otherwise ADD R0 R0 R1. With a `max_size`, as submit passes from the system's
+memory size, footprint and body are cut short so the program fits in it.
+"""
+import os
+import sys
+import struct
+import random
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from constants import instructions
+
+OPCODES = {name: opcode for opcode, name in instructions.items()}
+INSTRUCTION_SIZE = 6
+WORD_SIZE = 4
+# MVI R0 0 ; MVI R1 1 at the start and SWI 1 at the end
+FIXED_SIZE = 3 * INSTRUCTION_SIZE
+# Counter setup before a loop and increment, compare and branch after it
+LOOP_SETUP_SIZE = 2 * INSTRUCTION_SIZE
+LOOP_CLOSE_SIZE = 3 * INSTRUCTION_SIZE
+
+# Registers: R0 accumulator, R1 constant 1, R2 data address, R3 loaded value,
+# R6 loop bound, R7 loop counter
+ADD_R0 = bytes([OPCODES['ADD'], 0, 0, 1, 32, 32])
+INCREMENT_COUNTER = bytes([OPCODES['ADD'], 7, 7, 1, 32, 32])
+COMPARE_COUNTER = bytes([OPCODES['CMP'], 7, 6, 32, 32, 32])
+LOAD = bytes([OPCODES['LDR'], 3, 2, 32, 32, 32])
+STORE = bytes([OPCODES['STR'], 0, 2, 32, 32, 32])
+
+
+def mvi(register, value):
+    return struct.pack('<BBI', OPCODES['MVI'], register, value)
+
+
+def swi(number):
+    return struct.pack('<BIB', OPCODES['SWI'], number, 32)
+
+
+def branch(name, address):
+    return struct.pack('<BIB', OPCODES[name], address, 32)
+
+
+def sample(rng, distribution):
+    """ One value of a distribution, see the module docstring. """
+    if callable(distribution):
+        return distribution(rng)
+    if isinstance(distribution, tuple):
+        low, high = distribution
+        if isinstance(low, int) and isinstance(high, int):
+            return rng.randint(low, high)
+        return rng.uniform(low, high)
+    if isinstance(distribution, list):
+        return rng.choice(distribution)
+    return distribution
+
+
+class WorkloadGenerator:
+    """
+    Builds random programs from distributions of their shape, every program
+    and arrival time is drawn from one random.Random seeded with `seed`.
+    Programs are named <name>-<n>.osx, e.g. GEN-CPU-1.osx, so metrics group
+    them by the second part of the name like the ProgramCreator programs.
+    """
+    def __init__(self, length=(20, 200), io_ratio=0.1, memory_ratio=0.0, footprint=0,
+                 loops=0, loop_iterations=(2, 10), io_call=20, name='GEN-CPU', seed=0):
+        self.length = length
+        self.io_ratio = io_ratio
+        self.memory_ratio = memory_ratio
+        self.footprint = footprint
+        self.loops = loops
+        self.loop_iterations = loop_iterations
+        self.io_call = io_call
+        self.name = name
+        self.rng = random.Random(seed)
+        self.count = 0
+        self.next_loader = 0
+
+    def body_instruction(self, words):
+        """ One body instruction, memory accesses are 2 instructions. """
+        draw = self.rng.random()
+        if draw < self.io_ratio:
+            return swi(self.io_call)
+        if words and draw < self.io_ratio + self.memory_ratio:
+            address = self.rng.randrange(words) * WORD_SIZE
+            return mvi(2, address) + (LOAD if self.rng.random() < 0.5 else STORE)
+        return ADD_R0
+
+    def program(self, max_size=None):
+        """ One .osx image, its code and data no bigger than `max_size` bytes if given. """
+        rng = self.rng
+        words = max(0, int(sample(rng, self.footprint)))
+        length = max(0, int(sample(rng, self.length)))
+        loops = max(0, int(sample(rng, self.loops)))
+        if max_size is not None:
+            room = (max_size - FIXED_SIZE) // INSTRUCTION_SIZE * INSTRUCTION_SIZE
+            words = min(words, room // WORD_SIZE)
+
+        # Data is padded so the code starts on an instruction boundary
+        data_size = words * WORD_SIZE
+        data_size += -data_size % INSTRUCTION_SIZE
+        data = bytes(data_size)
+
+        # The body alternates straight line and loop segments, every other
+        # pair of cut points is a loop
+        cuts = sorted(rng.sample(range(length + 1), min(2 * loops, length + 1)))
+        loop_starts = {cuts[k]: cuts[k + 1] for k in range(0, len(cuts) - 1, 2) if cuts[k] < cuts[k + 1]}
+
+        code = [mvi(0, 0), mvi(1, 1)]
+        size = data_size + 2 * INSTRUCTION_SIZE
+        # Room left for the body, SWI 1 still has to fit after it
+        limit = float('inf') if max_size is None else max_size - INSTRUCTION_SIZE
+        i = 0
+        while i < length:
+            if i in loop_starts and size + LOOP_SETUP_SIZE + LOOP_CLOSE_SIZE <= limit:
+                end = loop_starts[i]
+                iterations = max(1, int(sample(rng, self.loop_iterations)))
+                code += [mvi(7, 0), mvi(6, iterations)]
+                size += LOOP_SETUP_SIZE
+                top = size
+                for _ in range(end - i):
+                    instruction = self.body_instruction(words)
+                    if size + len(instruction) + LOOP_CLOSE_SIZE > limit:
+                        end = length  # No room for the rest of the body
+                        break
+                    code.append(instruction)
+                    size += len(instruction)
+                code += [INCREMENT_COUNTER, COMPARE_COUNTER, branch('BLT', top)]
+                size += LOOP_CLOSE_SIZE
+                i = end
+            else:
+                instruction = self.body_instruction(words)
+                if size + len(instruction) > limit:
+                    break
+                code.append(instruction)
+                size += len(instruction)
+                i += 1
+        code.append(swi(1))
+
+        body = data + b''.join(code)
+        # Programs get consecutive load addresses so they don't overlap
+        loader = self.next_loader
+        self.next_loader += len(body)
+        return struct.pack('III', len(body), data_size, loader) + body
+
+    def programs(self, count, max_size=None):
+        """ Yield (name, image) for `count` new programs. """
+        for _ in range(count):
+            self.count += 1
+            yield f"{self.name}-{self.count}.osx", self.program(max_size)
+
+    def submit(self, system, count, arrival=0, interarrival=0):
+        """
+        Queue `count` new programs on `system` without touching disk. The first
+        arrives at `arrival`, the next ones `interarrival` time units apart.
+        Programs are cut to fit in the system's memory. Returns the PCBs.
+        """
+        pcbs = []
+        arrival_time = arrival
+        for name, image in self.programs(count, system.memory_manager.memory.size):
+            pcb = system.prepare_program(name, arrival_time, image=image)
+            if pcb:
+                pcbs.append(pcb)
+            arrival_time += sample(self.rng, interarrival)
+        return pcbs
+
+    def write(self, directory, count):
+        """ Write `count` new programs to `directory`, returns their paths. """
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        for name, image in self.programs(count):
+            path = os.path.join(directory, name)
+            with open(path, 'wb') as f:
+                f.write(image)
+            paths.append(path)
+        return paths
@@ -0,0 +1,157 @@
+"""
+SQLite store for sweep results.
+
+A run is keyed by a hash of the program bytes, the scheduler and memory
+parameters and the seed, so rerunning a sweep only simulates the
+configurations that changed. Query the best runs from the command line:
+
+    python -m experiments.results best avg_wait_time --workload S-CPU --limit 5
+"""
+import os
+import json
+import sqlite3
+import hashlib
+import argparse
+
+# Metrics where a larger value is better, everything else is minimized
+MAXIMIZE = {'throughput', 'cpu_utilization'}
+
+# Metrics grouped by an integer, JSON turns the keys into strings
+INT_KEYED = ('by_queue_level',)
+
+
+def run_key(config):
+    """ Hash of everything that determines the outcome of a run. """
+    digest = hashlib.sha256()
+    for path, arrival_time, options in config['programs']:
+        try:
+            with open(path, 'rb') as f:
+                digest.update(hashlib.sha256(f.read()).digest())
+        except OSError:
+            digest.update(f"missing:{path}".encode())
+        digest.update(json.dumps([arrival_time, options], sort_keys=True).encode())
+
+    parameters = {key: config[key] for key in ('workload', 'strategy', 'quantums', 'promote_at', 'page_size',
+                                               'page_limit', 'seed')}
+    digest.update(json.dumps(parameters, sort_keys=True, default=list).encode())
+    return digest.hexdigest()
+
+
+class ResultStore:
+    """ Results of sweep runs in a local SQLite database. """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS runs (
+            key TEXT PRIMARY KEY,
+            workload TEXT,
+            strategy TEXT,
+            config TEXT NOT NULL,
+            metrics TEXT NOT NULL,
+            page_faults INTEGER,
+            timeline TEXT,
+            wall_time REAL,
+            created TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """
+
+    def __init__(self, path='results.db'):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(self.SCHEMA)
+        self.connection.commit()
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+    def __contains__(self, config):
+        return self.get(config) is not None
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def put(self, result):
+        config = result['config']
+        self.connection.execute(
+            "INSERT OR REPLACE INTO runs (key, workload, strategy, config, metrics, page_faults, timeline, wall_time) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (run_key(config), config['workload'], config['strategy'],
+             json.dumps(config, default=list), json.dumps(result['metrics']),
+             result['metrics'].get('page_faults'), json.dumps(result.get('timeline')),
+             result.get('wall_time')))
+        self.connection.commit()
+
+    def get(self, config):
+        """ Stored result of a configuration, None if it wasn't run yet. """
+        row = self.connection.execute(
+            "SELECT config, metrics, timeline, wall_time FROM runs WHERE key = ?", (run_key(config),)).fetchone()
+        if row is None:
+            return None
+        return self._result(row)
+
+    @staticmethod
+    def _result(row):
+        config, metrics, timeline, wall_time = row
+        config = json.loads(config)
+        if config.get('quantums') is not None:
+            config['quantums'] = tuple(config['quantums'])
+        config['programs'] = [tuple(program) for program in config['programs']]
+        metrics = json.loads(metrics)
+        for name in INT_KEYED:
+            if name in metrics:
+                metrics[name] = {int(key): value for key, value in metrics[name].items()}
+        return {'config': config,
+                'metrics': metrics,
+                'timeline': json.loads(timeline),
+                'wall_time': wall_time,
+                'cached': True}
+
+    def results(self, workload=None, strategy=None):
+        query = "SELECT config, metrics, timeline, wall_time FROM runs WHERE 1 = 1"
+        params = []
+        if workload is not None:
+            query += " AND workload = ?"
+            params.append(workload)
+        if strategy is not None:
+            query += " AND strategy = ?"
+            params.append(strategy)
+        return [self._result(row) for row in self.connection.execute(query, params)]
+
+    def best(self, metric='avg_wait_time', limit=5, workload=None, strategy=None):
+        """ The `limit` best stored runs by `metric`, lowest first unless larger is better. """
+        results = [result for result in self.results(workload, strategy) if metric in result['metrics']]
+        results.sort(key=lambda result: result['metrics'][metric], reverse=metric in MAXIMIZE)
+        return results[:limit]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query stored sweep results")
+    parser.add_argument('--db', default='results.db')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    best = subparsers.add_parser('best', help="List the best configurations for a metric")
+    best.add_argument('metric', nargs='?', default='avg_wait_time')
+    best.add_argument('--workload')
+    best.add_argument('--strategy')
+    best.add_argument('--limit', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        print(f"No results database at {args.db}")
+        return
+
+    from tabulate import tabulate
+    with ResultStore(args.db) as store:
+        results = store.best(args.metric, args.limit, args.workload, args.strategy)
+        table = [[result['config']['workload'], result['config']['strategy'], result['config']['quantums'],
+                  result['config']['page_size'], result['config']['page_limit'], result['metrics'][args.metric]]
+                 for result in results]
+        print(tabulate(table, headers=["Workload", "Strategy", "Quantums", "Page size", "Page limit", args.metric],
+                       tablefmt="grid"))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+"""
+Parameter sweeps over the simulator.
+
+A sweep is a declarative grid, every key maps to the values to try:
+
+    grid = {
+        'strategy': ['MLFQ'],
+        'quantums': [(10, 20), (10, 30), (20, 40)],
+        'page_size': [4],
+        'page_limit': [3],
+        'workload': ['S-CPU', 'S-IO'],
+    }
+    workloads = {'S-CPU': ['programs/milestone_3/S-CPU-1.osx', ...], ...}
+
+    for result in run_sweep(expand_grid(grid, workloads)):
+        print(result['config'], result['metrics']['avg_wait_time'])
+
+Each configuration runs in its own System in a worker process, seeded from
+the configuration so reruns give the same results, and results are yielded
+in completion order. Pass a ResultStore (see results.py) to skip the
+configurations that were already run.
+"""
+import os
+import sys
+import time
+import random
+import hashlib
+import json
+import itertools
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from System.System import System
+
+# Values used for grid keys that are left out
+DEFAULTS = {
+    'strategy': 'MLFQ',
+    'quantums': None,  # None keeps the strategy's own quantums
+    'promote_at': None,  # MLFQ runs between promotion checks, None keeps the default
+    'page_size': 4,  # Instructions per page
+    'page_limit': 3,  # Max resident pages per process
+    'workload': None,
+}
+
+
+def expand_grid(grid, workloads=None, seed=0):
+    """
+    Every combination of the grid values as a list of configurations.
+    `workloads` maps workload names to program lists, a program is a path or a
+    (path, arrival_time[, options]) tuple. Each configuration gets the programs
+    of its workload and a seed derived from `seed` and its parameters.
+    """
+    unknown = set(grid) - set(DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters {', '.join(sorted(unknown))}, expected {', '.join(DEFAULTS)}")
+
+    keys = list(DEFAULTS)
+    values = [grid.get(key, [DEFAULTS[key]]) for key in keys]
+
+    configs = []
+    for combination in itertools.product(*values):
+        config = dict(zip(keys, combination))
+        if config['quantums'] is not None:
+            config['quantums'] = tuple(config['quantums'])
+        workload = config['workload']
+        if workloads is not None and workload not in workloads:
+            raise ValueError(f"Unknown workload {workload}")
+        config['programs'] = [normalize_program(program) for program in (workloads or {}).get(workload, [])]
+        config['seed'] = task_seed(config, seed)
+        configs.append(config)
+    return configs
+
+
+def normalize_program(program):
+    """ (path, arrival_time, options) from a path or a shorter tuple. """
+    if isinstance(program, str):
+        return (program, 0, {})
+    path, arrival_time, *options = program
+    return (path, arrival_time, options[0] if options else {})
+
+
+def task_seed(config, seed=0):
+    """ Deterministic 32 bit seed from the sweep seed and the configuration parameters. """
+    key = json.dumps({k: v for k, v in config.items() if k != 'seed'}, sort_keys=True, default=str)
+    return int(hashlib.sha256(f"{seed}:{key}".encode()).hexdigest()[:8], 16)
+
+
+def build_system(config):
+    """ A fresh System set up for one configuration, with its programs in the job queue. """
+    random.seed(config['seed'])
+    system = System()
+    system.scheduler.set_strategy(config['strategy'])
+    if config['quantums']:
+        system.scheduler.strategy.set_quantums(*config['quantums'])
+    if config['promote_at'] is not None:
+        system.scheduler.strategy.check_promote_at = config['promote_at']
+    system.memory_manager.set_page_size(config['page_size'])
+    system.memory_manager.set_page_limit(config['page_limit'])
+
+    for path, arrival_time, options in config['programs']:
+        system.prepare_program(path, arrival_time, **options)
+    return system
+
+
+def run_config(config):
+    """ Run one configuration, returns the configuration with its metrics. """
+    start = time.perf_counter()
+    system = build_system(config)
+    metrics = system.scheduler.schedule_jobs(plot=False)
+    metrics['page_faults'] = system.memory_manager.page_faults
+    return {'config': config,
+            'metrics': metrics,
+            'timeline': system.timeline.summary(),
+            'wall_time': time.perf_counter() - start}
+
+
+def run_sweep(configs, workers=None, store=None):
+    """
+    Run configurations in a process pool, yielding results as they complete.
+    `workers` defaults to the number of CPUs, with 1 everything runs in this
+    process, which is easier to debug. With a ResultStore, configurations
+    that were already run are yielded from the store and new results are
+    saved to it.
+    """
+    if store is not None:
+        pending = []
+        for config in configs:
+            result = store.get(config)
+            if result is None:
+                pending.append(config)
+            else:
+                yield result
+        configs = pending
+
+    for result in _run_configs(configs, workers):
+        if store is not None:
+            store.put(result)
+        yield result
+
+
+def _run_configs(configs, workers):
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(configs) <= 1:
+        for config in configs:
+            yield run_config(config)
+        return
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(configs))) as executor:
+        futures = [executor.submit(run_config, config) for config in configs]
+        for future in as_completed(futures):
+            yield future.result()
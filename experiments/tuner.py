@@ -0,0 +1,166 @@
+"""
+Adaptive search for MLFQ parameters.
+
+Instead of simulating every point of a (Q1, Q2, promotion threshold) grid,
+the tuner does a coordinate descent: from the middle of the search space it
+tries a step up and down along each axis, moves to the best point, and halves
+the steps once no move improves the objective. It stops when the steps are
+down to 1 with nothing better around, or when the evaluation budget is spent.
+
+    python -m experiments.tuner programs/cpubound2.osx programs/IO.osx --objective p99_turnaround
+"""
+import argparse
+from statistics import mean
+
+try:
+    from .sweep import expand_grid, run_sweep
+    from .results import MAXIMIZE, ResultStore
+except ImportError:
+    from sweep import expand_grid, run_sweep
+    from results import MAXIMIZE, ResultStore
+
+# Parameter ranges searched by default, both ends included
+SEARCH_SPACE = {
+    'q1': (2, 64),
+    'q2': (4, 256),
+    'promote_at': (2, 10),
+}
+
+
+class QuantumTuner:
+    """
+    Coordinate descent over Q1, Q2 and the MLFQ promotion threshold.
+    `objective` is any key of the scheduler metrics, e.g. avg_wait_time,
+    p99_turnaround or throughput, it is maximized for the metrics in MAXIMIZE
+    and minimized otherwise. Each point is scored by its mean over `seeds`.
+    """
+    def __init__(self, programs, objective='avg_wait_time', search_space=None, seeds=(0,),
+                 max_evaluations=60, workers=None, store=None):
+        self.workloads = {'tuning': programs}
+        self.objective = objective
+        self.search_space = dict(search_space or SEARCH_SPACE)
+        self.axes = list(self.search_space)
+        self.seeds = seeds
+        self.max_evaluations = max_evaluations
+        self.workers = workers
+        self.store = store
+
+        self.scores = {}  # point -> score, every point is only simulated once
+        self.trace = []  # (evaluation, point, score, best score)
+        self.best_point = None
+        self.best_score = None
+
+    @property
+    def maximize(self):
+        return self.objective in MAXIMIZE
+
+    def better(self, score, other):
+        if other is None:
+            return True
+        return score > other if self.maximize else score < other
+
+    def grid_size(self):
+        """ Points a dense grid over the same space would simulate. """
+        size = 1
+        for low, high in self.search_space.values():
+            size *= high - low + 1
+        return size
+
+    def configs(self, point):
+        params = dict(zip(self.axes, point))
+        configs = []
+        for seed in self.seeds:
+            configs += expand_grid({'strategy': ['MLFQ'],
+                                    'quantums': [(params['q1'], params['q2'])],
+                                    'promote_at': [params['promote_at']],
+                                    'workload': ['tuning']}, self.workloads, seed)
+        return configs
+
+    def evaluate(self, points):
+        """ Score new points, all their runs go to the process pool together. """
+        points = [point for point in dict.fromkeys(points) if point not in self.scores]
+        points = points[:max(0, self.max_evaluations - len(self.scores))]
+        if not points:
+            return
+
+        configs = {}
+        for point in points:
+            for config in self.configs(point):
+                configs[config['seed']] = (point, config)
+
+        values = {point: [] for point in points}
+        for result in run_sweep([config for _, config in configs.values()], self.workers, self.store):
+            point, _ = configs[result['config']['seed']]
+            values[point].append(result['metrics'][self.objective])
+
+        # Points are recorded in a fixed order so the trace doesn't depend on completion order
+        for point in points:
+            score = mean(values[point])
+            self.scores[point] = score
+            if self.better(score, self.best_score):
+                self.best_point, self.best_score = point, score
+            self.trace.append((len(self.scores), dict(zip(self.axes, point)), score, self.best_score))
+
+    def neighbours(self, point, axis, step):
+        index = self.axes.index(axis)
+        low, high = self.search_space[axis]
+        neighbours = []
+        for value in (point[index] - step, point[index] + step):
+            value = min(high, max(low, value))
+            if value != point[index]:
+                neighbours.append(point[:index] + (value,) + point[index + 1:])
+        return neighbours
+
+    def tune(self):
+        point = tuple((low + high) // 2 for low, high in self.search_space.values())
+        steps = {axis: max(1, (high - low) // 4) for axis, (low, high) in self.search_space.items()}
+        self.evaluate([point])
+
+        while len(self.scores) < self.max_evaluations:
+            improved = False
+            for axis in self.axes:
+                self.evaluate(self.neighbours(self.best_point, axis, steps[axis]))
+                if self.best_point != point:
+                    point = self.best_point
+                    improved = True
+
+            if not improved:
+                if all(step == 1 for step in steps.values()):
+                    break  # Converged, no neighbour is better
+                steps = {axis: max(1, step // 2) for axis, step in steps.items()}
+
+        return self.report()
+
+    def report(self):
+        return {'objective': self.objective,
+                'best': dict(zip(self.axes, self.best_point)),
+                'score': self.best_score,
+                'evaluations': len(self.scores),
+                'grid_size': self.grid_size(),
+                'trace': self.trace}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tune MLFQ quantums and promotion threshold for a workload")
+    parser.add_argument('programs', nargs='+', help="Program paths, all arrive at time 0")
+    parser.add_argument('--objective', default='avg_wait_time')
+    parser.add_argument('--seeds', type=int, default=1, help="Seeds to average each point over")
+    parser.add_argument('--budget', type=int, default=60, help="Maximum number of points to simulate")
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--db', help="Optional results database, see experiments.results")
+    args = parser.parse_args(argv)
+
+    store = ResultStore(args.db) if args.db else None
+
+    tuner = QuantumTuner(args.programs, args.objective, seeds=tuple(range(args.seeds)),
+                         max_evaluations=args.budget, workers=args.workers, store=store)
+    report = tuner.tune()
+
+    for evaluation, params, score, best in report['trace']:
+        print(f"{evaluation:3} {params} {args.objective}={score:.2f} best={best:.2f}")
+    print(f"\nBest {report['best']} {args.objective}={report['score']:.2f} "
+          f"after {report['evaluations']} of {report['grid_size']} grid points")
+
+
+if __name__ == '__main__':
+    main()
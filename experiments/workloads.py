@@ -0,0 +1,79 @@
+"""
+Guest workload corpus in programs/workloads/.
+
+Each workload is one or more .osx programs (assembled from the .asm next to
+them) with the R0 every process ends with and the instructions it executes,
+listed in workloads.json. Results are checksums computed by the programs
+themselves, so they only match if loads and stores survive paging.
+An instruction count of null depends on the schedule, e.g. a consumer
+spinning on an empty buffer.
+
+    from experiments.workloads import run_workload, check_workload
+    system = run_workload('matmul', strategy='RR', page_limit=2)
+    check_workload('matmul', system)  # [] when everything matches
+
+corpus_workloads() gives the workloads in the form expand_grid takes.
+"""
+import io
+import os
+import sys
+import json
+import random
+import contextlib
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from System.System import System
+
+CORPUS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'programs', 'workloads'))
+
+
+def load_corpus():
+    """ {name: workload} from workloads.json, with the absolute program paths under 'paths'. """
+    with open(os.path.join(CORPUS_DIR, 'workloads.json')) as f:
+        corpus = json.load(f)
+    for workload in corpus.values():
+        workload['paths'] = [os.path.join(CORPUS_DIR, program) for program in workload['programs']]
+    return corpus
+
+
+def corpus_workloads(names=None, skipped=False):
+    """ {name: [program paths]} for expand_grid, without the workloads marked skip unless `skipped`. """
+    corpus = load_corpus()
+    return {name: workload['paths'] for name, workload in corpus.items()
+            if (names is None or name in names) and (skipped or 'skip' not in workload)}
+
+
+def run_workload(name, strategy='FCFS', page_limit=None, page_size=None, seed=0):
+    """ Run a workload to completion, all programs arriving at time 0, and return the System. """
+    workload = load_corpus()[name]
+    random.seed(seed)
+    system = System()
+    system.scheduler.set_strategy(strategy)
+    if page_size:
+        system.memory_manager.set_page_size(page_size)
+    if page_limit:
+        system.memory_manager.set_page_limit(page_limit)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        for path in workload['paths']:
+            system.prepare_program(path, 0)
+        system.scheduler.schedule_jobs(plot=False)
+    return system
+
+
+def check_workload(name, system):
+    """ Differences between a finished run and the expected results, as readable strings. """
+    workload = load_corpus()[name]
+    processes = sorted(system.terminated_queue, key=lambda pcb: pcb.pid)
+    expected = workload.get('processes', len(workload['programs']))
+    if len(processes) != expected:
+        return [f"{len(processes)} processes terminated, expected {expected}"]
+
+    differences = []
+    for pcb, result, instructions in zip(processes, workload['results'], workload['instructions']):
+        if pcb.registers[0] != result:
+            differences.append(f"PID {pcb.pid} ({pcb.file}) ended with R0 = {pcb.registers[0]}, expected {result}")
+        if instructions is not None and pcb.execution_time != instructions:
+            differences.append(f"PID {pcb.pid} ({pcb.file}) executed {pcb.execution_time} instructions, "
+                               f"expected {instructions}")
+    return differences
@@ -67,10 +67,11 @@ class CPU:
 
 
     
-    def run_program(self, pcb, quantum, memory_manager, verbose=False):
+    def run_program(self, pcb, memory_manager, verbose=False):
         """
-            Run a program in the CPU. It fetches, decodes, and executes instructions.
-            It also handles system calls and preemption.
+            Run a program in the CPU. It fetches, decodes, and executes instructions
+            until the program makes a system call that gives up the CPU, or until the
+            clock reaches the deadline the kernel armed on the timer.
         """
         self.pcb = pcb
         self.memory_manager = memory_manager
@@ -78,12 +79,13 @@ class CPU:
         self.registers[self.pc] = pcb.pc
 
         self.running = True
-        time_slice = 0
 
+        # Run uninterrupted for the ticks left on the timer, the loop only ends
+        # early at the end of the code or when a system call stops the CPU
+        for _ in range(self.system.timer.remaining()):
+            if not self.running or self.registers[self.pc] >= pcb['code_end']:
+                break
 
-        # Run the program until the end of the code, until a system call is made,
-        # or until the time slice is reached
-        while self.running and self.registers[self.pc] < pcb['code_end']:
             # Fetch the instruction from memory
             instruction = self._fetch() 
 
@@ -93,8 +95,7 @@ class CPU:
             # Execute the instruction
             self._execute(opcode, operands, pcb)
 
-            # Increment the time slice, clock and execution time
-            time_slice += 1
+            # Increment the clock and execution time
             self.system.clock.increment()
             pcb.execution_time += 1
 
@@ -104,14 +105,10 @@ class CPU:
                 print("End of memory reached")
                 self.verbose = False
                 break
-                
-
-            # Check if the time slice has reached the quantum
-            # if so, preempt the process and return to the ready queue
-            if time_slice == quantum and self.running :
-                self.preempt(pcb)
-                
-
+        else:
+            # The clock reached the timer deadline
+            if self.running:
+                self.timer_interrupt(pcb)
 
     def _execute(self, opcode, operands, pcb):
         """ 
@@ -134,18 +131,17 @@ class CPU:
             self.running = False
             return False
         
-    def preempt(self, pcb):
+    def timer_interrupt(self, pcb):
         """
-            Preempt the process and return it to the ready queue.
+            Save the state of the registers to the PCB and return to the kernel,
+            which decides whether the process keeps the CPU.
         """
         # Copy state of the registers to the PCB
         pcb.registers = self.registers.copy()
         # Mark the PC in the PCB, so it can be resumed later
         pcb.pc = self.registers[self.pc]
-        pcb.preempt_count += 1
         self.verbose = False
         self.running = False
-        pcb.ready(self.system.clock.time)
 
     
 
@@ -211,19 +207,31 @@ class CPU:
             return
         
         elif swi == 12: # WAIT
-            self.system.wait(pcb)
+            pcb.registers = self.registers.copy()
+            pcb.pc = self.registers[self.pc]
+            if self.system.wait(pcb): # Blocked until the children exit
+                self.verbose = False
+                self.running = False
+                return
             return True
+
+        elif swi == 13: # NICE, set nice value to R0 (signed)
+            nice = struct.unpack('<i', struct.pack('<I', self.registers[0] & 0xFFFFFFFF))[0]
+            pcb.set_nice(nice)
+            if self.verbose:
+                print(f"\tNice set to {pcb.nice}")
         
         elif swi == 30:  # PRODUCE
             value = self.registers[0]
-            buffer = self.system.shared_memory['shared1']
+            buffer = self.system.shared_memory.setdefault('shared1', [])
             buffer.append(value)
             print("Produce... value: ", value)
 
-        elif swi == 31:  # CONSUME
-            buffer = self.system.shared_memory['shared1']
+        elif swi == 31:  # CONSUME, into R0
+            buffer = self.system.shared_memory.setdefault('shared1', [])
             if buffer:
                 value = buffer.pop(0)
+                self.registers[0] = value
                 print("  - Consume... value: ", value)
             else:
                 print('Buffer empty - retrying...')
@@ -337,7 +345,7 @@ class CPU:
         """    
         source_register, addess_register, *rest = operands
         virtual_address = self.registers[addess_register]
-        physical_address = self.translate(virtual_address)
+        physical_address = self.translate(virtual_address, write=True)
         value = self.registers[source_register]
         self.memory[physical_address:physical_address+4] = struct.pack('<I', value)
         if self.verbose:
@@ -352,7 +360,7 @@ class CPU:
         """    
         source_register, addess_register, *rest = operands
         virtual_address = self.registers[addess_register]
-        physical_address = self.translate(virtual_address)
+        physical_address = self.translate(virtual_address, write=True)
         value = self.memory[self.registers[source_register]]
         self.memory[physical_address] = value & 0xFF
         if self.verbose:
@@ -391,8 +399,7 @@ class CPU:
             Branch to address
         """
         address_bytes = operands[0:4]
-        offset = struct.unpack('<I', bytes(address_bytes))[0]
-        address = self.pcb.code_start + offset
+        address = struct.unpack('<I', bytes(address_bytes))[0]
         self.setPC(address)
         if self.verbose:
             print(f" - B {address}")
@@ -436,8 +443,7 @@ class CPU:
             Jump to label if Z register is greater than zero
         """
         address_bytes = operands[0:4]
-        offset = struct.unpack('<I', bytes(address_bytes))[0]
-        address = self.pcb.code_start + offset
+        address = struct.unpack('<I', bytes(address_bytes))[0]
         if self.registers[self.z] > 0:
             self.setPC(address)
             if self.verbose:
@@ -448,8 +454,7 @@ class CPU:
             Jump to label if Z register is less than zero
         """
         address_bytes = operands[0:4]
-        offset = struct.unpack('<I', bytes(address_bytes))[0]
-        address = self.pcb.code_start + offset
+        address = struct.unpack('<I', bytes(address_bytes))[0]
         if self.registers[self.z] < 0:
             self.setPC(address)
             if self.verbose:
@@ -539,11 +544,12 @@ class CPU:
         self.registers[self.pc] += 6
         return instruction
     
-    def translate(self, virtual_address):
+    def translate(self, virtual_address, write=False):
         """
             Translate a virtual address to a physical address using the memory manager.
+            Stores set `write` so the page is marked dirty.
         """
-        return self.memory_manager.translate(self.pcb, virtual_address)
+        return self.memory_manager.translate(self.pcb, virtual_address, write)
 
     def setPC(self, value):
         self.registers[self.pc] = value
@@ -0,0 +1,37 @@
+class Timer:
+    """A programmable one-shot timer.
+    The kernel arms it with an absolute clock time, the CPU runs until the clock
+    reaches that time and then raises a timer interrupt.
+    """
+    # Deadline used when the timer is not armed, long enough to never fire
+    NEVER = 1_000_000
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.deadline = None
+
+    def __str__(self):
+        return f"Timer(deadline={self.deadline})"
+
+    def arm(self, deadline):
+        """ Fire when the clock reaches the absolute time `deadline`. """
+        self.deadline = deadline
+
+    def arm_in(self, ticks):
+        """ Fire `ticks` clock ticks from now. """
+        self.deadline = self.clock.time + ticks
+
+    def disarm(self):
+        self.deadline = None
+
+    def remaining(self):
+        """ Ticks until the timer fires. """
+        if self.deadline is None:
+            return self.NEVER
+        return max(0, self.deadline - self.clock.time)
+
+    def expired(self):
+        return self.deadline is not None and self.clock.time >= self.deadline
+
+    def reset(self):
+        self.deadline = None
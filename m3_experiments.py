@@ -1,10 +1,11 @@
-from System import System
+import os
+from experiments import expand_grid, run_sweep, ResultStore
 import numpy as np
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
 from scipy.interpolate import griddata
 import datetime
-from ProgramCreator import ProgramCreator
+from experiments.generator import WorkloadGenerator
 
 
 def main():
@@ -13,74 +14,73 @@ def main():
     quantum_1s = [10, 20, 30]
     quantum_ratios = [2, 3, 4]
 
-    ProgramCreator().run()
-
-
-
-    for s in size:
-        for p in prog_type:
-            results = {
-                "waiting_time": [],
-                "turnaround_time": [],
-                "throughput": [],
-                "response_time": [],
-                "quantum_1": [],
-                "quantum_2": []
-            }
-            best_configs = {
-                'min_waiting_time': {"value": float("inf"), "config": None},
-                'min_turnaround_time': {"value": float("inf"), "config": None},
-                # 'max_throughput': {"value": float("-inf"), "config": None},
-                'min_response_time': {"value": float("inf"), "config": None},
-            }
-            for quantum_1 in quantum_1s:
-                for ratio in quantum_ratios:
-                    quantum_2 = quantum_1 * ratio
-                    system = System()
-                    system.scheduler.set_strategy('MLFQ')
-                    system.Q1.set_quantum(quantum_1)
-                    system.Q2.set_quantum(quantum_2)
-                    
-
-                    programs = [
-                        f"programs/milestone_3/{s}-{p}-1.osx",
-                        f"programs/milestone_3/{s}-{p}-2.osx",
-                        f"programs/milestone_3/{s}-{p}-3.osx",
-                    ]
-
-                    for program in programs:
-                        system.prepare_program(program, 0)
-                    metrics = system.scheduler.schedule_jobs()
-                    results["waiting_time"].append(metrics["avg_wait_time"])
-                    results["turnaround_time"].append(metrics["avg_turnaround"])
-                    results["throughput"].append(metrics["throughput"])
-                    results["response_time"].append(metrics["avg_response_time"])
-                    results["quantum_1"].append(quantum_1)
-                    results["quantum_2"].append(quantum_2)
-
-
-                    if metrics['avg_wait_time'] < best_configs['min_waiting_time']['value']:
-                        best_configs['min_waiting_time'] = {'value': metrics['avg_wait_time'], 'config': {'quantum_1': quantum_1, 'quantum_2': quantum_2}}
-
-                    if metrics['avg_turnaround'] < best_configs['min_turnaround_time']['value']:
-                        best_configs['min_turnaround_time'] = {'value': metrics['avg_turnaround'], 'config': {'quantum_1': quantum_1, 'quantum_2': quantum_2}}
-
-                    # if metrics['throughput'] > best_configs['max_throughput']['value']:
-                    #     best_configs['max_throughput'] = {'value': metrics['throughput'], 'config': {'quantum_1': quantum_1, 'quantum_2': quantum_2}}
-
-                    if metrics['avg_response_time'] < best_configs['min_response_time']['value']:
-                        best_configs['min_response_time'] = {'value': metrics['avg_response_time'], 'config': {'quantum_1': quantum_1, 'quantum_2': quantum_2}}
-
-                    
-                    with open(f'charts/{s}/{p}/BestConfig.txt', 'w') as f:
-                        f.write(f"Best Configurations for {s}-{p}\n")
-                        f.write(f"Min Waiting Time: {best_configs['min_waiting_time']['value']} - ({best_configs['min_waiting_time']['config']['quantum_1']}, {best_configs['min_waiting_time']['config']['quantum_2']})\n")
-                        f.write(f"Min Turnaround Time: {best_configs['min_turnaround_time']['value']} - ({best_configs['min_turnaround_time']['config']['quantum_1']}, {best_configs['min_turnaround_time']['config']['quantum_2']})\n")
-                        # f.write(f"Max Throughput: {best_configs['max_throughput']['value']} - ({best_configs['max_throughput']['config']['quantum_1']}, {best_configs['max_throughput']['config']['quantum_2']})\n")
-                        f.write(f"Min Response Time: {best_configs['min_response_time']['value']} - ({best_configs['min_response_time']['config']['quantum_1']}, {best_configs['min_response_time']['config']['quantum_2']})\n")
-
-            if len(quantum_1s) > 1:
-                plot_3d_graph(results, s, p)
+    # Same programs as ProgramCreator, packed directly instead of assembled with osx:
+    # runs of ADD R0 R0 R1 with SWI 21 at 10% (CPU) or 50% (IO) of the lines
+    lines = {'S': 20, 'M': 500, 'L': 2000}
+    io_ratios = {'CPU': 0.1, 'IO': 0.5}
+    workloads = {
+        f"{s}-{p}": WorkloadGenerator(length=lines[s] - 3, io_ratio=io_ratios[p], io_call=21,
+                                      name=f"{s}-{p}", seed=seed).write("programs/milestone_3", 3)
+        for seed, (s, p) in enumerate((s, p) for s in size for p in prog_type)
+    }
+    grid = {
+        'strategy': ['MLFQ'],
+        'quantums': [(quantum_1, quantum_1 * ratio) for quantum_1 in quantum_1s for ratio in quantum_ratios],
+        'workload': list(workloads),
+    }
+
+    # Every configuration runs in parallel, results come back in completion order
+    all_results = {workload: [] for workload in workloads}
+    # Configurations already in results.db are not simulated again
+    store = ResultStore('results.db')
+    for result in run_sweep(expand_grid(grid, workloads), store=store):
+        all_results[result['config']['workload']].append(result)
+
+    for workload, workload_results in all_results.items():
+        s, p = workload.split('-')
+        workload_results.sort(key=lambda result: result['config']['quantums'])
+        results = {
+            "waiting_time": [],
+            "turnaround_time": [],
+            "throughput": [],
+            "response_time": [],
+            "quantum_1": [],
+            "quantum_2": []
+        }
+        best_configs = {
+            'min_waiting_time': {"value": float("inf"), "config": None},
+            'min_turnaround_time': {"value": float("inf"), "config": None},
+            'min_response_time': {"value": float("inf"), "config": None},
+        }
+        for result in workload_results:
+            metrics = result['metrics']
+            quantum_1, quantum_2 = result['config']['quantums']
+            results["waiting_time"].append(metrics["avg_wait_time"])
+            results["turnaround_time"].append(metrics["avg_turnaround"])
+            results["throughput"].append(metrics["throughput"])
+            results["response_time"].append(metrics["avg_response_time"])
+            results["quantum_1"].append(quantum_1)
+            results["quantum_2"].append(quantum_2)
+
+            config = {'quantum_1': quantum_1, 'quantum_2': quantum_2}
+            if metrics['avg_wait_time'] < best_configs['min_waiting_time']['value']:
+                best_configs['min_waiting_time'] = {'value': metrics['avg_wait_time'], 'config': config}
+
+            if metrics['avg_turnaround'] < best_configs['min_turnaround_time']['value']:
+                best_configs['min_turnaround_time'] = {'value': metrics['avg_turnaround'], 'config': config}
+
+            if metrics['avg_response_time'] < best_configs['min_response_time']['value']:
+                best_configs['min_response_time'] = {'value': metrics['avg_response_time'], 'config': config}
+
+        os.makedirs(f'charts/{s}/{p}', exist_ok=True)
+        with open(f'charts/{s}/{p}/BestConfig.txt', 'w') as f:
+            f.write(f"Best Configurations for {s}-{p}\n")
+            f.write(f"Min Waiting Time: {best_configs['min_waiting_time']['value']} - ({best_configs['min_waiting_time']['config']['quantum_1']}, {best_configs['min_waiting_time']['config']['quantum_2']})\n")
+            f.write(f"Min Turnaround Time: {best_configs['min_turnaround_time']['value']} - ({best_configs['min_turnaround_time']['config']['quantum_1']}, {best_configs['min_turnaround_time']['config']['quantum_2']})\n")
+            f.write(f"Min Response Time: {best_configs['min_response_time']['value']} - ({best_configs['min_response_time']['config']['quantum_1']}, {best_configs['min_response_time']['config']['quantum_2']})\n")
+
+        if len(quantum_1s) > 1:
+            plot_3d_graph(results, s, p)
     print("========== DONE ==========")
 
 
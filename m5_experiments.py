@@ -1,4 +1,4 @@
-from System import System
+from experiments.fault_curves import record_references, fault_surface
 import numpy as np
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
@@ -9,25 +9,23 @@ import datetime
 def main():
     page_numbers = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
 
-
     results = {
             "page_numbers": [],
             "page_sizes": [],
             "page_faults": [],
+            "opt_page_faults": [],
     }
 
-    for s in page_numbers:
-        for n in page_numbers:
-            system = System()
-            system.set_page_number(n)
-            system.set_page_size(s)
-            for filepath in ['p10.osx', 'p11.osx', 'p12.osx']:
-                system.handle_load(filepath)
-                system.run_program(filepath)
-            page_faults = system.memory_manager.page_faults
-            results["page_numbers"].append(n)
-            results["page_sizes"].append(s)
-            results["page_faults"].append(page_faults)
+    # One run records the reference string, the LRU and OPT faults of every
+    # (page size, page limit) pair are computed from it
+    references = record_references(['programs/p10.osx', 'programs/p11.osx', 'programs/p12.osx'])
+    surface = fault_surface(references, page_numbers, page_numbers)
+
+    for (s, n), faults in surface.items():
+        results["page_numbers"].append(n)
+        results["page_sizes"].append(s)
+        results["page_faults"].append(faults['lru'])
+        results["opt_page_faults"].append(faults['opt'])
 
     return results
 
@@ -43,7 +41,7 @@ def plot_results(results):
 
     ax.set_xlabel('Page Limit (Max Resident Pages)')
     ax.set_ylabel('Page Size (Instructions/Page)')
-    ax.set_zlabel('Page Faults')
+    ax.set_zlabel('Page Faults (LRU)')
     ax.set_title('Page Faults vs Page Limit and Page Size')
 
     plt.tight_layout()
@@ -0,0 +1,69 @@
+; Bubble sort of 16 words in place, ascending.
+; Every pass compares neighbours across the whole unsorted part, the
+; array spans 3 pages and is rewritten on most passes.
+; R0 = sum of (i + 1) * a[i] over the sorted array.
+
+DATA    .WORD 42 ; a[0]
+        .WORD 7 ; a[1]
+        .WORD 93 ; a[2]
+        .WORD 15 ; a[3]
+        .WORD 61 ; a[4]
+        .WORD 28 ; a[5]
+        .WORD 84 ; a[6]
+        .WORD 3 ; a[7]
+        .WORD 70 ; a[8]
+        .WORD 36 ; a[9]
+        .WORD 99 ; a[10]
+        .WORD 11 ; a[11]
+        .WORD 57 ; a[12]
+        .WORD 24 ; a[13]
+        .WORD 88 ; a[14]
+        .WORD 50 ; a[15]
+        .SPACE 2 ; code starts on an instruction boundary
+
+START   MVI R1 15 ; last index of the unsorted part
+
+OUTER   ADR R3 DATA ; &a[0]
+        MVI R2 0 ; i = 0
+
+INNER   LDR R4 [R3] ; a[i]
+        MVI R0 4 ;
+        ADD R7 R3 R0 ; &a[i + 1]
+        LDR R5 [R7] ; a[i + 1]
+        CMP R5 R4 ;
+        BLT SWAP ; a[i + 1] < a[i]
+        B NEXT ;
+
+SWAP    STR R5 [R3] ; a[i] = a[i + 1]
+        STR R4 [R7] ; a[i + 1] = old a[i]
+
+NEXT    MOV R3 R7 ; &a[i + 1]
+        MVI R0 1 ;
+        ADD R2 R2 R0 ; i++
+        CMP R2 R1 ;
+        BLT INNER ; while i < last
+
+        MVI R0 1 ;
+        SUB R1 R1 R0 ; last--
+        MVI R0 0 ;
+        CMP R0 R1 ;
+        BLT OUTER ; while last > 0
+
+        ADR R8 DATA ; checksum of the sorted array
+        MVI R1 0 ; index
+        MVI R4 0 ; checksum
+        MVI R5 1 ;
+        MVI R3 16 ; elements
+
+SUM     LDR R0 [R8] ;
+        ADD R1 R1 R5 ; index + 1
+        MUL R0 R0 R1 ;
+        ADD R4 R4 R0 ; checksum += (index + 1) * a[index]
+        MVI R0 4 ;
+        ADD R8 R8 R0 ;
+        CMP R1 R3 ;
+        BLT SUM ; while index < 16
+
+        MOV R0 R4 ;
+        SWI 2 ; print the checksum
+        SWI 1 ;
@@ -0,0 +1,20 @@
+; Consumer half of a pipeline, run with producer.osx, the items go
+; through the 'shared1' shared memory buffer.
+; Consumes 20 items and sums them. SWI 31 spins while the buffer is
+; empty, so the instructions executed depend on the schedule.
+; R0 = 210, the sum of the items 1 to 20.
+
+START   MVI R1 0 ; items consumed
+        MVI R2 20 ; items to consume
+        MVI R3 1 ;
+        MVI R4 0 ; sum
+
+LOOP    SWI 31 ; consume into R0, waits for an item
+        ADD R4 R4 R0 ; sum += item
+        ADD R1 R1 R3 ; consumed++
+        CMP R1 R2 ;
+        BLT LOOP ; while consumed < 20
+
+        MOV R0 R4 ;
+        SWI 2 ; print the sum
+        SWI 1 ;
@@ -0,0 +1,21 @@
+; Fork tree: two levels of SWI 10 give 4 processes, every process then
+; runs a 10 iteration loop and waits for its children.
+; Each process ends with R0 = 2 * (0 + 1 + ... + 9) = 90.
+
+START   SWI 10 ; fork, 2 processes
+        SWI 10 ; fork, 4 processes
+
+        MVI R1 0 ; i = 0
+        MVI R2 10 ; iterations
+        MVI R3 1 ;
+        MVI R4 0 ; sum
+
+LOOP    ADD R4 R4 R1 ; sum += i
+        ADD R4 R4 R1 ; sum += i
+        ADD R1 R1 R3 ; i++
+        CMP R1 R2 ;
+        BLT LOOP ; while i < 10
+
+        SWI 12 ; wait for the children
+        MOV R0 R4 ;
+        SWI 1 ;
@@ -0,0 +1,73 @@
+; Insertion sort of 16 words in place, ascending.
+; Each key is shifted left over the larger elements before it, so the
+; accesses walk backwards from the key towards the start of the array.
+; R0 = sum of (i + 1) * a[i] over the sorted array.
+
+DATA    .WORD 88 ; a[0]
+        .WORD 3 ; a[1]
+        .WORD 57 ; a[2]
+        .WORD 99 ; a[3]
+        .WORD 24 ; a[4]
+        .WORD 70 ; a[5]
+        .WORD 7 ; a[6]
+        .WORD 50 ; a[7]
+        .WORD 42 ; a[8]
+        .WORD 11 ; a[9]
+        .WORD 93 ; a[10]
+        .WORD 36 ; a[11]
+        .WORD 15 ; a[12]
+        .WORD 61 ; a[13]
+        .WORD 84 ; a[14]
+        .WORD 28 ; a[15]
+        .SPACE 2 ; code starts on an instruction boundary
+
+START   MVI R1 1 ; i = 1
+        ADR R6 DATA ; &a[0]
+        MVI R0 4 ;
+        ADD R2 R6 R0 ; &a[i]
+
+OUTER   LDR R4 [R2] ; key = a[i]
+        MOV R3 R2 ; slot for the key
+
+INNER   CMP R6 R3 ;
+        BLT CHECK ; slot > &a[0], look at the element before it
+        B PLACE ;
+
+CHECK   MVI R0 4 ;
+        SUB R7 R3 R0 ; &a[slot - 1]
+        LDR R5 [R7] ; a[slot - 1]
+        CMP R4 R5 ;
+        BLT SHIFT ; a[slot - 1] > key
+        B PLACE ;
+
+SHIFT   STR R5 [R3] ; a[slot] = a[slot - 1]
+        MOV R3 R7 ; slot--
+        B INNER ;
+
+PLACE   STR R4 [R3] ; a[slot] = key
+        MVI R0 4 ;
+        ADD R2 R2 R0 ; &a[i + 1]
+        MVI R0 1 ;
+        ADD R1 R1 R0 ; i++
+        MVI R0 16 ;
+        CMP R1 R0 ;
+        BLT OUTER ; while i < 16
+
+        ADR R8 DATA ; checksum of the sorted array
+        MVI R1 0 ; index
+        MVI R4 0 ; checksum
+        MVI R5 1 ;
+        MVI R3 16 ; elements
+
+SUM     LDR R0 [R8] ;
+        ADD R1 R1 R5 ; index + 1
+        MUL R0 R0 R1 ;
+        ADD R4 R4 R0 ; checksum += (index + 1) * a[index]
+        MVI R0 4 ;
+        ADD R8 R8 R0 ;
+        CMP R1 R3 ;
+        BLT SUM ; while index < 16
+
+        MOV R0 R4 ;
+        SWI 2 ; print the checksum
+        SWI 1 ;
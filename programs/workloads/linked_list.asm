@@ -0,0 +1,70 @@
+; Linked list traversal, pointer chasing over 16 nodes of (value, next).
+; The nodes are linked in a shuffled order so consecutive visits jump
+; between the 6 pages of the list. The list is walked 3 times.
+; A next address of 0 ends the list.
+; R0 = sum of n * value, n counting visited nodes from 1 over all walks.
+
+HEAD    .WORD 4 ; first node
+        .WORD 4 ; node 0 at 4, value
+        .WORD 76 ; node 0 next
+        .WORD 11 ; node 1 at 12, value
+        .WORD 100 ; node 1 next
+        .WORD 18 ; node 2 at 20, value
+        .WORD 84 ; node 2 next
+        .WORD 25 ; node 3 at 28, value
+        .WORD 116 ; node 3 next
+        .WORD 32 ; node 4 at 36, value
+        .WORD 108 ; node 4 next
+        .WORD 39 ; node 5 at 44, value
+        .WORD 124 ; node 5 next
+        .WORD 46 ; node 6 at 52, value
+        .WORD 92 ; node 6 next
+        .WORD 3 ; node 7 at 60, value
+        .WORD 0 ; node 7 next
+        .WORD 10 ; node 8 at 68, value
+        .WORD 20 ; node 8 next
+        .WORD 17 ; node 9 at 76, value
+        .WORD 28 ; node 9 next
+        .WORD 24 ; node 10 at 84, value
+        .WORD 36 ; node 10 next
+        .WORD 31 ; node 11 at 92, value
+        .WORD 12 ; node 11 next
+        .WORD 38 ; node 12 at 100, value
+        .WORD 44 ; node 12 next
+        .WORD 45 ; node 13 at 108, value
+        .WORD 60 ; node 13 next
+        .WORD 2 ; node 14 at 116, value
+        .WORD 52 ; node 14 next
+        .WORD 9 ; node 15 at 124, value
+        .WORD 68 ; node 15 next
+
+START   MVI R6 0 ; walks done
+        MVI R2 0 ; checksum
+        MVI R3 0 ; nodes visited
+        MVI R4 0 ; end of list
+        MVI R8 1 ;
+
+WALK    ADR R1 HEAD ;
+        LDR R1 [R1] ; node = head
+
+LOOP    CMP R1 R4 ;
+        BGT VISIT ; node != 0
+        B END_WALK ;
+
+VISIT   LDR R0 [R1] ; node value
+        ADD R3 R3 R8 ; visited++
+        MUL R0 R0 R3 ;
+        ADD R2 R2 R0 ; checksum += visited * value
+        MVI R0 4 ;
+        ADD R0 R1 R0 ; &node.next
+        LDR R1 [R0] ; node = node.next
+        B LOOP ;
+
+END_WALK        ADD R6 R6 R8 ; walks++
+                MVI R0 3 ;
+                CMP R6 R0 ;
+                BLT WALK ; while walks < 3
+
+        MOV R0 R2 ;
+        SWI 2 ; print the checksum
+        SWI 1 ;
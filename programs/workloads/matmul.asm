@@ -0,0 +1,102 @@
+; 4x4 integer matrix multiply C = A x B, row major words.
+; The inner loop walks a row of A and a column of B, so B is read with a
+; stride of one row (16 bytes) and the three matrices span 8 pages.
+; R0 = sum of (i + 1) * C[i] over the 16 elements of C, row major.
+
+MAT_A   .WORD 1 ; A[0][0]
+        .WORD 2 ; A[0][1]
+        .WORD 3 ; A[0][2]
+        .WORD 4 ; A[0][3]
+        .WORD 5 ; A[1][0]
+        .WORD 6 ; A[1][1]
+        .WORD 7 ; A[1][2]
+        .WORD 8 ; A[1][3]
+        .WORD 9 ; A[2][0]
+        .WORD 10 ; A[2][1]
+        .WORD 11 ; A[2][2]
+        .WORD 12 ; A[2][3]
+        .WORD 13 ; A[3][0]
+        .WORD 14 ; A[3][1]
+        .WORD 15 ; A[3][2]
+        .WORD 16 ; A[3][3]
+MAT_B   .WORD 2 ; B[0][0]
+        .WORD 0 ; B[0][1]
+        .WORD 1 ; B[0][2]
+        .WORD 3 ; B[0][3]
+        .WORD 1 ; B[1][0]
+        .WORD 4 ; B[1][1]
+        .WORD 0 ; B[1][2]
+        .WORD 2 ; B[1][3]
+        .WORD 3 ; B[2][0]
+        .WORD 1 ; B[2][1]
+        .WORD 2 ; B[2][2]
+        .WORD 0 ; B[2][3]
+        .WORD 0 ; B[3][0]
+        .WORD 2 ; B[3][1]
+        .WORD 3 ; B[3][2]
+        .WORD 1 ; B[3][3]
+MAT_C   .SPACE 64 ; 4x4 result
+
+START   MVI R1 0 ; i = 0
+        ADR R6 MAT_A ; row i of A
+        ADR R8 MAT_C ; next element of C
+
+ILOOP   MVI R2 0 ; j = 0
+
+JLOOP   MVI R3 0 ; k = 0
+        MVI R4 0 ; sum = 0
+        MOV R10 R6 ; A[i][0]
+        ADR R7 MAT_B ; B[0][0]
+        MVI R0 4 ; word size
+        MUL R0 R2 R0 ; j * 4
+        ADD R7 R7 R0 ; B[0][j]
+
+KLOOP   LDR R0 [R10] ; A[i][k]
+        LDR R5 [R7] ; B[k][j]
+        MUL R0 R0 R5 ;
+        ADD R4 R4 R0 ; sum += A[i][k] * B[k][j]
+        MVI R0 4 ; next column of A
+        ADD R10 R10 R0 ;
+        MVI R0 16 ; next row of B
+        ADD R7 R7 R0 ;
+        MVI R0 1 ;
+        ADD R3 R3 R0 ; k++
+        MVI R0 4 ;
+        CMP R3 R0 ;
+        BLT KLOOP ; while k < 4
+
+        STR R4 [R8] ; C[i][j] = sum
+        MVI R0 4 ;
+        ADD R8 R8 R0 ; next element of C
+        MVI R0 1 ;
+        ADD R2 R2 R0 ; j++
+        MVI R0 4 ;
+        CMP R2 R0 ;
+        BLT JLOOP ; while j < 4
+
+        MVI R0 16 ; next row of A
+        ADD R6 R6 R0 ;
+        MVI R0 1 ;
+        ADD R1 R1 R0 ; i++
+        MVI R0 4 ;
+        CMP R1 R0 ;
+        BLT ILOOP ; while i < 4
+
+        ADR R8 MAT_C ; checksum of C
+        MVI R1 0 ; index
+        MVI R4 0 ; checksum
+        MVI R5 1 ;
+        MVI R3 16 ; elements
+
+SUM     LDR R0 [R8] ;
+        ADD R1 R1 R5 ; index + 1
+        MUL R0 R0 R1 ;
+        ADD R4 R4 R0 ; checksum += (index + 1) * C[index]
+        MVI R0 4 ;
+        ADD R8 R8 R0 ;
+        CMP R1 R3 ;
+        BLT SUM ; while index < 16
+
+        MOV R0 R4 ;
+        SWI 2 ; print the checksum
+        SWI 1 ;
@@ -0,0 +1,25 @@
+; Alternating CPU and IO phases: 4 phases of a 25 iteration compute loop,
+; each followed by an IO request (SWI 20).
+; R0 = 4 * (0 + 1 + ... + 24) = 1200.
+
+START   MVI R1 0 ; phases done
+        MVI R4 0 ; sum
+        MVI R8 1 ;
+        MVI R6 4 ; phases
+
+PHASE   MVI R2 0 ; i = 0
+        MVI R3 25 ; iterations
+
+CALC    ADD R4 R4 R2 ; sum += i
+        ADD R2 R2 R8 ; i++
+        CMP R2 R3 ;
+        BLT CALC ; while i < 25
+
+        SWI 20 ; IO
+        ADD R1 R1 R8 ; phases++
+        CMP R1 R6 ;
+        BLT PHASE ; while phases < 4
+
+        MOV R0 R4 ;
+        SWI 2 ; print the sum
+        SWI 1 ;
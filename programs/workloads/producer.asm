@@ -0,0 +1,21 @@
+; Producer half of a pipeline, run with consumer.osx, the items go
+; through the 'shared1' shared memory buffer.
+; Produces 1 to 20, with a few instructions of work before each item and
+; the mutex held around every produce.
+; R0 = 20, the last item produced.
+
+START   MVI R1 0 ; item
+        MVI R2 20 ; items to produce
+        MVI R3 1 ;
+
+LOOP    ADD R1 R1 R3 ; next item
+        MUL R4 R1 R1 ; work on the item
+        SUB R4 R4 R1 ;
+        SWI 33 ; mutex wait
+        MOV R0 R1 ;
+        SWI 30 ; produce R0
+        SWI 34 ; mutex signal
+        CMP R1 R2 ;
+        BLT LOOP ; while item < 20
+
+        SWI 1 ;
@@ -0,0 +1,10 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from Assembler import assemble
+
+
+def program(value=0, padding=0, loader=0):
+    """ .osx image of MVI R0 value ; MVI R1 1 ; `padding` x ADD R0 R0 R1 ; SWI 1, compiled to load at `loader`. """
+    source = f"MVI R0 {value} ;\nMVI R1 1 ;\n" + "ADD R0 R0 R1 ;\n" * padding + "SWI 1 ;\n"
+    return assemble(source, loader)
@@ -0,0 +1,66 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from System.System import System
+from constants import PCBState
+from tests.helpers import program
+
+
+class TestAdmission(unittest.TestCase):
+    def setUp(self):
+        self.system = System()
+        self.system.scheduler.set_strategy('RR')
+        self.memory_manager = self.system.memory_manager
+
+    def test_same_load_address_runs_together(self):
+        first = self.system.prepare_program('first.osx', 0, image=program(1, loader=100))
+        second = self.system.prepare_program('second.osx', 0, image=program(2, loader=100))
+        self.system.scheduler.check_new_jobs()
+        self.assertEqual(self.system.job_queue, [])
+        self.assertEqual(set(self.memory_manager.reservations), {first.pid, second.pid})
+
+        self.system.scheduler.schedule_jobs(plot=False)
+        self.assertEqual([pcb.registers[0] for pcb in (first, second)], [1, 2])
+
+    def test_admission_limited_by_frames(self):
+        # 42 frames of 24 bytes, 4 page programs reserve 2 frames each
+        self.assertEqual(self.memory_manager.num_frames, 42)
+        for i in range(30):
+            self.system.prepare_program(f"p{i}.osx", 0, image=program(i, padding=12))
+        self.system.scheduler.check_new_jobs()
+        self.assertEqual(len(self.memory_manager.reservations), 21)
+        self.assertEqual(len(self.system.job_queue), 9)
+
+        self.system.scheduler.schedule_jobs(plot=False)
+        self.assertEqual(sorted(pcb.registers[0] for pcb in self.system.terminated_queue),
+                         [i + 12 for i in range(30)])
+        self.assertEqual(self.memory_manager.reservations, {})
+        self.assertEqual(len(self.memory_manager.free_frames), 42)
+
+    def test_min_resident_pages(self):
+        self.memory_manager.set_min_resident_pages(1)
+        for i in range(50):
+            self.system.prepare_program(f"p{i}.osx", 0, image=program(i, padding=12))
+        self.system.scheduler.check_new_jobs()
+        self.assertEqual(len(self.memory_manager.reservations), 42)
+        self.assertFalse(self.memory_manager.set_min_resident_pages(0))
+
+    def test_exit_frees_frames(self):
+        pcb = self.system.prepare_program('p.osx', 0, image=program(5, padding=12))
+        self.system.scheduler.schedule_jobs(plot=False)
+        self.assertEqual(pcb.state, PCBState.TERMINATED)
+        self.assertEqual(pcb.resident_pages, set())
+        self.assertFalse(any(entry.valid for entry in pcb.page_table.values()))
+        self.assertEqual(sorted(self.memory_manager.free_frames), list(range(42)))
+
+    def test_reset(self):
+        self.system.prepare_program('p.osx', 0, image=program(5))
+        self.system.scheduler.check_new_jobs()
+        self.system.reset()
+        self.assertEqual(self.memory_manager.reservations, {})
+        self.assertEqual(self.memory_manager.programs, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
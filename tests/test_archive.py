@@ -0,0 +1,71 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from System.System import System
+from System.PCB import PCB
+from System.ProcessArchive import ProcessArchive
+from experiments.generator import WorkloadGenerator
+from constants import PCBState
+from tests.helpers import program
+
+
+class TestProcessArchive(unittest.TestCase):
+    def setUp(self):
+        self.system = System()
+        self.system.scheduler.set_strategy('RR')
+
+    def test_rows_match_processes(self):
+        pcbs = [self.system.prepare_program(f"p{i}.osx", i, image=program(i, padding=i)) for i in range(5)]
+        self.system.scheduler.schedule_jobs(plot=False)
+
+        archive = self.system.archive
+        self.assertEqual(len(archive), 5)
+        rows = {row['pid']: row for row in archive}
+        for pcb in pcbs:
+            row = rows[pcb.pid]
+            self.assertEqual(row['file'], pcb.file)
+            self.assertEqual(row['exit_status'], pcb.registers[0])
+            for column in ('arrival_time', 'start_time', 'end_time', 'turnaround_time',
+                           'waiting_time', 'response_time', 'run_count'):
+                self.assertEqual(row[column], getattr(pcb, column), column)
+            self.assertIsNone(row['absolute_deadline'])
+        self.assertEqual(archive.lateness(), [])
+        self.assertEqual(archive.nbytes(), 5 * len(ProcessArchive.COLUMNS) * 8)
+
+    def test_exit_releases_memory(self):
+        pcb = self.system.prepare_program('p.osx', 0, image=program(1, padding=12))
+        self.system.scheduler.schedule_jobs(plot=False)
+        self.assertEqual(pcb.state, PCBState.TERMINATED)
+        self.assertEqual(self.system.memory_manager.programs, {})
+        self.assertEqual(len(pcb.page_table), 0)
+        self.assertIsNone(pcb.image)
+        self.assertIn(pcb, self.system.terminated_queue)
+
+    def test_long_run_without_retaining(self):
+        self.system.retain_terminated = False
+        jobs = 2000
+        WorkloadGenerator(length=20, seed=1).submit(self.system, jobs, interarrival=5)
+        self.system.scheduler.schedule_jobs(plot=False)
+
+        self.assertEqual(len(self.system.archive), jobs)
+        self.assertEqual(len(self.system.processes), 0)
+        self.assertEqual(self.system.terminated_queue, [])
+        self.assertEqual(self.system.memory_manager.programs, {})
+        self.assertEqual(self.system.scheduler.latency.n_jobs, jobs)
+
+    def test_reset(self):
+        self.system.prepare_program('p.osx', 0, image=program(1))
+        self.system.scheduler.schedule_jobs(plot=False)
+        self.system.reset()
+        self.assertEqual(len(self.system.archive), 0)
+
+    def test_compact_pcb(self):
+        pcb = PCB(1, 0)
+        self.assertFalse(hasattr(pcb, '__dict__'))
+        with self.assertRaises(AttributeError):
+            pcb.not_a_field = 1
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+import tempfile
+import random
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from System.System import System
+from experiments.generator import WorkloadGenerator
+from experiments.arrivals import OpenWorkload, poisson, Bursty, Trace
+
+
+class EveryThirdTooBig(WorkloadGenerator):
+    """ Every third program is left bigger than memory, the system rejects it. """
+    def program(self, max_size=None):
+        return super().program(None if self.count % 3 == 0 else max_size)
+
+
+def system(strategy='RR'):
+    system = System()
+    system.scheduler.set_strategy(strategy)
+    return system
+
+
+class TestArrivalProcesses(unittest.TestCase):
+    def test_poisson_rate(self):
+        rng = random.Random(1)
+        interarrival = poisson(0.1)
+        gaps = [interarrival(rng) for _ in range(20000)]
+        self.assertAlmostEqual(sum(gaps) / len(gaps), 10, delta=0.3)
+
+    def test_bursty_rate_below_burst_rate(self):
+        rng = random.Random(1)
+        interarrival = Bursty(burst_rate=1, burst_jobs=10, quiet_time=100)
+        gaps = [interarrival(rng) for _ in range(20000)]
+        # About 1 time unit per job plus a 100 unit pause every ~10 jobs
+        self.assertAlmostEqual(sum(gaps) / len(gaps), 1 + 100 / 10.5, delta=1)
+        self.assertGreater(sum(1 for gap in gaps if gap < 1) / len(gaps), 0.5)
+
+    def test_trace(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+            f.write("0\n5  # second job\n\n12.5\n")
+        try:
+            interarrival = Trace(f.name)
+            self.assertEqual([interarrival(None) for _ in range(4)], [0, 5, 7.5, None])
+        finally:
+            os.remove(f.name)
+
+
+class TestOpenWorkload(unittest.TestCase):
+    def test_jobs_released_as_they_arrive(self):
+        sim = system()
+        workload = OpenWorkload(WorkloadGenerator(length=20, io_ratio=0, seed=1), 10, jobs=100)
+        workload.release(sim, 35)
+        self.assertEqual([pcb.arrival_time for pcb in sim.job_queue], [10, 20, 30])
+        self.assertEqual(workload.next_time(), 40)
+
+    def test_job_count(self):
+        sim = system()
+        metrics = OpenWorkload(WorkloadGenerator(length=(10, 60), seed=1), poisson(0.02),
+                               jobs=500, seed=2).run(sim)
+        self.assertEqual(len(sim.archive), 500)
+        self.assertEqual(metrics['n_jobs'], 500)
+        self.assertEqual(len(sim.processes), 0)
+        self.assertIsNone(sim.scheduler.source)
+        # Few jobs are ever in the system at once, their PCBs are reused
+        self.assertGreater(sim.pcb_pool.reused, 400)
+        # Every job has the same name, stored once
+        self.assertEqual(sim.archive.files, ['GEN-CPU.osx'])
+
+    def test_rejected_jobs(self):
+        sim = system()
+        workload = OpenWorkload(EveryThirdTooBig(length=300, io_ratio=0, seed=1), 10, jobs=30)
+        workload.run(sim)
+        self.assertEqual((workload.arrived, workload.rejected), (30, 14))
+        self.assertEqual(len(sim.archive), 30)
+
+    def test_duration_and_warmup(self):
+        sim = system()
+        workload = OpenWorkload(WorkloadGenerator(length=(10, 60), io_ratio=0, seed=1), poisson(0.01),
+                                duration=20000, warmup=2000, seed=3)
+        metrics = workload.run(sim)
+
+        arrivals = list(sim.archive.arrival_time)
+        self.assertTrue(all(time < 20000 for time in arrivals))
+        self.assertLess(sim.clock.time, 20000 + 100)
+        self.assertEqual(metrics['start_time'], 2000)
+        self.assertEqual(metrics['n_jobs'], sum(1 for time in arrivals if time >= 2000))
+        self.assertLess(metrics['n_jobs'], len(arrivals))
+        # About 0.01 jobs per time unit arrive and the system keeps up
+        self.assertAlmostEqual(metrics['throughput'], 0.01, delta=0.002)
+
+    def test_preemptive_strategy(self):
+        # Arrivals the source hasn't released yet still interrupt the running process
+        sim = system('SRTF')
+        OpenWorkload(WorkloadGenerator(length=(10, 60), seed=1), Bursty(0.5, 10, 300),
+                     jobs=200, seed=4).run(sim)
+        self.assertEqual(len(sim.archive), 200)
+        self.assertGreater(sum(sim.archive.preempt_count), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+import tempfile
+import shutil
+import struct
+import time
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from Assembler import assemble, build, AssemblerError, CACHE_FILE
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Built with the osx binary, the assembler has to reproduce them byte for byte
+REFERENCE_PROGRAMS = ['tests/ops/add.asm', 'tests/ops/ldr.asm', 'tests/ops/strb.asm', 'tests/ops/bl.asm',
+                      'tests/ops/bx.asm', 'tests/ops/eor.asm', 'programs/test3.asm', 'programs/fork.asm',
+                      'programs/p10.asm', 'programs/metrics/example_1/p1.asm', 'programs/workloads/matmul.asm']
+
+
+class TestAssembler(unittest.TestCase):
+    def test_matches_osx_output(self):
+        for path in REFERENCE_PROGRAMS:
+            with self.subTest(program=path):
+                path = os.path.join(ROOT, path)
+                with open(path[:-4] + '.osx', 'rb') as f:
+                    expected = f.read()
+                loader = struct.unpack('III', expected[:12])[2]
+                with open(path) as f:
+                    self.assertEqual(assemble(f.read(), loader), expected)
+
+    def test_layout(self):
+        image = assemble("""
+VALUE   .WORD 300 ; data
+CHAR    .BYTE 'a' ;
+        .SPACE 1 ;
+START:  ADR R1 VALUE ;
+        LDR R0 [R1] ;
+LOOP    SUB R0 R0 R1 ;
+        CMP R0 Z ;
+        BNE LOOP ; comment
+        SWI 1 ;
+""", loader=20)
+        byte_size, pc, loader = struct.unpack('III', image[:12])
+        self.assertEqual((byte_size, pc, loader), (6 + 6 * 6, 6, 20))
+        body = image[12:]
+        self.assertEqual(body[:6], struct.pack('<I', 300) + b'a ')
+        self.assertEqual(body[6:12], bytes([0, 1]) + struct.pack('<I', 0))  # ADR R1 VALUE
+        self.assertEqual(body[12:18], bytes([4, 0, 1]) + b'   ')  # LDR R0 [R1]
+        self.assertEqual(body[24:30], bytes([12, 0, 9]) + b'   ')  # CMP R0 Z
+        self.assertEqual(body[30:36], bytes([8]) + struct.pack('<I', 18) + b' ')  # BNE to LOOP's address
+
+    def test_errors(self):
+        for source, message in [("FOO R1 R2 ;", "Unknown instruction"),
+                                ("ADD R1 R2 ;", "takes 3 operands"),
+                                ("MVI R12 1 ;", "Unknown register"),
+                                ("B NOWHERE ;", "Unknown label"),
+                                ("A MVI R1 1 ;\nA SWI 1 ;", "defined twice")]:
+            with self.subTest(source=source):
+                with self.assertRaisesRegex(AssemblerError, message):
+                    assemble(source)
+
+    def test_build_cache(self):
+        directory = tempfile.mkdtemp()
+        try:
+            for i in range(20):
+                with open(os.path.join(directory, f"p{i}.asm"), 'w') as f:
+                    f.write(f"MVI R0 {i} ;\nSWI 1 ;\n")
+
+            result = build([directory])
+            self.assertEqual((len(result['built']), len(result['cached'])), (20, 0))
+            self.assertTrue(os.path.exists(os.path.join(directory, CACHE_FILE)))
+
+            start = time.perf_counter()
+            result = build([directory])
+            self.assertEqual((len(result['built']), len(result['cached'])), (0, 20))
+            self.assertLess(time.perf_counter() - start, 1)
+
+            # A changed source, a changed load address and a deleted output are rebuilt
+            with open(os.path.join(directory, 'p0.asm'), 'w') as f:
+                f.write("MVI R0 100 ;\nSWI 1 ;\n")
+            os.remove(os.path.join(directory, 'p2.osx'))
+            p1 = os.path.join(directory, 'p1.asm')
+            result = build([directory], loaders={p1: 50})
+            self.assertEqual(sorted(os.path.basename(path) for path in result['built']), ['p0.osx', 'p1.osx', 'p2.osx'])
+            with open(os.path.join(directory, 'p1.osx'), 'rb') as f:
+                self.assertEqual(struct.unpack('III', f.read(12))[2], 50)
+
+            self.assertEqual(len(build([directory], force=True)['built']), 20)
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+import tempfile
+import shutil
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from benchmarks.run_benchmarks import (compare, cpu_bound_program, memory_bound_program, write_program,
+                                       run_single, bench_translate, bench_scheduler)
+
+
+class TestBenchmarks(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_programs_run_expected_instructions(self):
+        filepath = write_program(self.directory, 'cpu.osx', cpu_bound_program(10))
+        self.assertEqual(run_single(filepath), 3 + 3 * 10 + 1)
+
+        filepath = write_program(self.directory, 'memory.osx', memory_bound_program(7, data_pages=3))
+        # 6 setup, 9 per iteration, 1 to restart at the first page after every 3 iterations, SWI
+        self.assertEqual(run_single(filepath), 6 + 7 * 9 + 2 + 1)
+
+    def test_translate_and_scheduler(self):
+        self.assertGreater(bench_translate(self.directory, 100, faults=False), 0)
+        self.assertGreater(bench_translate(self.directory, 100, faults=True), 0)
+        self.assertGreater(bench_scheduler(self.directory, 10), 0)
+
+    def test_compare(self):
+        baseline = {'cpu_bound_ips': {'value': 1000, 'unit': 'instructions/s'}, 'import_ms': 100}
+        self.assertEqual(compare({'cpu_bound_ips': 850, 'import_ms': 115}, baseline, 0.2), [])
+
+        regressions = compare({'cpu_bound_ips': 700, 'import_ms': 130, 'translate_hit_per_s': 1}, baseline, 0.2)
+        self.assertEqual([name for name, *_ in regressions], ['cpu_bound_ips', 'import_ms'])
+
+        # Getting faster is never a regression
+        self.assertEqual(compare({'cpu_bound_ips': 5000, 'import_ms': 10}, baseline, 0.2), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
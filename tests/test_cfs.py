@@ -0,0 +1,80 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from System.System import System
+from System.PCB import PCB
+from System.CFSQueue import CFSQueue
+
+
+class TestCFSQueue(unittest.TestCase):
+    def setUp(self):
+        self.queue = CFSQueue(target_latency=48, min_granularity=6)
+
+    def make_pcb(self, pid, vruntime=0, weight=1024):
+        pcb = PCB(pid, 0)
+        pcb.vruntime = vruntime
+        pcb.weight = weight
+        return pcb
+
+    def test_picks_smallest_vruntime(self):
+        self.queue.add_process(self.make_pcb(1, 30))
+        self.queue.add_process(self.make_pcb(2, 10))
+        self.queue.add_process(self.make_pcb(3, 20))
+
+        self.assertEqual([self.queue.get_process().pid for _ in range(3)], [2, 3, 1])
+        self.assertTrue(self.queue.is_empty())
+
+    def test_lazy_removal(self):
+        pcb1 = self.make_pcb(1, 10)
+        pcb2 = self.make_pcb(2, 20)
+        self.queue.add_process(pcb1)
+        self.queue.add_process(pcb2)
+
+        self.queue.remove_process(pcb1)
+        self.assertEqual(len(self.queue), 1)
+        self.assertEqual(self.queue.get_process(), pcb2)
+
+    def test_time_slice_from_target_latency(self):
+        for pid in range(1, 4):
+            self.queue.add_process(self.make_pcb(pid))
+        pcb = self.make_pcb(4)
+        # 4 runnable processes share the 48 tick latency
+        self.assertEqual(self.queue.get_quantum(pcb), 12)
+
+    def test_time_slice_never_below_min_granularity(self):
+        for pid in range(1, 20):
+            self.queue.add_process(self.make_pcb(pid))
+        self.assertEqual(self.queue.get_quantum(self.make_pcb(20)), 6)
+
+    def test_weighted_vruntime(self):
+        heavy = self.make_pcb(1, weight=2048)
+        self.queue.account(heavy, 10)
+        self.assertEqual(heavy.vruntime, 5)
+
+    def test_sleeper_credit_is_bounded(self):
+        self.queue.min_vruntime = 100
+        sleeper = self.make_pcb(1, vruntime=0)
+        self.queue.place_sleeper(sleeper)
+        self.assertEqual(sleeper.vruntime, 100 - 24)
+
+        newcomer = self.make_pcb(2, vruntime=0)
+        self.queue.place_new(newcomer)
+        self.assertEqual(newcomer.vruntime, 100)
+
+
+class TestCFSScheduling(unittest.TestCase):
+    def setUp(self):
+        self.system = System()
+        self.system.scheduler.set_strategy('CFS')
+
+    def test_all_jobs_complete(self):
+        self.system.call('execute', 'cpubound2.osx', 0, 'add.osx', 0)
+
+        self.assertEqual(len(self.system.terminated_queue), 2)
+        for pcb in self.system.terminated_queue:
+            self.assertEqual(pcb.vruntime, pcb.execution_time)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from System.System import System
+from tests.helpers import program
+
+
+class TestEDFScheduling(unittest.TestCase):
+    def setUp(self):
+        self.system = System()
+        self.system.scheduler.set_strategy('EDF')
+
+    def get_pcb(self, filename):
+        for pcb in self.system.terminated_queue:
+            if pcb.file == os.path.join('programs', filename):
+                return pcb
+
+    def test_parse_deadline_options(self):
+        programs = self.system.parse_program_args(['add.osx', 0, 'deadline=10', 'sub.osx', 2, 'period=20'])
+        self.assertEqual(programs[0][2], {'deadline': 10})
+        self.assertEqual(programs[1][1], 2)
+        self.assertEqual(programs[1][2], {'period': 20})
+
+    def test_earlier_deadline_preempts(self):
+        self.system.call('execute', 'cpubound2.osx', 0, 'deadline=100', 'add.osx', 3, 'deadline=10')
+
+        cpubound = self.get_pcb('cpubound2.osx')
+        add = self.get_pcb('add.osx')
+        self.assertLess(add.end_time, cpubound.end_time)
+        self.assertEqual(add.waiting_time, 0)
+
+        metrics = self.system.scheduler.get_metrics(0)
+        self.assertEqual(metrics['rt_jobs'], 2)
+        self.assertEqual(metrics['deadline_misses'], 0)
+
+    def test_admission_test_rejects_overload(self):
+        self.system.call('execute', 'cpubound2.osx', 0, 'deadline=12', 'add.osx', 0, 'deadline=6')
+
+        self.assertEqual(len(self.system.terminated_queue), 1)
+        self.assertEqual(len(self.system.scheduler.rejected_jobs), 1)
+
+    def test_schedulable(self):
+        self.assertTrue(self.system.check_schedulable('add.osx', 0, 'deadline=10', 'sub.osx', 0, 'deadline=10'))
+        self.assertFalse(self.system.check_schedulable('add.osx', 0, 'deadline=4'))
+
+    def test_job_waiting_for_memory_counted_once(self):
+        # 22 page programs reserving all their pages, only one fits in the 42 frames at a time
+        memory_manager = self.system.memory_manager
+        memory_manager.set_min_resident_pages(memory_manager.num_frames)
+        for i in range(3):
+            self.system.prepare_program(f"rt{i}.osx", 0, deadline=1000, wcet=300, image=program(padding=85))
+        self.system.scheduler.check_new_jobs()
+        self.system.scheduler.check_new_jobs()
+        self.assertEqual(len(self.system.job_queue), 2)
+        self.assertAlmostEqual(self.system.scheduler.strategy.rt_utilization, 0.9)
+
+        self.system.scheduler.schedule_jobs(plot=False)
+        self.assertEqual(len(self.system.terminated_queue), 3)
+        self.assertEqual(self.system.scheduler.rejected_jobs, [])
+        self.assertAlmostEqual(self.system.scheduler.strategy.rt_utilization, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
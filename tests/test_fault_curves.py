@@ -0,0 +1,79 @@
+import unittest
+import sys
+import os
+import random
+from collections import OrderedDict
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from experiments.fault_curves import (stack_distances, lru_fault_curve, opt_faults, page_string,
+                                      record_references, fault_surface)
+
+
+def simulate_lru(pages, limit):
+    resident = OrderedDict()
+    faults = 0
+    for page in pages:
+        if page in resident:
+            resident.move_to_end(page)
+            continue
+        faults += 1
+        if len(resident) >= limit:
+            resident.popitem(last=False)
+        resident[page] = True
+    return faults
+
+
+def simulate_opt(pages, limit):
+    resident = set()
+    faults = 0
+    for time, page in enumerate(pages):
+        if page in resident:
+            continue
+        faults += 1
+        if len(resident) >= limit:
+            def next_use(p):
+                for later in range(time + 1, len(pages)):
+                    if pages[later] == p:
+                        return later
+                return len(pages)
+            resident.remove(max(resident, key=next_use))
+        resident.add(page)
+    return faults
+
+
+class TestFaultCurves(unittest.TestCase):
+    def test_stack_distances(self):
+        self.assertEqual(stack_distances([1, 2, 3, 1, 2, 2, 4, 1]), [None, None, None, 3, 3, 1, None, 3])
+
+    def test_lru_curve_matches_simulation(self):
+        rng = random.Random(1)
+        for _ in range(20):
+            pages = [rng.randint(0, 9) for _ in range(200)]
+            curve = lru_fault_curve(pages, 12)
+            self.assertEqual(curve, [simulate_lru(pages, limit) for limit in range(1, 13)])
+
+    def test_opt_matches_simulation(self):
+        rng = random.Random(2)
+        for _ in range(10):
+            pages = [rng.randint(0, 7) for _ in range(100)]
+            for limit in (1, 2, 3, 5, 8):
+                self.assertEqual(opt_faults(pages, limit), simulate_opt(pages, limit))
+                self.assertLessEqual(opt_faults(pages, limit), simulate_lru(pages, limit))
+
+    def test_page_string(self):
+        # 4 instruction pages are 24 bytes
+        self.assertEqual(page_string([0, 6, 18, 24, 30, 0, 48], 4), [0, 1, 0, 2])
+
+    def test_surface_from_recorded_run(self):
+        references = record_references(['programs/cpubound2.osx', 'programs/add.osx'])
+        self.assertEqual(len(references), 2)
+
+        surface = fault_surface(references, [1, 4], [1, 2, 3, 10])
+        for page_size in (1, 4):
+            lru = [surface[(page_size, limit)]['lru'] for limit in (1, 2, 3, 10)]
+            self.assertEqual(lru, sorted(lru, reverse=True))
+            for limit in (1, 2, 3, 10):
+                self.assertLessEqual(surface[(page_size, limit)]['opt'], surface[(page_size, limit)]['lru'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from System.System import System
+from System.Timeline import IDLE
+
+
+class TestGanttChart(unittest.TestCase):
+    def setUp(self):
+        self.system = System()
+        self.scheduler = self.system.scheduler
+
+    def test_adjacent_intervals_are_coalesced(self):
+        timeline = self.system.timeline
+        timeline.add_idle(0, 1)
+        timeline.add_idle(1, 2)
+        for start, end, pid, queue_level in [(2, 6, 1, 1), (6, 10, 1, 1), (10, 12, 2, 1), (12, 16, 1, 2)]:
+            timeline.append(start, end, pid, queue_level)
+        intervals = timeline.runs()
+
+        self.assertEqual(intervals[IDLE], [(0, 2, 0)])
+        self.assertEqual(intervals[1], [(2, 10, 1), (12, 16, 2)])
+        self.assertEqual(intervals[2], [(10, 12, 1)])
+
+    def test_headless_run_does_not_plot(self):
+        self.scheduler.set_strategy('FCFS')
+        cwd = os.getcwd()
+        directory = tempfile.mkdtemp()
+        root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+        try:
+            # A plot would go to charts/ in the empty working directory
+            os.chdir(directory)
+            self.system.call('execute', os.path.join(root, 'programs', 'add.osx'), 0)
+            self.assertEqual(len(self.system.terminated_queue), 1)
+            self.assertFalse(os.path.exists('charts'))
+
+            # Rendering afterwards uses the stored run
+            filepath = self.scheduler.plot_gantt_chart()
+            self.assertTrue(os.path.exists(filepath))
+        finally:
+            os.chdir(cwd)
+            shutil.rmtree(directory)
+
+    def test_plot_without_data(self):
+        self.assertIsNone(self.scheduler.plot_gantt_chart())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+import unittest
+import tempfile
+import shutil
+import struct
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from System.System import System
+from experiments.generator import WorkloadGenerator, sample
+from ProgramCreator import ProgramCreator
+from constants import PCBState
+
+
+def run(system):
+    system.scheduler.schedule_jobs(plot=False)
+    return sorted(system.terminated_queue, key=lambda pcb: pcb.pid)
+
+
+class TestWorkloadGenerator(unittest.TestCase):
+    def test_same_seed_same_programs(self):
+        options = dict(length=(10, 60), io_ratio=0.2, memory_ratio=0.2, footprint=(0, 16), loops=(0, 3))
+        first = [image for _, image in WorkloadGenerator(seed=4, **options).programs(20)]
+        second = [image for _, image in WorkloadGenerator(seed=4, **options).programs(20)]
+        other = [image for _, image in WorkloadGenerator(seed=5, **options).programs(20)]
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+
+    def test_straight_line_program(self):
+        system = System()
+        pcb, = WorkloadGenerator(length=30, io_ratio=0, seed=1).submit(system, 1)
+        self.assertEqual(pcb.file, 'GEN-CPU-1.osx')
+        pcb, = run(system)
+        # R0 counts the ADD R0 R0 R1 instructions
+        self.assertEqual(pcb.registers[0], 30)
+        self.assertEqual(pcb.execution_time, 2 + 30 + 1)
+
+    def test_loops(self):
+        system = System()
+        WorkloadGenerator(length=30, io_ratio=0, loops=1, loop_iterations=4, seed=2).submit(system, 1)
+        pcb, = run(system)
+        looped = (pcb.registers[0] - 30) // 3
+        self.assertGreater(looped, 0)
+        self.assertEqual(pcb.registers[0], 30 + 3 * looped)
+        # Loop setup, counter increment, compare and branch on top of the body
+        self.assertEqual(pcb.execution_time, 2 + 30 + 3 * looped + 2 + 3 * 4 + 1)
+
+    def test_memory_footprint(self):
+        image = next(WorkloadGenerator(length=40, io_ratio=0, memory_ratio=1, footprint=10, seed=3).programs(1))[1]
+        byte_size, pc, loader = struct.unpack('III', image[:12])
+        self.assertEqual(pc, 42)  # 10 words padded to a multiple of 6 bytes
+        self.assertEqual(byte_size, pc + 2 * 6 + 40 * 12 + 6)
+
+        system = System()
+        system.prepare_program('memory.osx', 0, image=image)
+        pcb, = run(system)
+        self.assertEqual(pcb.execution_time, 2 + 40 * 2 + 1)
+
+    def test_stream_to_job_queue(self):
+        system = System()
+        generator = WorkloadGenerator(length=(5, 20), io_ratio=0.1, seed=6)
+        pcbs = generator.submit(system, 2000, arrival=3, interarrival=(0, 2))
+        self.assertEqual(len(system.job_queue), 2000)
+        self.assertEqual(pcbs[0].arrival_time, 3)
+        arrivals = [pcb.arrival_time for pcb in system.job_queue]
+        self.assertEqual(arrivals, sorted(arrivals))
+
+        # Consecutive load addresses, nothing overlaps
+        for previous, pcb in zip(pcbs, pcbs[1:]):
+            self.assertEqual(pcb.loader, previous.loader + previous.byte_size)
+
+    def test_programs_fit_in_memory(self):
+        # The documented workload, some programs would be over 1 KiB uncut
+        system = System()
+        generator = WorkloadGenerator(length=(20, 120), io_ratio=0.2, loops=(0, 3), loop_iterations=(2, 10),
+                                      footprint=(0, 40), memory_ratio=0.1, seed=1)
+        pcbs = generator.submit(system, 10000, interarrival=(0, 5))
+        self.assertEqual(len(pcbs), 10000)
+        self.assertTrue(all(pcb.byte_size <= system.memory_manager.memory.size for pcb in pcbs))
+
+    def test_cut_program_runs(self):
+        system = System()
+        image = next(WorkloadGenerator(length=200, io_ratio=0, memory_ratio=1, footprint=100, loops=2,
+                                       seed=2).programs(1, max_size=1024))[1]
+        byte_size, pc, _ = struct.unpack('III', image[:12])
+        self.assertLessEqual(byte_size, 1024)
+        self.assertGreater(byte_size, 1024 - 12 - 3 * 6)
+        system.prepare_program('cut.osx', 0, image=image)
+        pcb, = run(system)
+        self.assertEqual(pcb.state, PCBState.TERMINATED)
+        self.assertGreater(pcb.execution_time, 100)
+
+    def test_runs_generated_workload(self):
+        system = System()
+        system.scheduler.set_strategy('RR')
+        WorkloadGenerator(length=(10, 40), io_ratio=0.1, memory_ratio=0.2, footprint=(0, 20),
+                          loops=(0, 2), seed=7).submit(system, 30, interarrival=(0, 10))
+        self.assertEqual(len(run(system)), 30)
+
+    def test_write(self):
+        directory = tempfile.mkdtemp()
+        try:
+            paths = WorkloadGenerator(length=10, name='S-IO', seed=8).write(directory, 3)
+            self.assertEqual([os.path.basename(path) for path in paths], ['S-IO-1.osx', 'S-IO-2.osx', 'S-IO-3.osx'])
+            system = System()
+            system.prepare_program(paths[0], 0)
+            self.assertEqual(len(run(system)), 1)
+        finally:
+            shutil.rmtree(directory)
+
+    def test_sample(self):
+        import random
+        rng = random.Random(0)
+        self.assertEqual(sample(rng, 5), 5)
+        self.assertIn(sample(rng, (1, 3)), (1, 2, 3))
+        self.assertIsInstance(sample(rng, (0.0, 1.0)), float)
+        self.assertIn(sample(rng, ['a', 'b']), ('a', 'b'))
+        self.assertEqual(sample(rng, lambda rng: 7), 7)
+
+
+class TestProgramCreator(unittest.TestCase):
+    def test_sizes(self):
+        sizes = ProgramCreator(qty=3).SIZES
+        self.assertEqual([size['qty'] for size in sizes.values()], [3, 3, 3])
+        self.assertEqual([size['lines'] for size in sizes.values()], [20, 500, 2000])
+
+    def test_seeded(self):
+        first = ProgramCreator(seed=1)
+        second = ProgramCreator(seed=1)
+        self.assertEqual([first.make_line('IO') for _ in range(50)], [second.make_line('IO') for _ in range(50)])
+
+
+if __name__ == '__main__':
+    unittest.main()
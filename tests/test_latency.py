@@ -0,0 +1,90 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from System.System import System
+from System.PCB import PCB
+from System.LatencyHistogram import LatencyHistogram, LatencyStats
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def setUp(self):
+        self.histogram = LatencyHistogram()
+
+    def test_small_values_are_exact(self):
+        for value in range(1, 11):
+            self.histogram.record(value)
+
+        self.assertEqual(self.histogram.percentile(50), 5)
+        self.assertEqual(self.histogram.percentile(90), 9)
+        self.assertEqual(self.histogram.percentile(100), 10)
+        self.assertEqual(self.histogram.mean(), 5.5)
+
+    def test_relative_error_is_bounded(self):
+        values = list(range(0, 100000, 7))
+        for value in values:
+            self.histogram.record(value)
+
+        for percentile in (50, 90, 99):
+            exact = values[max(0, -(-percentile * len(values) // 100) - 1)]
+            reported = self.histogram.percentile(percentile)
+            self.assertGreaterEqual(reported, exact)
+            self.assertLessEqual(reported - exact, exact / 16)
+        self.assertEqual(self.histogram.percentile(100), values[-1])
+
+    def test_bucket_ranges_cover_values(self):
+        for value in (0, 31, 32, 33, 63, 64, 1000, 123456):
+            low, high = self.histogram.bucket_range(self.histogram.bucket_index(value))
+            self.assertLessEqual(low, value)
+            self.assertGreaterEqual(high, value)
+
+    def test_empty(self):
+        self.assertEqual(self.histogram.summary(), {'avg': 0, 'p50': 0, 'p90': 0, 'p99': 0, 'max': 0})
+
+    def test_negative_value(self):
+        with self.assertRaises(ValueError):
+            self.histogram.record(-1)
+
+
+class TestLatencyStats(unittest.TestCase):
+    def make_pcb(self, pid, file, queue_level, waiting_time):
+        pcb = PCB(pid, 0)
+        pcb.file = file
+        pcb.queue_level = queue_level
+        pcb.waiting_time = waiting_time
+        pcb.response_time = waiting_time
+        pcb.turnaround_time = waiting_time + 10
+        pcb.execution_time = 10
+        return pcb
+
+    def test_breakdown(self):
+        stats = LatencyStats()
+        stats.record(self.make_pcb(1, 'programs/milestone_3/S-CPU-1.osx', 1, 4))
+        stats.record(self.make_pcb(2, 'programs/milestone_3/S-IO-1.osx', 2, 20))
+        stats.record(self.make_pcb(3, 'programs/add.osx', 2, 6))
+
+        metrics = stats.get_metrics()
+        self.assertEqual(metrics['n_jobs'], 3)
+        self.assertEqual(metrics['avg_wait_time'], 10)
+        self.assertEqual(metrics['max_turnaround'], 30)
+        self.assertEqual(metrics['by_queue_level'][2]['n_jobs'], 2)
+        self.assertEqual(metrics['by_queue_level'][2]['max_wait_time'], 20)
+        self.assertEqual(set(metrics['by_program_type']), {'CPU', 'IO', 'add'})
+        self.assertEqual(stats.busy_time, 30)
+
+
+class TestSchedulerLatencyMetrics(unittest.TestCase):
+    def test_metrics_match_terminated_processes(self):
+        system = System()
+        system.call('execute', 'cpubound2.osx', 0, 'add.osx', 0)
+        metrics = system.scheduler.get_metrics(0)
+
+        waits = [pcb.waiting_time for pcb in system.terminated_queue]
+        self.assertEqual(metrics['n_jobs'], 2)
+        self.assertEqual(metrics['avg_wait_time'], round(sum(waits) / len(waits), 2))
+        self.assertEqual(metrics['max_wait_time'], max(waits))
+        self.assertIn('p99_response_time', metrics)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+import random
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from System.System import System
+from benchmarks.run_benchmarks import memory_bound_program
+
+
+def overloaded_system(pressure=True, processes=30):
+    """ Processes that each need 7 of the 42 frames, all admitted at once. """
+    random.seed(0)
+    system = System()
+    system.scheduler.set_strategy('RR')
+    system.scheduler.strategy.set_quantums(10)
+    memory_manager = system.memory_manager
+    memory_manager.fault_cost = 10
+    memory_manager.set_page_limit(7)
+    memory_manager.set_min_resident_pages(1)
+    system.scheduler.pressure.enabled = pressure
+    image = memory_bound_program(60, data_pages=2)
+    for i in range(processes):
+        system.prepare_program(f"p-{i}.osx", 0, image=image)
+    return system
+
+
+class TestMemoryPressure(unittest.TestCase):
+    def test_throughput_under_overload(self):
+        thrashing = overloaded_system(pressure=False)
+        thrashing_metrics = thrashing.scheduler.schedule_jobs(plot=False)
+        controlled = overloaded_system(pressure=True)
+        metrics = controlled.scheduler.schedule_jobs(plot=False)
+
+        self.assertEqual(len(controlled.terminated_queue), 30)
+        self.assertEqual({pcb.execution_time for pcb in controlled.terminated_queue},
+                         {pcb.execution_time for pcb in thrashing.terminated_queue})
+        self.assertGreater(metrics['suspensions'], 0)
+        self.assertEqual(metrics['suspensions'], metrics['resumptions'])
+        self.assertLess(controlled.memory_manager.page_faults, thrashing.memory_manager.page_faults / 4)
+        self.assertGreater(metrics['throughput'], 2 * thrashing_metrics['throughput'])
+
+    def test_suspended_processes_release_memory(self):
+        system = overloaded_system()
+        scheduler = system.scheduler
+        scheduler.check_new_jobs()
+        while not system.suspended_queue:
+            scheduler.dispatch()
+
+        suspended = system.suspended_queue[0]
+        self.assertEqual(suspended.resident_pages, set())
+        self.assertNotIn(suspended.pid, system.memory_manager.reservations)
+        self.assertIn(suspended.pid, system.process_table())
+        self.assertNotIn(suspended, scheduler.strategy.processes)
+
+        # New jobs wait while a process is suspended
+        late = system.prepare_program('late.osx', 0, image=memory_bound_program(1))
+        scheduler.check_new_jobs()
+        self.assertIn(late, system.job_queue)
+
+    def test_no_suspension_without_overload(self):
+        system = overloaded_system(processes=5)
+        metrics = system.scheduler.schedule_jobs(plot=False)
+        self.assertEqual(len(system.terminated_queue), 5)
+        self.assertEqual(metrics['suspensions'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+import contextlib
+import io
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from System.System import System
+from System.paging import PageTable, PageTableEntry, VALID, DIRTY, NO_FRAME
+from tests.helpers import program
+
+
+class TestPageTable(unittest.TestCase):
+    def test_map_and_unmap(self):
+        table = PageTable(4)
+        self.assertEqual(list(table.frames), [NO_FRAME] * 4)
+        self.assertEqual(len(table), 0)
+
+        table.map(2, 9)
+        self.assertTrue(table.is_valid(2))
+        self.assertFalse(table.is_valid(1))
+        self.assertFalse(table.is_valid(-1))
+        self.assertFalse(table.is_valid(4))
+
+        self.assertEqual(table.unmap(2), 9)
+        self.assertFalse(table.is_valid(2))
+        self.assertEqual(table.frames[2], NO_FRAME)
+        # An unmapped page keeps its entry, like a dict entry marked invalid
+        self.assertIn(2, table)
+        self.assertEqual(table.keys(), [2])
+
+    def test_entries_are_copies(self):
+        table = PageTable(3)
+        table.map(1, 5)
+        table.flags[1] |= DIRTY
+        [(page, entry)] = table.items()
+        self.assertEqual(page, 1)
+        self.assertIsInstance(entry, PageTableEntry)
+        self.assertEqual((entry.frame, entry.valid, entry.reference, entry.dirty), (5, True, True, True))
+        entry.valid = False
+        self.assertTrue(table.flags[1] & VALID)
+        with self.assertRaises(KeyError):
+            table[0]
+
+    def test_five_bytes_per_page(self):
+        self.assertEqual(PageTable(100).nbytes(), 500)
+
+    def test_translate(self):
+        system = System()
+        memory_manager = system.memory_manager
+        pcb = system.prepare_program('p.osx', 0, image=program(7, padding=12))
+        memory_manager.load_to_memory(pcb)
+        self.assertEqual(pcb.page_table.num_pages, pcb.num_pages)
+
+        address = memory_manager.translate(pcb, 30, write=True)
+        self.assertEqual(memory_manager.page_faults, 1)
+        frame = pcb.page_table.frames[1]
+        self.assertEqual(address, frame * memory_manager.page_size + 6)
+        self.assertTrue(pcb.page_table.flags[1] & DIRTY)
+
+        memory_manager.translate(pcb, 31)
+        self.assertEqual(memory_manager.page_faults, 1)
+        with self.assertRaises(MemoryError):
+            memory_manager.translate(pcb, pcb.num_pages * memory_manager.page_size)
+        with self.assertRaises(MemoryError):
+            memory_manager.translate(pcb, -1)
+
+    def test_ps_shows_pages(self):
+        system = System()
+        pcb = system.prepare_program('p.osx', 0, image=program(7, padding=12))
+        system.memory_manager.load_to_memory(pcb)
+        system.memory_manager.translate(pcb, 0)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            system.ps_command()
+        frame = pcb.page_table.frames[0]
+        self.assertIn(f"Page  0 → Frame {frame:2} [Valid, R=True, D=False]", output.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+import sys
+import os
+import struct
+import tempfile
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from System.System import System
+from System.PCB import PCB
+from System.PriorityArray import PriorityArray
+from System.strategies import Priority
+from hardware.Clock import Clock
+
+
+class TestPriorityArray(unittest.TestCase):
+    def setUp(self):
+        self.clock = Clock()
+        self.queue = PriorityArray(self.clock, quantum=10, aging_interval=20)
+
+    def make_pcb(self, pid, nice=0):
+        pcb = PCB(pid, 0)
+        pcb.set_nice(nice)
+        return pcb
+
+    def test_picks_highest_priority(self):
+        self.queue.add_process(self.make_pcb(1, nice=10))
+        self.queue.add_process(self.make_pcb(2, nice=-10))
+        self.queue.add_process(self.make_pcb(3, nice=0))
+        self.queue.add_process(self.make_pcb(4, nice=-10))
+
+        self.assertEqual([self.queue.get_process().pid for _ in range(4)], [2, 4, 3, 1])
+        self.assertEqual(self.queue.bitmap, 0)
+
+    def test_aging_prevents_starvation(self):
+        low = self.make_pcb(1, nice=19)
+        self.queue.add_process(low)
+
+        # Keep the queue busy with higher priority work for a long time
+        for pid in range(2, 100):
+            self.queue.add_process(self.make_pcb(pid, nice=0))
+            self.clock += 20
+            pcb = self.queue.get_process()
+            if pcb is low:
+                break
+
+        self.assertIs(pcb, low)
+        self.assertGreater(low.boosts, 0)
+        self.assertEqual(low.priority, low.static_priority)
+        self.assertGreater(self.queue.longest_wait, 0)
+
+    def test_time_slice_scales_with_nice(self):
+        self.assertEqual(self.queue.get_quantum(self.make_pcb(1, nice=0)), 10)
+        self.assertEqual(self.queue.get_quantum(self.make_pcb(2, nice=-20)), 20)
+        self.assertEqual(self.queue.get_quantum(self.make_pcb(3, nice=19)), 1)
+
+    def test_nice_sets_cfs_weight(self):
+        self.assertEqual(self.make_pcb(1, nice=0).weight, 1024)
+        self.assertEqual(self.make_pcb(2, nice=-20).weight, 88761)
+        self.assertEqual(self.make_pcb(3, nice=50).nice, 19)
+
+
+class TestPriorityScheduling(unittest.TestCase):
+    def setUp(self):
+        self.system = System()
+        self.system.scheduler.set_strategy('PRIORITY')
+
+    def test_aged_process_preempts(self):
+        strategy = Priority(self.system)
+        running = PCB(1, 0)
+        waiting = PCB(2, 0)
+        waiting.set_nice(10)
+        strategy.enqueue(waiting)
+        self.assertFalse(strategy.should_preempt(running))
+
+        # Waiting long enough lifts it above the running process before it is picked
+        self.system.clock += 20 * 11
+        self.assertTrue(strategy.should_preempt(running))
+
+    def test_nice_from_execute(self):
+        self.system.call('execute', 'cpubound2.osx', 0, 'nice=19', 'add.osx', 0, 'nice=-5')
+
+        first = self.system.terminated_queue[0]
+        self.assertEqual(first.file, os.path.join('programs', 'add.osx'))
+        self.assertEqual(first.nice, -5)
+
+    def test_nice_swi(self):
+        # MVI R0 -5 ; SWI 13 ; SWI 1
+        body = (bytes([22, 0]) + struct.pack('<i', -5) +
+                bytes([20]) + struct.pack('<I', 13) + b' ' +
+                bytes([20]) + struct.pack('<I', 1) + b' ')
+        with tempfile.TemporaryDirectory() as directory:
+            filepath = os.path.join(directory, 'nice.osx')
+            with open(filepath, 'wb') as f:
+                f.write(struct.pack('III', len(body), 0, 0) + body)
+
+            self.system.call('execute', filepath, 0)
+
+        self.assertEqual(self.system.terminated_queue[0].nice, -5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+import unittest
+import random
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from System.System import System
+from System.ProcessPool import PCBPool, PidAllocator
+from Assembler import assemble
+from constants import PCBState
+
+# Forks 20 children one after the other, waiting for each, every child exits with R0 = 3
+FORK_LOOP = """
+        MVI R1 0 ;
+        MVI R2 0 ;
+        MVI R3 1 ;
+        MVI R4 20 ;
+LOOP    SWI 10 ;
+        CMP R0 R1 ;
+        BEQ CHILD ;
+        SWI 12 ;
+        ADD R2 R2 R3 ;
+        CMP R2 R4 ;
+        BLT LOOP ;
+        SWI 1 ;
+CHILD   MVI R0 3 ;
+        SWI 1 ;
+"""
+
+# The parent forks and exits at once, the child counts to 100
+ORPHAN = """
+        SWI 10 ;
+        MVI R1 0 ;
+        CMP R0 R1 ;
+        BEQ CHILD ;
+        SWI 1 ;
+CHILD   MVI R2 0 ;
+        MVI R3 1 ;
+        MVI R4 100 ;
+LOOP    ADD R2 R2 R3 ;
+        CMP R2 R4 ;
+        BLT LOOP ;
+        SWI 1 ;
+"""
+
+# Counts to 200, outlives the orphan
+LONG = """
+        MVI R2 0 ;
+        MVI R3 1 ;
+        MVI R4 200 ;
+LOOP    ADD R2 R2 R3 ;
+        CMP R2 R4 ;
+        BLT LOOP ;
+        SWI 1 ;
+"""
+
+
+class TestPidAllocator(unittest.TestCase):
+    def test_lowest_free_pid(self):
+        pids = PidAllocator()
+        self.assertEqual([pids.allocate() for _ in range(20)], list(range(1, 21)))
+        self.assertTrue(pids.free(17))
+        self.assertTrue(pids.free(3))
+        self.assertFalse(pids.free(3))
+        self.assertFalse(pids.free(0))
+        self.assertNotIn(3, pids)
+        self.assertEqual([pids.allocate(), pids.allocate(), pids.allocate()], [3, 17, 21])
+        self.assertEqual(pids.in_use, 21)
+
+    def test_reset(self):
+        pids = PidAllocator()
+        pids.allocate()
+        pids.reset()
+        self.assertEqual(pids.allocate(), 1)
+
+
+class TestPCBPool(unittest.TestCase):
+    def test_reused_pcb_is_reset(self):
+        pool = PCBPool()
+        pcb = pool.acquire(1, 12)
+        pcb.registers[0] = 5
+        pcb.execution_time = 40
+        pcb.children.append(pool.acquire(2, 0))
+        pcb.arrival_time = 4
+        pcb.set_deadline(10, wcet=2)
+        pcb.state = PCBState.TERMINATED
+        pool.release(pcb)
+
+        reused = pool.acquire(3, 6)
+        self.assertIs(reused, pcb)
+        self.assertEqual((reused.pid, reused.pc, reused.state), (3, 6, PCBState.NEW))
+        self.assertEqual(reused.registers, [0] * 12)
+        self.assertEqual((reused.execution_time, reused.children, reused.absolute_deadline), (0, [], None))
+        self.assertEqual(len(reused.page_table), 0)
+        self.assertEqual(pool.get_metrics(), {'pcbs_created': 2, 'pcbs_reused': 1})
+
+    def test_max_size(self):
+        pool = PCBPool(max_size=1)
+        pool.release(pool.acquire(1, 0))
+        pool.release(pool.acquire(2, 0))
+        pool.release(pool.acquire(3, 0))
+        self.assertEqual(len(pool), 1)
+
+
+class TestRecycling(unittest.TestCase):
+    def run_fork_loop(self, **options):
+        random.seed(0)
+        system = System()
+        for name, value in options.items():
+            setattr(system, name, value)
+        system.scheduler.set_strategy('RR')
+        system.prepare_program('fork_loop.osx', 0, image=assemble(FORK_LOOP))
+        system.scheduler.schedule_jobs(plot=False)
+        return system
+
+    def test_children_reuse_pcbs_and_pids(self):
+        system = self.run_fork_loop(retain_terminated=False, recycle_pids=True)
+        self.assertEqual(len(system.archive), 21)
+        self.assertEqual(sorted(set(system.archive.pid)), [1, 2])
+        self.assertEqual([row['exit_status'] for row in system.archive if row['pid'] == 2], [3] * 20)
+        self.assertEqual(system.pcb_pool.get_metrics(), {'pcbs_created': 2, 'pcbs_reused': 19})
+        self.assertEqual(len(system.processes), 0)
+        self.assertEqual(system.pids.in_use, 0)
+
+    def test_orphan_retired_when_parent_pid_reused(self):
+        random.seed(0)
+        system = System()
+        system.retain_terminated = False
+        system.recycle_pids = True
+        system.scheduler.set_strategy('RR')
+        parent = system.prepare_program('orphan.osx', 0, image=assemble(ORPHAN))
+        system.scheduler.check_new_jobs()
+        while parent.pid in system.processes:
+            system.scheduler.dispatch()
+
+        # The parent is gone, the next job gets its PID while the orphan runs
+        late = system.prepare_program('long.osx', system.clock.time, image=assemble(LONG))
+        self.assertEqual(late.pid, 1)
+        system.scheduler.schedule_jobs(plot=False)
+
+        self.assertEqual(sorted(system.archive.pid), [1, 1, 2])
+        self.assertEqual(len(system.processes), 0)
+        self.assertEqual(system.pids.in_use, 0)
+
+    def test_pids_count_up_by_default(self):
+        system = self.run_fork_loop(retain_terminated=False)
+        self.assertEqual(sorted(system.archive.pid), list(range(1, 22)))
+        self.assertEqual(system.pcb_pool.reused, 19)
+
+    def test_nothing_recycled_while_retained(self):
+        system = self.run_fork_loop()
+        self.assertEqual(len(system.terminated_queue), 21)
+        self.assertEqual(system.pcb_pool.reused, 0)
+        self.assertEqual(len({id(pcb) for pcb in system.terminated_queue}), 21)
+
+
+if __name__ == '__main__':
+    unittest.main()
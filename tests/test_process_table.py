@@ -0,0 +1,82 @@
+import unittest
+import time
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from System.System import System
+from System.ProcessTable import ProcessTable
+from System.PCB import PCB
+from constants import PCBState
+from tests.helpers import program
+
+
+class TestProcessTable(unittest.TestCase):
+    def test_state_index_follows_pcb(self):
+        table = ProcessTable()
+        pcb = PCB(1, 0)
+        pcb.file = 'a.osx'
+        pcb.arrival_time = 0
+        table.add(pcb)
+        self.assertEqual(list(table.in_state(PCBState.NEW)), [pcb])
+
+        pcb.ready(0)
+        pcb.running()
+        self.assertEqual((table.count(PCBState.NEW), table.count(PCBState.RUNNING)), (0, 1))
+        pcb.waiting()
+        self.assertTrue(table.has_state(1, PCBState.WAITING))
+        pcb.terminated(5)
+        self.assertEqual(list(table.in_state(PCBState.TERMINATED)), [pcb])
+        self.assertEqual(sum(table.count(state) for state in PCBState), 1)
+
+        pcb.file = 'b.osx'
+        self.assertEqual(list(table.by_file('a.osx')), [])
+        self.assertEqual(list(table.by_file('b.osx')), [pcb])
+
+        table.remove(pcb)
+        self.assertEqual((len(table), table.count(PCBState.TERMINATED)), (0, 0))
+        self.assertNotIn(1, table)
+
+    def test_every_process_is_in_the_table(self):
+        system = System()
+        system.scheduler.set_strategy('RR')
+        pcbs = [system.prepare_program(f"p{i}.osx", i * 5, image=program(i)) for i in range(5)]
+        self.assertEqual(list(system.process_table().values()), pcbs)
+        system.scheduler.schedule_jobs(plot=False)
+        self.assertEqual(system.processes.count(PCBState.TERMINATED), 5)
+        self.assertEqual(list(system.processes.by_file('p3.osx')), [pcbs[3]])
+
+    def test_lookups_with_100k_processes(self):
+        system = System()
+        image = program(1)
+        program_info = system.memory_manager.prepare_program('p.osx', image)
+        for i in range(100000):
+            program_info['filepath'] = f"p{i % 100}.osx"
+            system.create_pcb(program_info, 0)
+
+        processes = system.processes
+        start = time.perf_counter()
+        for pid in range(1, 100001, 7):
+            pcb = processes[pid]
+            pcb.ready(0)
+            self.assertTrue(processes.has_state(pid, PCBState.READY))
+        self.assertEqual(len(processes.by_file('p42.osx')), 1000)
+        self.assertLess(time.perf_counter() - start, 1)
+        self.assertEqual(processes.count(PCBState.READY), len(range(1, 100001, 7)))
+
+    def test_global_eviction_prefers_waiting_processes(self):
+        system = System()
+        memory_manager = system.memory_manager
+        ready, waiting = [system.prepare_program(f"p{i}.osx", 0, image=program(i)) for i in range(2)]
+        for pcb in (ready, waiting):
+            memory_manager.load_to_memory(pcb)
+            memory_manager.translate(pcb, 0)
+            pcb.ready(0)
+        waiting.waiting()
+
+        memory_manager.evict_page()
+        self.assertEqual((ready.resident_pages, waiting.resident_pages), ({0}, set()))
+        self.assertNotIn(waiting.pid, memory_manager.holders)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+import tempfile
+import shutil
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from System.System import System
+from System.ProgramCache import ProgramCache
+from tests.helpers import program
+
+
+class TestProgramCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'p.osx')
+        with open(self.path, 'wb') as f:
+            f.write(program(7))
+        self.system = System()
+        self.cache = self.system.memory_manager.program_cache = ProgramCache()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_repeated_launches_read_once(self):
+        for _ in range(50):
+            self.system.prepare_program(self.path, 0)
+        self.system.scheduler.schedule_jobs(plot=False)
+        self.assertEqual(len(self.system.terminated_queue), 50)
+        self.assertTrue(all(pcb.registers[0] == 7 for pcb in self.system.terminated_queue))
+        self.assertEqual((self.cache.misses, self.cache.hits), (1, 49))
+
+    def test_programs_share_the_image(self):
+        first = self.system.prepare_program(self.path, 0)
+        second = self.system.prepare_program(self.path, 0)
+        memory_manager = self.system.memory_manager
+        self.assertIs(first.image, second.image)
+        memory_manager.load_to_memory(first)
+        memory_manager.load_to_memory(second)
+        self.assertIs(memory_manager.programs[first.pid].obj, memory_manager.programs[second.pid].obj)
+
+    def test_changed_file_is_reloaded(self):
+        self.assertEqual(self.cache.get(self.path).body.tobytes(), program(7)[12:])
+        with open(self.path, 'wb') as f:
+            f.write(program(9, padding=1))
+        entry = self.cache.get(self.path)
+        self.assertEqual((entry.byte_size, entry.body.tobytes()), (24, program(9, padding=1)[12:]))
+        self.assertEqual(self.cache.misses, 2)
+
+        # Same size, only the modification time changes
+        with open(self.path, 'wb') as f:
+            f.write(program(5, padding=1))
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        self.assertEqual(self.cache.get(self.path).body.tobytes(), program(5, padding=1)[12:])
+
+    def test_least_recently_used_dropped(self):
+        self.cache.max_entries = 2
+        paths = []
+        for i in range(3):
+            paths.append(os.path.join(self.directory, f"p{i}.osx"))
+            with open(paths[-1], 'wb') as f:
+                f.write(program(i))
+        self.cache.get(paths[0])
+        self.cache.get(paths[1])
+        self.cache.get(paths[0])
+        self.cache.get(paths[2])
+        self.assertEqual(list(self.cache.entries), [paths[0], paths[2]])
+
+    def test_missing_file(self):
+        self.assertIsNone(self.system.memory_manager.prepare_program(os.path.join(self.directory, 'missing.osx')))
+
+
+if __name__ == '__main__':
+    unittest.main()
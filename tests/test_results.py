@@ -0,0 +1,72 @@
+import unittest
+import sys
+import os
+import tempfile
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from experiments import expand_grid, run_sweep, ResultStore, run_key
+from experiments.results import main
+
+
+WORKLOADS = {'cpu': ['programs/cpubound2.osx', ('programs/add.osx', 2)],
+             'same': ['programs/cpubound2.osx', ('programs/add.osx', 2)]}
+
+
+class TestResultStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'results.db')
+        self.store = ResultStore(self.path)
+
+    def tearDown(self):
+        self.store.close()
+        self.directory.cleanup()
+
+    def test_key_depends_on_parameters(self):
+        config, other = expand_grid({'quantums': [(4, 8), (8, 16)], 'workload': ['cpu']}, WORKLOADS)
+        self.assertEqual(run_key(config), run_key(dict(config)))
+        self.assertNotEqual(run_key(config), run_key(other))
+
+    def test_key_depends_on_workload(self):
+        configs = expand_grid({'workload': ['cpu', 'same']}, WORKLOADS)
+        for config in configs:
+            config['seed'] = 0
+        cpu, same = configs
+        self.assertEqual(cpu['programs'], same['programs'])
+        self.assertNotEqual(run_key(cpu), run_key(same))
+
+        list(run_sweep(configs, workers=1, store=self.store))
+        self.assertEqual(len(self.store), 2)
+        self.assertEqual(len(self.store.results(workload='cpu')), 1)
+
+    def test_sweep_skips_stored_runs(self):
+        configs = expand_grid({'strategy': ['RR', 'FCFS'], 'workload': ['cpu']}, WORKLOADS)
+        first = {r['config']['strategy']: r for r in run_sweep(configs, workers=1, store=self.store)}
+        self.assertEqual(len(self.store), 2)
+        self.assertFalse(any(r.get('cached') for r in first.values()))
+
+        configs += expand_grid({'strategy': ['MLFQ'], 'workload': ['cpu']}, WORKLOADS)
+        second = {r['config']['strategy']: r for r in run_sweep(configs, workers=1, store=self.store)}
+        self.assertTrue(second['RR']['cached'])
+        self.assertNotIn('cached', second['MLFQ'])
+        self.assertEqual(second['RR']['metrics']['avg_wait_time'], first['RR']['metrics']['avg_wait_time'])
+        self.assertEqual(second['RR']['config'], first['RR']['config'])
+        self.assertEqual(second['RR']['timeline'], first['RR']['timeline'])
+        self.assertEqual(second['RR']['metrics']['by_queue_level'], first['RR']['metrics']['by_queue_level'])
+        self.assertEqual(list(second['RR']['metrics']['by_queue_level']), [1])
+        self.assertEqual(len(self.store), 3)
+
+    def test_best(self):
+        configs = expand_grid({'strategy': ['RR', 'FCFS', 'MLFQ'], 'workload': ['cpu']}, WORKLOADS)
+        results = list(run_sweep(configs, workers=1, store=self.store))
+
+        best = self.store.best('avg_wait_time', limit=2)
+        self.assertEqual(len(best), 2)
+        self.assertEqual(best[0]['metrics']['avg_wait_time'], min(r['metrics']['avg_wait_time'] for r in results))
+        self.assertEqual(self.store.best('throughput', limit=1)[0]['metrics']['throughput'],
+                         max(r['metrics']['throughput'] for r in results))
+        self.assertEqual(self.store.best(workload='other'), [])
+        main(['--db', self.path, 'best', 'avg_turnaround'])
+
+
+if __name__ == "__main__":
+    unittest.main()
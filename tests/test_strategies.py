@@ -0,0 +1,61 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from System.System import System
+from System.strategies import Strategy, STRATEGIES, register_strategy, get_strategy
+
+
+class LastComeFirstServed(Strategy):
+    """ Test strategy, always runs the most recently queued process to completion. """
+    name = 'LCFS'
+
+    def __init__(self, system):
+        super().__init__(system)
+        self.stack = []
+        self.exited = []
+
+    def __len__(self):
+        return len(self.stack)
+
+    @property
+    def processes(self):
+        return list(reversed(self.stack))
+
+    def enqueue(self, pcb):
+        self.stack.append(pcb)
+
+    def pick_next(self):
+        return self.stack.pop(), 1000000
+
+    def on_exit(self, pcb):
+        self.exited.append(pcb.pid)
+
+
+class TestStrategyRegistry(unittest.TestCase):
+    def setUp(self):
+        register_strategy(LastComeFirstServed)
+        self.system = System()
+
+    def tearDown(self):
+        del STRATEGIES['LCFS']
+
+    def test_builtin_strategies_registered(self):
+        for name in ('FCFS', 'RR', 'MLFQ', 'CFS', 'EDF', 'PRIORITY'):
+            self.assertEqual(get_strategy(name.lower()).name, name)
+
+    def test_unknown_strategy(self):
+        with self.assertRaises(ValueError):
+            self.system.scheduler.set_strategy('SJF')
+
+    def test_custom_strategy(self):
+        self.system.call('setSched', 'lcfs')
+        self.system.call('execute', 'cpubound2.osx', 0, 'add.osx', 0)
+
+        strategy = self.system.scheduler.strategy
+        self.assertIsInstance(strategy, LastComeFirstServed)
+        self.assertEqual(strategy.exited, [2, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from experiments import expand_grid, run_sweep, task_seed
+
+
+WORKLOADS = {
+    'cpu': ['programs/cpubound2.osx', ('programs/add.osx', 2)],
+    'io': [('programs/IO.osx', 0), ('programs/cpubound2.osx', 0)],
+}
+
+
+class TestSweep(unittest.TestCase):
+    def test_expand_grid(self):
+        configs = expand_grid({'strategy': ['RR', 'MLFQ'], 'quantums': [[4, 8], (10, 20)], 'workload': ['cpu']}, WORKLOADS)
+
+        self.assertEqual(len(configs), 4)
+        self.assertEqual(configs[0]['quantums'], (4, 8))
+        self.assertEqual(configs[0]['page_size'], 4)
+        self.assertEqual(configs[0]['programs'], [('programs/cpubound2.osx', 0, {}), ('programs/add.osx', 2, {})])
+        self.assertEqual(len(set(config['seed'] for config in configs)), 4)
+
+    def test_unknown_parameter(self):
+        with self.assertRaises(ValueError):
+            expand_grid({'quantum': [4]})
+        with self.assertRaises(ValueError):
+            expand_grid({'workload': ['missing']}, WORKLOADS)
+
+    def test_seed_is_deterministic(self):
+        config = expand_grid({'workload': ['io']}, WORKLOADS)[0]
+        self.assertEqual(config['seed'], task_seed(config))
+        self.assertNotEqual(task_seed(config, 1), task_seed(config, 2))
+
+    def test_pool_matches_serial_run(self):
+        configs = expand_grid({'strategy': ['RR', 'FCFS'], 'workload': ['cpu', 'io']}, WORKLOADS)
+
+        def run(workers):
+            return {(r['config']['strategy'], r['config']['workload']): r['metrics']['avg_turnaround']
+                    for r in run_sweep(configs, workers=workers)}
+
+        serial = run(1)
+        self.assertEqual(len(serial), 4)
+        self.assertEqual(serial, run(2))
+
+
+if __name__ == "__main__":
+    unittest.main()
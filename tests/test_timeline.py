@@ -0,0 +1,64 @@
+import unittest
+import sys
+import os
+import csv
+import tempfile
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from System.System import System
+from System.Timeline import Timeline, IDLE
+
+
+class TestTimeline(unittest.TestCase):
+    def setUp(self):
+        self.timeline = Timeline()
+        self.timeline.append(0, 4, 1, 1, 4)
+        self.timeline.append(4, 8, 2, 1, 4)
+        self.timeline.add_idle(8, 20)
+        self.timeline.append(20, 24, 1, 2, 8)
+
+    def test_at(self):
+        self.assertEqual([row[2] for row in self.timeline.at(0)], [1])
+        self.assertEqual([row[2] for row in self.timeline.at(7)], [2])
+        self.assertEqual([row[2] for row in self.timeline.at(15)], [IDLE])
+        self.assertEqual(self.timeline.at(24), [])
+
+    def test_slices_for(self):
+        self.assertEqual(self.timeline.slices_for(1), [(0, 4, 1, 1, 4, 0), (20, 24, 1, 2, 8, 0)])
+        self.assertEqual(self.timeline.slices_for(3), [])
+        self.assertEqual(self.timeline.pids(), [1, 2])
+
+    def test_between(self):
+        self.assertEqual([row[2] for row in self.timeline.between(6, 21)], [2, IDLE, 1])
+
+    def test_out_of_order_append(self):
+        with self.assertRaises(ValueError):
+            self.timeline.append(10, 12, 3)
+
+    def test_csv_export(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filepath = os.path.join(directory, 'timeline.csv')
+            self.timeline.to_csv(filepath)
+            with open(filepath) as f:
+                rows = list(csv.reader(f))
+        self.assertEqual(rows[0], list(Timeline.COLUMNS))
+        self.assertEqual(rows[3], ['8', '20', str(IDLE), '0', '0', '0'])
+
+    def test_numpy_export(self):
+        table = self.timeline.to_numpy()
+        self.assertEqual(len(table), 4)
+        self.assertEqual(int(table['end'].sum()), 4 + 8 + 20 + 24)
+
+
+class TestSystemTimeline(unittest.TestCase):
+    def test_execute_records_timeline(self):
+        system = System()
+        system.call('execute', 'cpubound2.osx', 0, 'add.osx', 0)
+
+        busy = sum(end - start for start, end, pid, *_ in system.timeline if pid != IDLE)
+        self.assertEqual(busy, sum(pcb.execution_time for pcb in system.terminated_queue))
+        for pcb in system.terminated_queue:
+            self.assertLessEqual(pcb.end_time, system.timeline.slices_for(pcb.pid)[-1][1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from System.System import System
+from hardware.Clock import Clock
+from hardware.Timer import Timer
+from System.Timeline import IDLE
+
+
+class TestTimer(unittest.TestCase):
+    def setUp(self):
+        self.clock = Clock()
+        self.timer = Timer(self.clock)
+
+    def test_unarmed_timer_never_fires(self):
+        self.assertEqual(self.timer.remaining(), Timer.NEVER)
+        self.assertFalse(self.timer.expired())
+
+    def test_arm(self):
+        self.clock += 5
+        self.timer.arm(12)
+        self.assertEqual(self.timer.remaining(), 7)
+
+        self.timer.arm_in(3)
+        self.assertEqual(self.timer.deadline, 8)
+
+        self.clock += 3
+        self.assertTrue(self.timer.expired())
+        self.assertEqual(self.timer.remaining(), 0)
+
+    def test_disarm(self):
+        self.timer.arm(10)
+        self.timer.disarm()
+        self.assertEqual(self.timer.remaining(), Timer.NEVER)
+
+
+class TestTimerInterrupts(unittest.TestCase):
+    def setUp(self):
+        self.system = System()
+
+    def get_pcb(self, filename):
+        for pcb in self.system.terminated_queue:
+            if pcb.file == os.path.join('programs', filename):
+                return pcb
+
+    def test_quantum_expiry_preempts(self):
+        self.system.scheduler.set_strategy('RR')
+        self.system.scheduler.strategy.set_quantums(4)
+        self.system.call('execute', 'cpubound2.osx', 0, 'add.osx', 0)
+
+        cpubound = self.get_pcb('cpubound2.osx')
+        self.assertGreater(cpubound.preempt_count, 0)
+        # Every run stops exactly on a quantum boundary or at exit
+        for start, end, *_ in self.system.timeline:
+            self.assertLessEqual(end - start, 4)
+
+    def test_srtf_arrival_preempts_longer_job(self):
+        self.system.scheduler.set_strategy('SRTF')
+        self.system.call('execute', 'cpubound2.osx', 0, 'add.osx', 3)
+
+        cpubound = self.get_pcb('cpubound2.osx')
+        add = self.get_pcb('add.osx')
+        # add.osx starts on the tick it arrives
+        self.assertEqual(add.response_time, 0)
+        self.assertLess(add.end_time, cpubound.end_time)
+        self.assertEqual(cpubound.preempt_count, 1)
+
+    def test_idle_cpu_skips_to_next_arrival(self):
+        self.system.scheduler.set_strategy('FCFS')
+        self.system.call('execute', 'add.osx', 50)
+
+        add = self.get_pcb('add.osx')
+        self.assertEqual(add.start_time, 50)
+        self.assertEqual(self.system.timeline.slices_for(IDLE), [(0, 50, IDLE, 0, 0, 0)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from experiments import QuantumTuner
+
+
+PROGRAMS = ['programs/cpubound2.osx', 'programs/IO.osx', ('programs/add.osx', 3)]
+
+
+class TestQuantumTuner(unittest.TestCase):
+    def test_finds_best_point_with_fewer_runs_than_grid(self):
+        tuner = QuantumTuner(PROGRAMS, 'avg_wait_time', workers=1)
+        report = tuner.tune()
+
+        self.assertLess(report['evaluations'], report['grid_size'])
+        self.assertEqual(report['score'], min(tuner.scores.values()))
+        self.assertEqual(tuple(report['best'].values()), tuner.best_point)
+
+        # The best score in the trace never gets worse
+        best = [entry[3] for entry in report['trace']]
+        self.assertEqual(best, sorted(best, reverse=True))
+        self.assertEqual(len(report['trace']), report['evaluations'])
+
+    def test_budget(self):
+        tuner = QuantumTuner(PROGRAMS, 'p99_turnaround', max_evaluations=5, workers=1)
+        self.assertEqual(tuner.tune()['evaluations'], 5)
+
+    def test_maximize_throughput(self):
+        tuner = QuantumTuner(PROGRAMS, 'throughput', search_space={'q1': (2, 8), 'q2': (4, 8), 'promote_at': (5, 5)},
+                             workers=1)
+        report = tuner.tune()
+        self.assertEqual(report['score'], max(tuner.scores.values()))
+        self.assertEqual(report['best']['promote_at'], 5)
+
+    def test_deterministic(self):
+        first = QuantumTuner(PROGRAMS, seeds=(0, 1), max_evaluations=10, workers=1).tune()
+        second = QuantumTuner(PROGRAMS, seeds=(0, 1), max_evaluations=10, workers=1).tune()
+        self.assertEqual(first['trace'], second['trace'])
+
+
+if __name__ == "__main__":
+    unittest.main()
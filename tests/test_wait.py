@@ -0,0 +1,79 @@
+import unittest
+import random
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from System.System import System
+from Assembler import assemble
+from constants import PCBState
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# The parent forks and waits, the child counts to 100 and exits with R0 = 7
+FORK_AND_WAIT = """
+        SWI 10 ;
+        MVI R1 0 ;
+        CMP R0 R1 ;
+        BEQ CHILD ;
+        SWI 12 ; wait
+        SWI 1 ;
+CHILD   MVI R2 0 ;
+        MVI R3 1 ;
+        MVI R4 100 ;
+LOOP    ADD R2 R2 R3 ;
+        CMP R2 R4 ;
+        BLT LOOP ;
+        MVI R0 7 ;
+        SWI 1 ;
+"""
+
+
+def run(source=None, path=None, strategy='RR', quantum=5):
+    random.seed(0)
+    system = System()
+    system.scheduler.set_strategy(strategy)
+    system.scheduler.strategy.set_quantums(quantum)
+    if path:
+        system.prepare_program(path, 0)
+    else:
+        system.prepare_program('fork_and_wait.osx', 0, image=assemble(source))
+    system.scheduler.schedule_jobs(plot=False)
+    return system, sorted(system.terminated_queue, key=lambda pcb: pcb.pid)
+
+
+class TestWait(unittest.TestCase):
+    def test_parent_blocks_until_child_exits(self):
+        system, (parent, child) = run(FORK_AND_WAIT)
+        # SWI 10, MVI, CMP, BEQ, SWI 12, SWI 1, the wait is not re-executed
+        self.assertEqual(parent.execution_time, 6)
+        self.assertEqual(child.execution_time, 3 + 3 + 3 * 100 + 2)
+        self.assertGreaterEqual(parent.end_time, child.end_time)
+
+        # The parent doesn't run while the child does
+        parent_slices = [entry for entry in system.timeline if entry[2] == parent.pid]
+        self.assertLessEqual(len(parent_slices), 3)
+
+    def test_exit_status_collected_and_child_reaped(self):
+        system, (parent, child) = run(FORK_AND_WAIT)
+        self.assertEqual(parent.exit_statuses, {child.pid: 7})
+        self.assertEqual(parent.get_children(), [])
+        self.assertNotIn(child.pid, system.processes)
+        self.assertIn(parent.pid, system.processes)
+        self.assertEqual(system.wait_queue, {})
+
+    def test_wait_without_running_children(self):
+        # The child finishes first under FCFS, wait returns at once
+        system, (parent, child) = run(FORK_AND_WAIT, strategy='FCFS', quantum=1000)
+        self.assertEqual(parent.state, PCBState.TERMINATED)
+        self.assertEqual(parent.exit_statuses, {child.pid: 7})
+
+    def test_fork_exec(self):
+        system, (parent, child) = run(path=os.path.join(ROOT, 'programs', 'fork_exec.osx'))
+        self.assertEqual(parent.registers[0], 1)
+        self.assertEqual(child.registers[0], 999)
+        self.assertTrue(child.file.endswith('child.osx'))
+        self.assertEqual(parent.exit_statuses, {child.pid: 999})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from experiments.workloads import load_corpus, corpus_workloads, run_workload, check_workload
+from experiments import expand_grid, run_sweep
+
+
+class TestWorkloadCorpus(unittest.TestCase):
+    def check_all(self, **options):
+        for name, workload in load_corpus().items():
+            with self.subTest(workload=name, **options):
+                if 'skip' in workload:
+                    self.skipTest(workload['skip'])
+                system = run_workload(name, **options)
+                self.assertEqual(check_workload(name, system), [])
+
+    def test_expected_results(self):
+        self.check_all()
+
+    def test_results_survive_paging(self):
+        # Stores to evicted pages have to be written back
+        self.check_all(strategy='RR', page_limit=2)
+
+    def test_results_with_other_page_size(self):
+        self.check_all(strategy='MLFQ', page_size=8, page_limit=3)
+
+    def test_programs_are_assembled(self):
+        for workload in load_corpus().values():
+            for path in workload['paths']:
+                self.assertTrue(os.path.exists(path))
+                self.assertTrue(os.path.exists(path.replace('.osx', '.asm')))
+
+    def test_sweep_over_corpus(self):
+        workloads = corpus_workloads(['matmul', 'linked_list', 'fork_tree'])
+        self.assertEqual(sorted(workloads), ['fork_tree', 'linked_list', 'matmul'])
+
+        configs = expand_grid({'strategy': ['RR'], 'page_limit': [2, 6], 'workload': list(workloads)}, workloads)
+        results = list(run_sweep(configs, workers=1))
+        self.assertEqual(len(results), 6)
+        faults = {(result['config']['workload'], result['config']['page_limit']): result['metrics']['page_faults']
+                  for result in results}
+        for workload in ['matmul', 'linked_list']:
+            self.assertGreater(faults[(workload, 2)], faults[(workload, 6)])
+        # The fork tree's loop fits in 2 pages
+        self.assertEqual(faults[('fork_tree', 2)], faults[('fork_tree', 6)])
+
+
+if __name__ == '__main__':
+    unittest.main()